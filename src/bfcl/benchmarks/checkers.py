@@ -0,0 +1,244 @@
+"""Micro-benchmarks of the checker hot paths.
+
+Every benchmark times one checker function over representative inputs drawn from the bundled BFCL data, using the
+correct completions of `SyntheticCompletionGenerator`. Results are saved as JSON keyed by the git commit and can be
+compared against a baseline result to detect regressions.
+"""
+
+import inspect
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from bfcl.benchmarks.synthetic import SyntheticCompletionGenerator, first_answer, render_java, render_javascript
+from bfcl.constants.category_mappings import TestCategory, TestCollection
+from bfcl.constants.id_mapper import IDMapper
+from bfcl.constants.type_mappings import JAVA_TYPE_CONVERSION, JS_TYPE_CONVERSION
+from bfcl.eval.ast.checkers import ast_checker, dict_checker, simple_function_checker, string_checker
+from bfcl.eval.ast.utils import java_type_converter, js_type_converter
+from bfcl.eval.exec import executable_python_functions
+from bfcl.eval.exec.checkers import executable_checker_simple
+from bfcl.schemas.tool_calls import ToolCallList
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS: Dict[str, Callable] = {
+    "ast_checker": ast_checker,
+    "simple_function_checker": simple_function_checker,
+    "string_checker": string_checker,
+    "dict_checker": dict_checker,
+    "java_type_converter": java_type_converter,
+    "js_type_converter": js_type_converter,
+    "executable_checker_simple": executable_checker_simple,
+}
+
+# The AST categories with ground truth, the irrelevance categories have nothing to check
+_AST_CATEGORIES = [
+    category
+    for category in TestCollection.AST.value[2]
+    if category not in TestCollection.IRRELEVANCE.value[2] and category.value[3]
+]
+# The conversions not implemented by the type converters
+_UNSUPPORTED_TYPES = {"Set", "Hashtable", "Queue", "Stack"}
+
+
+def _sample(ids: List[str], num: int | None, rng: random.Random) -> List[str]:
+    ids = sorted(ids)
+    return ids if num is None or num >= len(ids) else rng.sample(ids, num)
+
+
+def _is_offline(call: str) -> bool:
+    """Check whether an executable function runs without network access or sleeping."""
+    func = getattr(executable_python_functions, call.split("(")[0], None)
+    if func is None:
+        return False
+    source = inspect.getsource(func)
+    return "requests." not in source and "time.sleep" not in source
+
+
+def build_cases(
+    id_mapper: IDMapper, num_per_category: int | None = 50, seed: int = 0
+) -> Dict[str, List[Tuple[Any, ...]]]:
+    """Build the inputs of every benchmark from the bundled data.
+
+    Args:
+        id_mapper (IDMapper): The mapper to take the ground truth and function descriptions from.
+        num_per_category (int): The number of ids sampled per category, all ids if None.
+        seed (int): The seed of the sampling.
+
+    Returns:
+        A dictionary from benchmark names to lists of positional arguments of the checker.
+    """
+    rng = random.Random(seed)
+    generator = SyntheticCompletionGenerator(id_mapper)
+    ids_by_category = {}
+    for id, category in id_mapper.id_to_category.items():
+        ids_by_category.setdefault(category, []).append(id)
+
+    cases = {name: [] for name in BENCHMARKS}
+    for category in _AST_CATEGORIES:
+        for id in _sample(ids_by_category.get(category, []), num_per_category, rng):
+            completion = generator.completion(id, "correct")
+            if completion is None:
+                continue
+            descriptions = id_mapper.get_function_description(id)
+            tool_calls = ToolCallList.from_json_dict_list(json.loads(completion))
+            ground_truth = id_mapper.get_ground_truth(id)
+            language = id_mapper.get_language(id)
+            cases["ast_checker"].append((descriptions, tool_calls, ground_truth, language, category.value[1]))
+            if len(ground_truth) == 1 and len(descriptions) == 1:
+                cases["simple_function_checker"].append((descriptions[0], tool_calls[0], ground_truth[0], language))
+
+            # the parameter-level checkers and converters
+            properties = {func["name"]: func["parameters"]["properties"] for func in descriptions}
+            for tool_call in ground_truth.tool_calls:
+                for param, possible_answer in tool_call.parameters.items():
+                    details = properties.get(tool_call.function_name, {}).get(param)
+                    value = first_answer(possible_answer)
+                    if details is None or value == "":
+                        continue
+                    expected_type, nested_type = details["type"], details.get("items", {}).get("type")
+                    if language == "java":
+                        if expected_type in JAVA_TYPE_CONVERSION and expected_type not in _UNSUPPORTED_TYPES:
+                            rendered = render_java(value, expected_type, nested_type)
+                            cases["java_type_converter"].append((rendered, expected_type, nested_type))
+                    elif language == "javascript":
+                        if expected_type in JS_TYPE_CONVERSION:
+                            rendered = render_javascript(value, expected_type, nested_type)
+                            cases["js_type_converter"].append((rendered, expected_type, nested_type))
+                    elif expected_type == "string" and isinstance(value, str):
+                        cases["string_checker"].append((param, value, possible_answer))
+                    elif expected_type == "dict" and isinstance(value, dict):
+                        cases["dict_checker"].append((param, value, possible_answer))
+
+    exec_ids = _sample(ids_by_category.get(TestCategory.EXEC_SIMPLE, []), None, rng)
+    offline_ids = [id for id in exec_ids if _is_offline(id_mapper.get_ground_truth(id)[0])]
+    for id in _sample(offline_ids, num_per_category, rng):
+        ground_truth = id_mapper.get_ground_truth(id)[0]
+        result_type = id_mapper.get_function_description(id)[0]["execution_result_type"][0]
+        cases["executable_checker_simple"].append((ground_truth, ground_truth, result_type, False))
+    return cases
+
+
+def time_benchmark(func: Callable, cases: List[Tuple[Any, ...]], repeat: int = 5) -> Dict[str, Any]:
+    """Time a function over its inputs.
+
+    Every round calls the function once per input, after one warm-up round.
+
+    Args:
+        func (Callable): The function to time.
+        cases (List[Tuple]): The positional arguments of every call.
+        repeat (int): The number of timed rounds.
+
+    Returns:
+        The number of inputs and rounds, and the min, median, mean and standard deviation of the time per call in
+        microseconds over the rounds.
+    """
+    for args in cases:
+        func(*args)
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for args in cases:
+            func(*args)
+        per_call.append((time.perf_counter_ns() - start) / len(cases) / 1000)
+    return {
+        "num_inputs": len(cases),
+        "repeat": repeat,
+        "min_us": min(per_call),
+        "median_us": statistics.median(per_call),
+        "mean_us": statistics.fmean(per_call),
+        "stdev_us": statistics.stdev(per_call) if repeat > 1 else 0.0,
+    }
+
+
+def git_commit() -> Tuple[str, bool]:
+    """Get the current git commit and whether the working tree has uncommitted changes."""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd, capture_output=True, text=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, bool(status.strip())
+
+
+def run_benchmarks(
+    names: List[str] | None = None,
+    num_per_category: int | None = 50,
+    repeat: int = 5,
+    seed: int = 0,
+    id_mapper: IDMapper | None = None,
+) -> Dict[str, Any]:
+    """Run the checker benchmarks.
+
+    Args:
+        names (List[str]): The benchmarks to run, all benchmarks if None.
+        num_per_category (int): The number of ids sampled per category for the inputs.
+        repeat (int): The number of timed rounds of every benchmark.
+        seed (int): The seed of the sampling of the inputs.
+        id_mapper (IDMapper): The mapper to take the inputs from, loaded if not given.
+
+    Returns:
+        The results, with the git commit and environment they were measured in.
+    """
+    cases = build_cases(id_mapper or IDMapper(), num_per_category, seed)
+    commit, dirty = git_commit()
+    results = {
+        "suite": "checkers",
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"num_per_category": num_per_category, "repeat": repeat, "seed": seed},
+        "benchmarks": {},
+    }
+    for name in names or list(BENCHMARKS):
+        if not cases[name]:
+            logger.warning(f"No inputs for benchmark {name}, skipping.")
+            continue
+        results["benchmarks"][name] = time_benchmark(BENCHMARKS[name], cases[name], repeat)
+        logger.info(f"{name}: {results['benchmarks'][name]['median_us']:.2f} us/call")
+    return results
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1, metric: str = "median_us"
+) -> Dict[str, Dict[str, Any]]:
+    """Compare results against a baseline.
+
+    Args:
+        results (Dict): The current results.
+        baseline (Dict): The baseline results.
+        threshold (float): The relative slowdown above which a benchmark is a regression, e.g. 0.1 for 10%.
+        metric (str): The timing to compare.
+
+    Returns:
+        A dictionary from the benchmarks in both results to their baseline and current timings, ratio, and whether
+        they regressed.
+    """
+    comparison = {}
+    for name, current in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+        before, after = baseline["benchmarks"][name][metric], current[metric]
+        ratio = after / before if before else float("inf")
+        comparison[name] = {
+            "baseline": before,
+            "current": after,
+            "ratio": ratio,
+            "regressed": ratio > 1 + threshold,
+        }
+    return comparison
@@ -0,0 +1,139 @@
+"""Command line entry point of the benchmark suites.
+
+Results are saved to `<output_dir>/<suite>/<commit>.json`, with a `-dirty` suffix when the working tree has uncommitted
+changes, so that the results of any two commits can be compared. A baseline is given as a results file or a commit
+(prefix) whose results were saved to the same directory.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict
+
+from bfcl.benchmarks import checkers, startup
+
+logger = logging.getLogger(__name__)
+
+
+def save_results(results: Dict[str, Any], output_dir: str) -> str:
+    """Save results to `<output_dir>/<suite>/<commit>.json` and return the path."""
+    suite_dir = os.path.join(output_dir, results["suite"])
+    os.makedirs(suite_dir, exist_ok=True)
+    path = os.path.join(suite_dir, results["commit"] + ("-dirty" if results["dirty"] else "") + ".json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def load_baseline(baseline: str, output_dir: str, suite: str) -> Dict[str, Any]:
+    """Load baseline results from a file, or from the saved results of a commit.
+
+    Args:
+        baseline (str): The path to a results file, or a commit (prefix) with results in the output directory.
+        output_dir (str): The directory the results are saved to.
+        suite (str): The benchmark suite of the results.
+
+    Returns:
+        The baseline results.
+    """
+    if not os.path.isfile(baseline):
+        matches = sorted(glob.glob(os.path.join(output_dir, suite, f"{baseline}*.json")))
+        # prefer the results of the clean tree over the dirty ones
+        clean = [match for match in matches if not match.endswith("-dirty.json")]
+        if not matches:
+            raise FileNotFoundError(f"No {suite} results for baseline {baseline} in {output_dir}.")
+        baseline = (clean or matches)[0]
+    with open(baseline, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_checkers(args: argparse.Namespace) -> int:
+    # loaded before the run, whose results overwrite any saved for the same commit
+    baseline = load_baseline(args.baseline, args.output_dir, "checkers") if args.baseline else None
+    results = checkers.run_benchmarks(args.benchmarks, args.num_per_category, args.repeat, args.seed)
+    path = save_results(results, args.output_dir)
+    logger.info(f"Results saved to {path}")
+
+    print(f"{'benchmark':<28}{'inputs':>8}{'min us':>12}{'median us':>12}{'mean us':>12}")
+    for name, timing in results["benchmarks"].items():
+        print(
+            f"{name:<28}{timing['num_inputs']:>8}{timing['min_us']:>12.2f}"
+            f"{timing['median_us']:>12.2f}{timing['mean_us']:>12.2f}"
+        )
+    if baseline is None:
+        return 0
+
+    comparison = checkers.compare(results, baseline, args.threshold, args.metric)
+    print(f"\nCompared with {baseline['commit'][:12]} ({args.metric}, threshold {args.threshold:.0%}):")
+    for name, result in comparison.items():
+        flag = "REGRESSED" if result["regressed"] else "ok"
+        print(f"{name:<28}{result['baseline']:>12.2f}{result['current']:>12.2f}{result['ratio']:>8.2f}x  {flag}")
+    regressions = [name for name, result in comparison.items() if result["regressed"]]
+    if regressions:
+        logger.error(f"Regressions above {args.threshold:.0%}: {regressions}")
+        return 1
+    return 0
+
+
+def run_startup(args: argparse.Namespace) -> int:
+    report = startup.run_startup_benchmarks(args.scenarios, args.repeat, args.top)
+    path = save_results(report, args.output_dir)
+    logger.info(f"Report saved to {path}")
+
+    print(f"{'scenario':<36}{'ids':>8}{'total s':>10}{'peak MB':>10}{'steady MB':>11}")
+    for name, result in report["scenarios"].items():
+        peak, steady = result["rss_peak_mb"] or {}, result["rss_steady_mb"] or {}
+        print(
+            f"{name:<36}{result.get('num_ids', ''):>8}{result['total_s']['median']:>10.3f}"
+            f"{peak.get('median', float('nan')):>10.1f}{steady.get('median', float('nan')):>11.1f}"
+        )
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the BFCL benchmark suites")
+    subparsers = parser.add_subparsers(dest="suite", required=True)
+
+    checkers_parser = subparsers.add_parser("checkers", help="Micro-benchmarks of the checker hot paths")
+    checkers_parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        default=None,
+        choices=list(checkers.BENCHMARKS),
+        help="Benchmarks to run (default: all)",
+    )
+    checkers_parser.add_argument("--num_per_category", type=int, default=50, help="Ids sampled per category for inputs")
+    checkers_parser.add_argument("--repeat", type=int, default=5, help="Number of timed rounds per benchmark")
+    checkers_parser.add_argument("--seed", type=int, default=0, help="Seed of the sampling of the inputs")
+    checkers_parser.add_argument("--output_dir", default="benchmark_results", help="Directory to save the results to")
+    checkers_parser.add_argument("--baseline", default=None, help="Results file or commit to compare against")
+    checkers_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Relative slowdown counted as a regression (default: 0.10)"
+    )
+    checkers_parser.add_argument(
+        "--metric", default="median_us", choices=["min_us", "median_us", "mean_us"], help="Timing to compare"
+    )
+    checkers_parser.set_defaults(func=run_checkers)
+
+    startup_parser = subparsers.add_parser("startup", help="Startup time and memory of the server and the IDMapper")
+    startup_parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=None,
+        help="Scenarios: main, full, collection:<name> or category:<name> (default: all)",
+    )
+    startup_parser.add_argument("--repeat", type=int, default=3, help="Number of measured runs per scenario")
+    startup_parser.add_argument("--top", type=int, default=10, help="Number of top allocators per scenario, none if 0")
+    startup_parser.add_argument("--output_dir", default="benchmark_results", help="Directory to save the report to")
+    startup_parser.set_defaults(func=run_startup)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Load-test harness replaying a corpus of completions against a running BFCL server.
+
+The corpus is a JSONL file of `{"id": ..., "completion": ...}` records, the same input as `bfcl-score`. Requests are
+sent to `/call` (one record per request), `/calls` or `/calls/stream` (batches of records) by a pool of concurrent
+clients, optionally paced to a fixed request rate, and the run is summarised as a JSON report with the throughput, the
+latency percentiles and the error rates per `TestCategory`.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
+
+import requests
+
+from bfcl.constants.category_mappings import TestCategory
+from bfcl.utils.ops import extract_test_category, extract_test_category_from_id, iter_jsonl
+
+logger = logging.getLogger(__name__)
+
+MODES = {"call": "/call", "calls": "/calls", "stream": "/calls/stream"}
+
+# The id prefix of every category, e.g. `live_simple` for the id `live_simple_0-0-0`
+_CATEGORY_BY_PREFIX = {extract_test_category(category.value[2]): category.name for category in TestCategory}
+
+
+def category_of(id: str) -> str:
+    """Get the `TestCategory` name of an id from its prefix, or `UNKNOWN`."""
+    return _CATEGORY_BY_PREFIX.get(extract_test_category_from_id(id), "UNKNOWN")
+
+
+def load_corpus(input_file: str, limit: int | None = None, repeat: int = 1, seed: int | None = None) -> List[dict]:
+    """Load the records to replay.
+
+    Args:
+        input_file (str): The JSONL file of `{"id": ..., "completion": ...}` records.
+        limit (int): The maximum number of records to take from the file.
+        repeat (int): The number of times the records are replayed.
+        seed (int): The seed of the shuffle of the records; the file order is kept if None.
+
+    Returns:
+        The list of records in the order they are sent.
+    """
+    # only the records taken are read from the file
+    records = [
+        {"id": record["id"], "completion": record["completion"]}
+        for record in itertools.islice(iter_jsonl(input_file), limit)
+    ] * repeat
+    if seed is not None:
+        random.Random(seed).shuffle(records)
+    return records
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Get the p50, p95 and p99 (nearest rank), mean and max of latencies in seconds, as milliseconds."""
+    if not values:
+        return {}
+    values = sorted(values)
+
+    def rank(q: float) -> float:
+        return values[min(len(values) - 1, max(0, int(q * len(values) + 0.5) - 1))] * 1000
+
+    return {
+        "p50": rank(0.50),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "mean": sum(values) / len(values) * 1000,
+        "max": values[-1] * 1000,
+    }
+
+
+class _Pacer:
+    """Hand out send times spaced `1 / rate` apart, shared by all clients."""
+
+    def __init__(self, rate: float | None):
+        self.interval = 1 / rate if rate else 0.0
+        self._next = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            send_at = self._next
+            self._next = max(self._next, time.perf_counter()) + self.interval
+        delay = send_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class LoadTest:
+    """A load test of one server with one mode.
+
+    Args:
+        url (str): The base URL of the server, e.g. `http://127.0.0.1:1123`.
+        mode (str): The endpoint to load, one of `call`, `calls` and `stream`.
+        concurrency (int): The number of concurrent clients.
+        batch_size (int): The number of records per request for `calls` and `stream`.
+        rate (float): The maximum number of requests sent per second across all clients; unlimited if None.
+        timeout (float): The timeout of a request in seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        mode: str = "call",
+        concurrency: int = 8,
+        batch_size: int = 32,
+        rate: float | None = None,
+        timeout: float = 60.0,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode}, expected one of {list(MODES)}.")
+        self.url = url.rstrip("/") + MODES[mode]
+        self.mode = mode
+        self.concurrency = concurrency
+        self.batch_size = 1 if mode == "call" else batch_size
+        self.rate = rate
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _send(self, batch: List[dict]) -> Tuple[float, float | None, List[dict] | None, str | None]:
+        """Send a batch and return its latency, first-response latency, responses (in batch order) and error."""
+        start = time.perf_counter()
+        first = None
+        try:
+            if self.mode == "call":
+                response = self._session().get(self.url, json=batch[0], timeout=self.timeout)
+                response.raise_for_status()
+                responses = [response.json()]
+            elif self.mode == "calls":
+                response = self._session().get(self.url, json=batch, timeout=self.timeout)
+                response.raise_for_status()
+                responses = response.json()
+            else:
+                responses = [None] * len(batch)
+                with self._session().get(self.url, json=batch, timeout=self.timeout, stream=True) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        if first is None:
+                            first = time.perf_counter() - start
+                        item = json.loads(line)
+                        responses[item.pop("index")] = item
+            return time.perf_counter() - start, first, responses, None
+        except (requests.RequestException, ValueError) as e:
+            return time.perf_counter() - start, first, None, f"{type(e).__name__}: {str(e)}"
+
+    def _batches(self, records: List[dict]) -> Iterator[List[dict]]:
+        for start in range(0, len(records), self.batch_size):
+            yield records[start : start + self.batch_size]
+
+    def run(self, records: List[dict]) -> Dict[str, Any]:
+        """Replay the records and return the report of the run."""
+        pacer = _Pacer(self.rate)
+        batches = self._batches(records)
+        batches_lock = threading.Lock()
+        outcomes = []
+
+        def client():
+            while True:
+                with batches_lock:
+                    batch = next(batches, None)
+                if batch is None:
+                    return
+                pacer.wait()
+                outcomes.append((batch, *self._send(batch)))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for future in [executor.submit(client) for _ in range(self.concurrency)]:
+                future.result()
+        duration = time.perf_counter() - start
+        return self._report(outcomes, duration, len(records))
+
+    def _report(self, outcomes: list, duration: float, num_records: int) -> Dict[str, Any]:
+        latencies, first_latencies, request_errors = [], [], {}
+        categories = {}
+        for batch, latency, first, responses, error in outcomes:
+            latencies.append(latency)
+            if first is not None:
+                first_latencies.append(first)
+            if error is not None:
+                request_errors[error] = request_errors.get(error, 0) + 1
+            for index, record in enumerate(batch):
+                stats = categories.setdefault(
+                    category_of(record["id"]), {"items": 0, "errors": 0, "correct": 0, "latencies": []}
+                )
+                stats["items"] += 1
+                stats["latencies"].append(latency)
+                response = responses[index] if responses is not None else None
+                if response is None:
+                    stats["errors"] += 1
+                elif response.get("correct"):
+                    stats["correct"] += 1
+
+        num_requests = len(outcomes)
+        num_errors = sum(stats["errors"] for stats in categories.values())
+        report = {
+            "config": {
+                "url": self.url,
+                "mode": self.mode,
+                "concurrency": self.concurrency,
+                "batch_size": self.batch_size,
+                "rate": self.rate,
+            },
+            "duration_s": duration,
+            "requests": {
+                "total": num_requests,
+                "errors": sum(request_errors.values()),
+                "error_rate": sum(request_errors.values()) / num_requests if num_requests else 0.0,
+                "error_messages": request_errors,
+                "throughput_rps": num_requests / duration if duration else 0.0,
+                "latency_ms": percentiles(latencies),
+            },
+            "items": {
+                "total": num_records,
+                "errors": num_errors,
+                "error_rate": num_errors / num_records if num_records else 0.0,
+                "throughput_ips": num_records / duration if duration else 0.0,
+            },
+            "categories": {},
+        }
+        if first_latencies:
+            report["requests"]["first_item_latency_ms"] = percentiles(first_latencies)
+        for name, stats in sorted(categories.items()):
+            answered = stats["items"] - stats["errors"]
+            report["categories"][name] = {
+                "items": stats["items"],
+                "errors": stats["errors"],
+                "error_rate": stats["errors"] / stats["items"],
+                "correct": stats["correct"],
+                "accuracy": stats["correct"] / answered if answered else 0.0,
+                "latency_ms": percentiles(stats["latencies"]),
+            }
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a corpus of completions against a running BFCL server")
+    parser.add_argument("--input", required=True, help="JSONL file of {id, completion} records")
+    parser.add_argument("--url", default="http://127.0.0.1:1123", help="Base URL of the server")
+    parser.add_argument("--mode", default="call", choices=list(MODES), help="Endpoint to load (default: call)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent clients")
+    parser.add_argument("--batch_size", type=int, default=32, help="Number of records per request for calls/stream")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum requests per second (default: unlimited)")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of records to take from the input")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of times the records are replayed")
+    parser.add_argument("--seed", type=int, default=None, help="Seed to shuffle the records (default: file order)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout of a request in seconds")
+    parser.add_argument("--output", default=None, help="JSON file to write the report to (default: stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    records = load_corpus(args.input, args.limit, args.repeat, args.seed)
+    logger.info(f"Replaying {len(records)} records against {args.url} in {args.mode} mode.")
+    load_test = LoadTest(args.url, args.mode, args.concurrency, args.batch_size, args.rate, args.timeout)
+    report = load_test.run(records)
+    report["config"].update({"input": args.input, "limit": args.limit, "repeat": args.repeat, "seed": args.seed})
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Report saved to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Startup and memory benchmarks of the server boot and the `IDMapper`.
+
+Every scenario runs in a fresh interpreter, so that import caches and memory already held do not leak between
+scenarios:
+
+- `main`: importing `bfcl.main`, which boots the server with a `PlainJsonRunner` and its full `IDMapper`.
+- `full`: constructing an `IDMapper` of all categories.
+- `collection:<name>`: constructing an `IDMapper` of the categories of one `TestCollection`.
+- `category:<name>`: constructing an `IDMapper` of one `TestCategory`.
+
+The timings and RSS are measured in runs without `tracemalloc`, whose overhead would distort them, and the top
+allocators in one extra traced run. This module only imports the standard library at the top level, so that the
+worker processes measure the imports of `bfcl` from scratch.
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# The directory containing the `bfcl` package, added to the path of the workers
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+#### Measurements in the worker ####
+
+
+def rss_mb() -> float | None:
+    """Get the current resident set size of the process in MB, or None if it cannot be read."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> float | None:
+    """Get the peak resident set size of the process in MB, or None if it cannot be read."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss / 2**20 if sys.platform == "darwin" else max_rss / 2**10
+
+
+def _short_path(filename: str) -> str:
+    """Strip the longest `sys.path` entry from a file name."""
+    prefixes = [path for path in sys.path if path and filename.startswith(path + os.sep)]
+    return filename[len(max(prefixes, key=len)) + 1 :] if prefixes else filename
+
+
+def _construct_id_mapper(scenario: str) -> tuple:
+    from bfcl.constants.category_mappings import TestCategory, TestCollection
+    from bfcl.constants.id_mapper import IDMapper
+
+    kind, _, name = scenario.partition(":")
+    if kind == "collection":
+        categories = TestCollection[name.upper()].value[2]
+    elif kind == "category":
+        categories = [TestCategory[name.upper()]]
+    else:
+        categories = None
+    id_mapper = IDMapper(categories)
+    return {"num_ids": len(id_mapper.id_to_category)}, id_mapper
+
+
+def _stages(scenario: str) -> List[tuple]:
+    """Get the named stages of a scenario, each returning extra fields of the report and an object to keep alive."""
+    if scenario == "main":
+        return [
+            ("import_runners", lambda: ({}, importlib.import_module("bfcl.runners"))),
+            ("import_main", lambda: ({}, importlib.import_module("bfcl.main"))),
+        ]
+    if scenario != "full" and scenario.partition(":")[0] not in ("collection", "category"):
+        raise ValueError(f"Unknown scenario {scenario}.")
+    return [
+        ("import", lambda: ({}, importlib.import_module("bfcl.constants.id_mapper"))),
+        ("construct", lambda: _construct_id_mapper(scenario)),
+    ]
+
+
+def measure(scenario: str, top: int = 0) -> Dict[str, Any]:
+    """Run a scenario in the current process and measure it.
+
+    Args:
+        scenario (str): The scenario to run.
+        top (int): The number of top allocators to report; if positive, the scenario runs under `tracemalloc` and
+            only the allocations are reported.
+
+    Returns:
+        The duration of every stage in seconds and the RSS in MB, or the top allocators.
+    """
+    if top:
+        tracemalloc.start()
+    report = {"rss_start_mb": rss_mb(), "stages_s": {}}
+    keep_alive = []
+    start = time.perf_counter()
+    for name, stage in _stages(scenario):
+        stage_start = time.perf_counter()
+        extra, obj = stage()
+        report["stages_s"][name] = time.perf_counter() - stage_start
+        report.update(extra)
+        keep_alive.append(obj)
+    report["total_s"] = time.perf_counter() - start
+
+    if top:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*"),
+            ]
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            "traced_current_mb": current / 2**20,
+            "traced_peak_mb": peak / 2**20,
+            "top_allocators": [
+                {
+                    "location": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                    "size_mb": stat.size / 2**20,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:top]
+            ],
+        }
+
+    report["rss_peak_mb"] = peak_rss_mb()
+    gc.collect()
+    report["rss_steady_mb"] = rss_mb()
+    return report
+
+
+#### Orchestration in the parent ####
+
+
+def default_scenarios() -> List[str]:
+    """Get the scenarios of the full and per-collection loads, and of the load of every category."""
+    from bfcl.constants.category_mappings import TestCategory, TestCollection
+
+    return (
+        ["main", "full"]
+        + [f"collection:{collection.name.lower()}" for collection in TestCollection if collection.name != "ALL"]
+        + [f"category:{category.name.lower()}" for category in TestCategory]
+    )
+
+
+def run_worker(scenario: str, top: int = 0, timeout: float = 600.0) -> Dict[str, Any]:
+    """Run a scenario in a fresh interpreter and return its measurements."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_PACKAGE_ROOT, env.get("PYTHONPATH")]))
+    process = subprocess.run(
+        [sys.executable, "-m", "bfcl.benchmarks.startup", scenario, "--top", str(top)],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=timeout,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Scenario {scenario} failed:\n{process.stderr}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def _summary(values: List[float | None]) -> Dict[str, float] | None:
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    return {"min": min(values), "median": statistics.median(values), "max": max(values)}
+
+
+def run_startup_benchmarks(scenarios: List[str] | None = None, repeat: int = 3, top: int = 10) -> Dict[str, Any]:
+    """Run the startup and memory benchmarks.
+
+    Args:
+        scenarios (List[str]): The scenarios to run, see `default_scenarios` for the default.
+        repeat (int): The number of measured runs of every scenario.
+        top (int): The number of top allocators reported per scenario, none if 0.
+
+    Returns:
+        The report, with the git commit and environment it was measured in.
+    """
+    # imported here to keep the imports of the workers minimal
+    from bfcl.benchmarks.checkers import git_commit
+
+    scenarios = scenarios or default_scenarios()
+    commit, dirty = git_commit()
+    report = {
+        "suite": "startup",
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"repeat": repeat, "top": top},
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        runs = [run_worker(scenario) for _ in range(repeat)]
+        result = {
+            "total_s": _summary([run["total_s"] for run in runs]),
+            "stages_s": {name: _summary([run["stages_s"][name] for run in runs]) for name in runs[0]["stages_s"]},
+            "rss_start_mb": _summary([run["rss_start_mb"] for run in runs]),
+            "rss_peak_mb": _summary([run["rss_peak_mb"] for run in runs]),
+            "rss_steady_mb": _summary([run["rss_steady_mb"] for run in runs]),
+        }
+        if "num_ids" in runs[0]:
+            result["num_ids"] = runs[0]["num_ids"]
+        if top:
+            result.update(run_worker(scenario, top))
+        report["scenarios"][scenario] = result
+        logger.info(
+            f"{scenario}: {result['total_s']['median']:.3f} s, "
+            f"steady RSS {(result['rss_steady_mb'] or {}).get('median', float('nan')):.1f} MB"
+        )
+    return report
+
+
+def main():
+    # the entry point of the workers, the benchmarks are run with `bfcl-bench startup`
+    parser = argparse.ArgumentParser(description="Measure one startup scenario in the current process")
+    parser.add_argument("scenario", help="Scenario to measure")
+    parser.add_argument("--top", type=int, default=0, help="Number of top allocators to trace, no tracing if 0")
+    args = parser.parse_args()
+    print(json.dumps(measure(args.scenario, args.top)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Synthetic completions for benchmarking the runners without a model in the loop.
+
+Completions are synthesized from the ground truth loaded by `IDMapper`, either correct or with a perturbation that
+exercises a specific branch of the checkers:
+
+- `correct`: the first possible answer of every parameter, rendered in the language of the category.
+- `wrong_type`: the value of the first parameter replaced by a value of another type.
+- `missing_required`: the first required parameter dropped.
+- `extra_param`: an unexpected parameter added.
+- `reordered_parallel`: the calls of a parallel answer reversed, still correct since the order is not checked.
+- `wrong_function`: the name of the first call changed.
+- `irrelevant_text`: a plain-text answer, correct only for the irrelevance categories.
+- `tool_call`: a well-formed call of an available function, for the categories without usable ground truth
+  (irrelevance, relevance and REST, whose checker needs the live API).
+- `malformed`: a truncated JSON completion.
+
+Not every kind applies to every id, e.g. `reordered_parallel` needs several calls.
+"""
+
+import argparse
+import ast
+import json
+import logging
+import random
+from typing import Any, Dict, Iterator, List
+
+from bfcl.constants.category_mappings import TestCategory, TestCollection
+from bfcl.constants.id_mapper import IDMapper
+from bfcl.utils.ops import write_jsonl
+
+logger = logging.getLogger(__name__)
+
+KINDS = (
+    "correct",
+    "wrong_type",
+    "missing_required",
+    "extra_param",
+    "reordered_parallel",
+    "wrong_function",
+    "irrelevant_text",
+    "tool_call",
+    "malformed",
+)
+
+IRRELEVANT_TEXT = "I'm sorry, but none of the available functions can help with this request."
+EXTRA_PARAM = "synthetic_extra_param"
+
+# The Java element types of `new T[]{...}` arrays
+_JAVA_ARRAY_TYPES = {"integer": "int", "long": "long", "float": "float", "double": "double", "boolean": "boolean"}
+
+
+#### Rendering the ground truth ####
+def first_answer(possible_answer: Any) -> Any:
+    """Materialize the first possible answer of a parameter, or `""` if the parameter may be omitted.
+
+    Dictionaries in the ground truth map every key to its own list of possible values, so they are materialized
+    recursively, dropping the optional keys.
+    """
+    value = possible_answer[0] if isinstance(possible_answer, list) and possible_answer else possible_answer
+    return _materialize(value)
+
+
+def _materialize(value: Any) -> Any:
+    if isinstance(value, dict):
+        materialized = {}
+        for key, possible_values in value.items():
+            item = first_answer(possible_values) if isinstance(possible_values, list) else possible_values
+            if item != "":
+                materialized[key] = item
+        return materialized
+    if isinstance(value, list):
+        return [_materialize(item) for item in value]
+    return value
+
+
+def _render_java_literal(value: Any) -> str:
+    """Render a value without type information, as parsed back by `parse_java_value`."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return f'"{value}"'
+    return str(value)
+
+
+def render_java(value: Any, expected_type: str, nested_type: str | None = None) -> str:
+    """Render a value as the Java source expected by `java_type_converter`."""
+    if isinstance(value, str) and expected_type not in ("String", "any", "char"):
+        return value  # already source code, e.g. a variable or a constant
+    if expected_type == "boolean":
+        return "true" if value else "false"
+    if expected_type == "long":
+        return f"{value}L"
+    if expected_type == "float":
+        return f"{value}f"
+    if expected_type == "double":
+        return repr(float(value))
+    if expected_type == "ArrayList":
+        if nested_type == "String":
+            elements = [f'"{item}"' for item in value]
+        else:
+            elements = [render_java(item, nested_type) if nested_type else _render_java_literal(item) for item in value]
+        return f"new ArrayList<>(Arrays.asList({', '.join(elements)}))"
+    if expected_type == "Array":
+        if nested_type:
+            elements = [render_java(item, nested_type) for item in value]
+        else:
+            elements = [_render_java_literal(item) for item in value]
+        return f"new {_JAVA_ARRAY_TYPES.get(nested_type, 'Object')}[]{{{', '.join(elements)}}}"
+    if expected_type == "HashMap":
+        puts = " ".join(f'put("{key}", {_render_java_literal(item)});' for key, item in value.items())
+        return f"new HashMap<String, Object>() {{{{ {puts} }}}}"
+    return str(value)
+
+
+def render_javascript(value: Any, expected_type: str, nested_type: str | None = None) -> str:
+    """Render a value as the JavaScript source expected by `js_type_converter`."""
+    _ = nested_type
+    if isinstance(value, str) and expected_type not in ("String", "any"):
+        return value  # already source code, e.g. a variable
+    if expected_type == "String":
+        return f'"{value}"'
+    if expected_type == "Boolean":
+        return "true" if value else "false"
+    if expected_type == "Bigint":
+        return f"{value}n"
+    if expected_type in ("array", "dict"):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+class SyntheticCompletionGenerator:
+    """The generator of synthetic completions.
+
+    Args:
+        id_mapper (IDMapper): The mapper to take the ground truth from, loaded if not given.
+        seed (int): The seed of the sampling of ids.
+    """
+
+    def __init__(self, id_mapper: IDMapper | None = None, seed: int = 0):
+        self.id_mapper = id_mapper or IDMapper()
+        self.random = random.Random(seed)
+
+    #### AST ####
+    def _ast_calls(self, id: str) -> List[Dict[str, Dict[str, Any]]] | None:
+        """Build the correct calls of an AST id rendered in its language, or None if the ground truth is missing or
+        inconsistent with the function description."""
+        language = self.id_mapper.get_language(id)
+        descriptions = {func["name"]: func for func in self.id_mapper.get_function_description(id)}
+        ground_truth = self.id_mapper.id_to_ground_truth.get(id)
+        if ground_truth is None:
+            return None
+        calls = []
+        for tool_call in ground_truth.tool_calls:
+            if tool_call.function_name not in descriptions:
+                return None
+            properties = descriptions[tool_call.function_name]["parameters"]["properties"]
+            parameters = {}
+            for param, possible_answer in tool_call.parameters.items():
+                value = first_answer(possible_answer)
+                if value == "":
+                    continue
+                if param not in properties:
+                    return None
+                expected_type = properties[param]["type"]
+                nested_type = properties[param].get("items", {}).get("type")
+                if language == "java":
+                    value = render_java(value, expected_type, nested_type)
+                elif language == "javascript":
+                    value = render_javascript(value, expected_type, nested_type)
+                parameters[param] = value
+            calls.append({tool_call.function_name: parameters})
+        return calls
+
+    def _perturb_ast(self, id: str, kind: str) -> List[Dict[str, Dict[str, Any]]] | None:
+        calls = self._ast_calls(id)
+        if calls is None:
+            return None
+        name, parameters = next(iter(calls[0].items()))
+        if kind == "correct":
+            return calls
+        if kind == "reordered_parallel":
+            return calls[::-1] if len(calls) > 1 else None
+        if kind == "wrong_function":
+            calls[0] = {f"{name}_synthetic": parameters}
+        elif kind == "extra_param":
+            parameters[EXTRA_PARAM] = "synthetic"
+        elif kind == "wrong_type":
+            if not parameters:
+                return None
+            param = next(iter(parameters))
+            # the non-python checkers expect the source code as a string, any other type is wrong
+            parameters[param] = 0 if isinstance(parameters[param], str) else "synthetic"
+        elif kind == "missing_required":
+            description = next(func for func in self.id_mapper.get_function_description(id) if func["name"] == name)
+            required = [param for param in description["parameters"]["required"] if param in parameters]
+            if not required:
+                return None
+            del parameters[required[0]]
+        else:
+            return None
+        return calls
+
+    #### Executable ####
+    def _perturb_exec(self, id: str, kind: str) -> List[str] | None:
+        if id not in self.id_mapper.id_to_ground_truth:
+            return None
+        calls = list(self.id_mapper.get_ground_truth(id))
+        if kind == "correct":
+            return calls
+        if kind == "reordered_parallel":
+            return calls[::-1] if len(calls) > 1 else None
+
+        call = ast.parse(calls[0], mode="eval").body
+        if not isinstance(call, ast.Call):
+            return None
+        if kind == "wrong_function":
+            call.func = ast.Name(id=f"{ast.unparse(call.func)}_synthetic")
+        elif kind == "extra_param":
+            call.keywords.append(ast.keyword(arg=EXTRA_PARAM, value=ast.Constant("synthetic")))
+        elif kind == "wrong_type":
+            if not call.keywords:
+                return None
+            value = call.keywords[0].value
+            is_string = isinstance(value, ast.Constant) and isinstance(value.value, str)
+            call.keywords[0].value = ast.Constant(0 if is_string else "synthetic")
+        elif kind == "missing_required":
+            required = self.id_mapper.get_function_description(id)[0]["parameters"]["required"]
+            keywords = [keyword for keyword in call.keywords if keyword.arg in required]
+            if not keywords:
+                return None
+            call.keywords.remove(keywords[0])
+        else:
+            return None
+        calls[0] = ast.unparse(call)
+        return calls
+
+    #### Completions ####
+    def _available_call(self, id: str) -> str:
+        """Build a well-formed call of the first available function, or of a placeholder function."""
+        descriptions = self.id_mapper.id_to_function_description.get(id)
+        if self.id_mapper.get_category(id) == TestCategory.REST:
+            # REST completions are python code, calling the default URL of the endpoint
+            url = descriptions[0]["parameters"]["properties"]["url"].get("default", "")
+            return json.dumps([f"requests.get({url!r})"])
+        name = descriptions[0]["name"] if descriptions else "synthetic_function"
+        return json.dumps([{name: {}}])
+
+    def completion(self, id: str, kind: str) -> str | None:
+        """Synthesize a completion of the given kind for an id.
+
+        Args:
+            id (str): The id of the question.
+            kind (str): The kind of completion, one of `KINDS`.
+
+        Returns:
+            The completion, or None if the kind does not apply to the id.
+        """
+        category = self.id_mapper.get_category(id)
+        if kind == "malformed":
+            return '[{"synthetic_function": {'
+        if kind == "irrelevant_text":
+            return IRRELEVANT_TEXT
+        if category in TestCollection.IRRELEVANCE or category in (TestCategory.LIVE_RELEVENCE, TestCategory.REST):
+            # without (usable) ground truth, only a call of the available functions is synthesized
+            return self._available_call(id) if kind == "tool_call" else None
+        if kind == "tool_call":
+            return None
+        if category in TestCollection.MULTI_TURN:
+            # the ground truth trajectory is a completion as is, the perturbations of single calls do not apply
+            return json.dumps(self.id_mapper.get_ground_truth(id)) if kind == "correct" else None
+        if category in TestCollection.EXECUTABLE:
+            calls = self._perturb_exec(id, kind)
+        else:
+            calls = self._perturb_ast(id, kind)
+        return None if calls is None else json.dumps(calls, ensure_ascii=False)
+
+    def expected_correct(self, id: str, kind: str) -> bool | None:
+        """Get whether a completion of the given kind should be scored correct, or None if it depends on live APIs."""
+        category = self.id_mapper.get_category(id)
+        if category in TestCollection.IRRELEVANCE:
+            return kind in ("irrelevant_text", "malformed")
+        if category == TestCategory.LIVE_RELEVENCE:
+            return kind == "tool_call"
+        if category == TestCategory.REST:
+            return None if kind == "tool_call" else False
+        return kind in ("correct", "reordered_parallel")
+
+    def generate(self, id: str, kind: str) -> Dict[str, Any] | None:
+        """Synthesize a record `{"id", "completion", "kind", "category", "expected_correct"}` for an id.
+
+        Executable records also carry the `execution_result_type` of the question.
+        """
+        completion = self.completion(id, kind)
+        if completion is None:
+            return None
+        category = self.id_mapper.get_category(id)
+        record = {
+            "id": id,
+            "completion": completion,
+            "kind": kind,
+            "category": category.name,
+            "expected_correct": self.expected_correct(id, kind),
+        }
+        if category in TestCollection.EXECUTABLE and category != TestCategory.REST:
+            record["execution_result_type"] = self.id_mapper.get_function_description(id)[0]["execution_result_type"]
+        return record
+
+    def generate_all(
+        self,
+        categories: List[TestCategory] | None = None,
+        kinds: List[str] = KINDS,
+        num_per_category: int | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Synthesize the records of every applicable kind for the ids of the given categories.
+
+        Args:
+            categories (List[TestCategory]): The categories to cover, all categories if None.
+            kinds (List[str]): The kinds of completions to synthesize.
+            num_per_category (int): The number of ids sampled per category, all ids if None.
+
+        Yields:
+            The synthesized records.
+        """
+        ids_by_category = {}
+        for id, category in self.id_mapper.id_to_category.items():
+            ids_by_category.setdefault(category, []).append(id)
+
+        for category in categories or list(TestCategory):
+            ids = ids_by_category.get(category, [])
+            if num_per_category is not None and num_per_category < len(ids):
+                ids = self.random.sample(ids, num_per_category)
+            for id in ids:
+                for kind in kinds:
+                    record = self.generate(id, kind)
+                    if record is not None:
+                        yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesize completions from the BFCL ground truth for benchmarking")
+    parser.add_argument("--output", required=True, help="JSONL file to write the synthesized records to")
+    parser.add_argument(
+        "--categories",
+        nargs="+",
+        default=None,
+        help="TestCategory names to cover (default: all categories)",
+    )
+    parser.add_argument("--kinds", nargs="+", default=list(KINDS), choices=KINDS, help="Kinds of completions")
+    parser.add_argument("--num_per_category", type=int, default=None, help="Number of ids sampled per category")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the sampling of ids")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    categories = [TestCategory[name] for name in args.categories] if args.categories else None
+    generator = SyntheticCompletionGenerator(seed=args.seed)
+    num_records = write_jsonl(args.output, generator.generate_all(categories, args.kinds, args.num_per_category))
+    logger.info(f"Synthesized {num_records} completions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
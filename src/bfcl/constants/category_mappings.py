@@ -30,12 +30,11 @@ TEST_FILE_MAPPING = {
     "live_parallel_multiple": f"{VERSION_PREFIX}_live_parallel_multiple.json",
     "live_irrelevance": f"{VERSION_PREFIX}_live_irrelevance.json",
     "live_relevance": f"{VERSION_PREFIX}_live_relevance.json",
-    # TODO: support multi-turn
     # Multi-turn Datasets
-    # "multi_turn_base": f"{VERSION_PREFIX}_multi_turn_base.json",
-    # "multi_turn_miss_func": f"{VERSION_PREFIX}_multi_turn_miss_func.json",
-    # "multi_turn_miss_param": f"{VERSION_PREFIX}_multi_turn_miss_param.json",
-    # "multi_turn_long_context": f"{VERSION_PREFIX}_multi_turn_long_context.json",
+    "multi_turn_base": f"{VERSION_PREFIX}_multi_turn_base.json",
+    "multi_turn_miss_func": f"{VERSION_PREFIX}_multi_turn_miss_func.json",
+    "multi_turn_miss_param": f"{VERSION_PREFIX}_multi_turn_miss_param.json",
+    "multi_turn_long_context": f"{VERSION_PREFIX}_multi_turn_long_context.json",
     # "multi_turn_composite": f"{VERSION_PREFIX}_multi_turn_composite.json",
 }
 
@@ -59,17 +58,17 @@ TEST_COLLECTION_MAPPING = {
         "live_parallel_multiple",
         "live_irrelevance",
         "live_relevance",
-        # "multi_turn_base",
-        # "multi_turn_miss_func",
-        # "multi_turn_miss_param",
-        # "multi_turn_long_context",
+        "multi_turn_base",
+        "multi_turn_miss_func",
+        "multi_turn_miss_param",
+        "multi_turn_long_context",
+    ],
+    "multi_turn": [
+        "multi_turn_base",
+        "multi_turn_miss_func",
+        "multi_turn_miss_param",
+        "multi_turn_long_context",
     ],
-    # "multi_turn": [
-    #     "multi_turn_base",
-    #     "multi_turn_miss_func",
-    #     "multi_turn_miss_param",
-    #     "multi_turn_long_context",
-    # ],
     "single_turn": [
         "exec_simple",
         "exec_parallel",
@@ -213,7 +212,11 @@ class TestCategory(Enum):
     JAVA = (16, "java", f"{VERSION_PREFIX}_java.json", True)
     JAVASCRIPT = (17, "javascript", f"{VERSION_PREFIX}_javascript.json", True)
     REST = (18, "rest", f"{VERSION_PREFIX}_rest.json", False)
-    # TODO: add multi-turn categories
+    # multi-turn
+    MULTI_TURN_BASE = (19, "multi_turn_base", f"{VERSION_PREFIX}_multi_turn_base.json", True)
+    MULTI_TURN_MISS_FUNC = (20, "multi_turn_miss_func", f"{VERSION_PREFIX}_multi_turn_miss_func.json", True)
+    MULTI_TURN_MISS_PARAM = (21, "multi_turn_miss_param", f"{VERSION_PREFIX}_multi_turn_miss_param.json", True)
+    MULTI_TURN_LONG_CONTEXT = (22, "multi_turn_long_context", f"{VERSION_PREFIX}_multi_turn_long_context.json", True)
 
 
 class TestCollection(Enum):
@@ -278,6 +281,7 @@ class TestCollection(Enum):
         ],
     )
     IRRELEVANCE = (9, "irrelevance", [TestCategory.IRRELEVANCE, TestCategory.LIVE_IRRELEVANCE])
+    MULTI_TURN = (10, "multi_turn", [cat for cat in TestCategory if cat.value[1].startswith("multi_turn_")])
 
     # fmt: on
     def __contains__(self, item):
@@ -10,6 +10,22 @@ VLLM_PORT = 1053
 
 REAL_TIME_MATCH_ALLOWED_DIFFERENCE = 0.1
 
+# The maximum number of cached conversions of the Java and JavaScript arguments, and the maximum length of the cached
+# argument strings
+CONVERSION_CACHE_SIZE = 65536
+CONVERSION_CACHE_MAX_VALUE_LENGTH = 4096
+
+# The seconds a multi-turn session is kept without a turn applied, and the maximum number of sessions kept
+MULTI_TURN_SESSION_TTL = 900.0
+MULTI_TURN_MAX_SESSIONS = 4096
+
+# The default and maximum number of prompts in a page of `GET /prompts`
+PROMPTS_PAGE_SIZE = 100
+PROMPTS_MAX_PAGE_SIZE = 1000
+
+# The buffer size of the JSONL files written a record at a time
+JSONL_WRITE_BUFFER_SIZE = 1 << 20
+
 RED_FONT = "\033[91m"
 RESET = "\033[0m"
 
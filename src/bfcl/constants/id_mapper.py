@@ -1,59 +1,81 @@
 """This file implements the mappings from the prompt IDs to the categories and ground truth.
 """
+import bisect
+import copy
+import hashlib
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Collection, Dict, List, Tuple
 
 from bfcl.constants.category_mappings import TestCategory, TestCollection
 from bfcl.constants.config import POSSIBLE_ANSWER_PATH, PROMPT_PATH, REST_EVAL_GROUND_TRUTH_PATH
+from bfcl.eval.multi_turn.environment import function_descriptions
 from bfcl.schemas.tool_calls import ToolCallList
+from bfcl.utils.ops import iter_jsonl, sort_key
 
 logger = logging.getLogger(__name__)
 
 
 class IDMapper:
-    """The mapper from the prompt IDs to the categories and ground truth."""
+    """The mapper from the prompt IDs to the categories and ground truth.
 
-    def __init__(self):
+    Args:
+        categories (List[TestCategory]): The categories to load, all categories if None.
+    """
+
+    def __init__(self, categories: List[TestCategory] | None = None):
         self.id_to_category = {}
         self.id_to_language = {}
         self.id_to_ground_truth = {}
         self.id_to_function_description = {}
+        self.id_to_multi_turn_entry = {}
+        self.id_to_question = {}
+        # the ids ordered by `sort_key`, and the digest of the prompts, computed on the first query of the prompts
+        self._sorted_ids: List[str] | None = None
+        self._prompts_digest: str | None = None
 
-        for category in TestCategory:
-            with open(Path(PROMPT_PATH) / category.value[2], "r") as f:
-                for line in f:
-                    data = json.loads(line.strip())
-                    self.id_to_category[data["id"]] = category
-                    if category in TestCollection.PYTHON.value[2]:
-                        self.id_to_language[data["id"]] = "python"
-                    else:
-                        self.id_to_language[data["id"]] = category.value[1]
-            if category.value[3] and not category in TestCollection.EXECUTABLE.value[2]:
-                with open(Path(POSSIBLE_ANSWER_PATH) / category.value[2], "r") as f:
-                    for line in f:
-                        data = json.loads(line.strip())
-                        self.id_to_ground_truth[data["id"]] = ToolCallList.from_ground_truth(data["ground_truth"])
+        for category in TestCategory if categories is None else categories:
+            for data in iter_jsonl(Path(PROMPT_PATH) / category.value[2]):
+                self.id_to_category[data["id"]] = category
+                self.id_to_question[data["id"]] = data["question"]
+                if category in TestCollection.PYTHON.value[2]:
+                    self.id_to_language[data["id"]] = "python"
+                else:
+                    self.id_to_language[data["id"]] = category.value[1]
+            if category.value[3] and not category in TestCollection.EXECUTABLE + TestCollection.MULTI_TURN:
+                for data in iter_jsonl(Path(POSSIBLE_ANSWER_PATH) / category.value[2]):
+                    self.id_to_ground_truth[data["id"]] = ToolCallList.from_ground_truth(data["ground_truth"])
             if category in TestCollection.AST + TestCollection.EXECUTABLE:
-                with open(Path(PROMPT_PATH) / category.value[2], "r") as f:
-                    for line in f:
-                        data = json.loads(line.strip())
-                        self.id_to_function_description[data["id"]] = data["function"]
+                for data in iter_jsonl(Path(PROMPT_PATH) / category.value[2]):
+                    self.id_to_function_description[data["id"]] = data["function"]
+            if category in TestCollection.MULTI_TURN:
+                self._load_multi_turn(category)
             if category == TestCategory.REST:
-                with open(Path(REST_EVAL_GROUND_TRUTH_PATH), "r") as f:
-                    eval_ground_truth = [json.loads(line.strip()) for line in f]
-                for idx, data in enumerate(eval_ground_truth):
+                for idx, data in enumerate(iter_jsonl(REST_EVAL_GROUND_TRUTH_PATH)):
                     # ground truth for the rest category is a dict or a list of dicts
-                    self.id_to_ground_truth[f"rest_{idx}"] = eval_ground_truth[idx]
+                    self.id_to_ground_truth[f"rest_{idx}"] = data
             if category.value[3] and category in TestCollection.EXECUTABLE.value[2]:
-                with open(Path(PROMPT_PATH) / category.value[2], "r") as f:
-                    for line in f:
-                        data = json.loads(line.strip())
-                        self.id_to_ground_truth[data["id"]] = data["ground_truth"]
-                        self.id_to_function_description[data["id"]][0]["execution_result_type"] = data[
-                            "execution_result_type"
-                        ]
+                for data in iter_jsonl(Path(PROMPT_PATH) / category.value[2]):
+                    self.id_to_ground_truth[data["id"]] = data["ground_truth"]
+                    self.id_to_function_description[data["id"]][0]["execution_result_type"] = data[
+                        "execution_result_type"
+                    ]
+
+    def _load_multi_turn(self, category: TestCategory):
+        """Load the entries and the ground truth trajectories of a multi-turn category."""
+        for data in iter_jsonl(Path(PROMPT_PATH) / category.value[2]):
+            self.id_to_multi_turn_entry[data["id"]] = {
+                "initial_config": data["initial_config"],
+                "involved_classes": data["involved_classes"],
+                "missed_function": data.get("missed_function", {}),
+                "long_context": category == TestCategory.MULTI_TURN_LONG_CONTEXT,
+            }
+            # the functions of all the involved classes, the missed ones included, are described
+            self.id_to_function_description[data["id"]] = function_descriptions(data["involved_classes"])
+        for data in iter_jsonl(Path(POSSIBLE_ANSWER_PATH) / category.value[2]):
+            # the ground truth is a list of turns, each a list of calls as python code
+            self.id_to_ground_truth[data["id"]] = data["ground_truth"]
 
     def get_category(self, id: str) -> TestCategory:
         """Get the category of the given ID."""
@@ -74,9 +96,102 @@ class IDMapper:
             raise ValueError(f"No function description found for the given ID: {id}")
         return self.id_to_function_description[id]
 
+    def get_multi_turn_entry(self, id: str) -> Dict[str, Any]:
+        """Get the `initial_config`, `involved_classes`, `missed_function` and `long_context` of a multi-turn ID."""
+        if id not in self.id_to_multi_turn_entry:
+            logger.error(f"No multi-turn entry found for the given ID: {id}")
+            raise ValueError(f"No multi-turn entry found for the given ID: {id}")
+        return self.id_to_multi_turn_entry[id]
+
     def get_language(self, id: str) -> str:
         """Get the language of the given ID."""
         if id not in self.id_to_language:
             logger.error(f"No language found for the given ID: {id}")
             raise ValueError(f"No language found for the given ID: {id}")
         return self.id_to_language[id]
+
+    def _prompt_functions(self, id: str) -> List[Dict[str, Any]]:
+        """Get the function descriptions of a prompt as given to the model, shared with the mapper.
+
+        The missed functions of the multi-turn prompts are only given at the turn they are added, and the executable
+        prompts are described without the `execution_result_type` of their ground truth.
+        """
+        if id in self.id_to_multi_turn_entry:
+            entry = self.id_to_multi_turn_entry[id]
+            missed = [name for names in entry["missed_function"].values() for name in names]
+            return function_descriptions(entry["involved_classes"], missed)
+        func_docs = self.id_to_function_description.get(id, [])
+        if self.id_to_category[id] in TestCollection.EXECUTABLE and func_docs:
+            func_doc = {key: value for key, value in func_docs[0].items() if key != "execution_result_type"}
+            func_docs = [func_doc, *func_docs[1:]]
+        return func_docs
+
+    def get_prompt(self, id: str, functions: bool = False, turns: bool = False) -> Dict[str, Any]:
+        """Get the prompt sample of the given ID, as built by `prompt_set`.
+
+        Args:
+            id (str): The ID of the prompt.
+            functions (bool): Whether to add the function descriptions of the prompt.
+            turns (bool): Whether to add all the turns of the question, for the multi-turn prompts.
+
+        Returns:
+            The prompt sample, with the `id`, `category` and `language` in its `metainfo` and the first turn of the
+            question as `prompt`.
+        """
+        if id not in self.id_to_question:
+            logger.error(f"No prompt found for the given ID: {id}")
+            raise ValueError(f"No prompt found for the given ID: {id}")
+        metainfo = {"id": id, "category": self.id_to_category[id].name, "language": self.id_to_language[id]}
+        prompt = {"metainfo": metainfo, "prompt": self.id_to_question[id][0]}
+        if functions:
+            prompt["functions"] = copy.deepcopy(self._prompt_functions(id))
+        if turns:
+            prompt["turns"] = self.id_to_question[id]
+        return prompt
+
+    def sorted_ids(self) -> List[str]:
+        """Get the IDs of the prompts ordered by `sort_key`, category after category as in `prompt_set`."""
+        if self._sorted_ids is None:
+            self._sorted_ids = sorted(self.id_to_question, key=lambda id: sort_key({"id": id}))
+        return self._sorted_ids
+
+    def prompts_digest(self) -> str:
+        """Get the digest of the prompts, their categories and function descriptions, which version the prompts."""
+        if self._prompts_digest is None:
+            hasher = hashlib.sha256()
+            for id in self.sorted_ids():
+                prompt = [id, self.id_to_category[id].name, self.id_to_question[id]]
+                prompt.append(self._prompt_functions(id))
+                hasher.update(json.dumps(prompt, ensure_ascii=False).encode("utf-8") + b"\n")
+            self._prompts_digest = hasher.hexdigest()
+        return self._prompts_digest
+
+    def get_prompt_ids(
+        self, categories: Collection[TestCategory] | None = None, after: str | None = None, limit: int | None = None
+    ) -> Tuple[List[str], int]:
+        """Get a page of the IDs of the prompts, ordered by `sort_key`.
+
+        Args:
+            categories (Collection[TestCategory]): The categories of the prompts, all the loaded ones if None.
+            after (str): The ID to start after, which need not be of the categories; from the first prompt if None.
+            limit (int): The maximum number of IDs, all of them if None.
+
+        Returns:
+            The IDs of the page, and the total number of prompts of the categories.
+
+        Raises:
+            ValueError, IndexError: If the ID to start after is not of the form `TestCategory_Index`.
+        """
+        sorted_ids = self.sorted_ids()
+        start = 0
+        if after is not None:
+            # the IDs are unique by `sort_key`, the page starts at the first one ordered after the given ID
+            start = bisect.bisect_right(sorted_ids, sort_key({"id": after}), key=lambda id: sort_key({"id": id}))
+        ids, total = [], 0
+        for position, id in enumerate(sorted_ids):
+            if categories is not None and self.id_to_category[id] not in categories:
+                continue
+            total += 1
+            if position >= start and (limit is None or len(ids) < limit):
+                ids.append(id)
+        return ids, total
@@ -3,7 +3,7 @@
 Reference: https://github.com/ShishirPatil/gorilla/blob/main/berkeley-function-call-leaderboard/bfcl/constants/type_mappings.py
 """
 
-ORILLA_TO_OPENAPI = {
+GORILLA_TO_OPENAPI = {
     "integer": "integer",
     "number": "number",
     "float": "number",
@@ -32,6 +32,9 @@ ORILLA_TO_OPENAPI = {
     "Bigint": "integer",
 }
 
+# The former misspelled name of `GORILLA_TO_OPENAPI`, kept for the existing imports
+ORILLA_TO_OPENAPI = GORILLA_TO_OPENAPI
+
 GORILLA_TO_PYTHON = {
     "integer": "int",
     "number": "float",
@@ -0,0 +1,83 @@
+"""The bounded cache of the converted Java and JavaScript arguments.
+
+The same argument strings come up across the many samples of an id, so their conversions are cached, keyed by
+`(language, expected_type, nested_type, value)`. The cached values are shared across requests and threads, so the
+collections are stored and returned as copies, which the checkers are free to modify.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from bfcl.constants.config import CONVERSION_CACHE_MAX_VALUE_LENGTH, CONVERSION_CACHE_SIZE
+from bfcl.eval.ast.utils import java_type_converter, js_type_converter
+from bfcl.metrics import CACHE_LOOKUPS
+
+_CONVERTERS = {"java": java_type_converter, "javascript": js_type_converter}
+
+
+def _copy(value: Any) -> Any:
+    """Copy the (nested) lists and dictionaries of a converted value, the other values are immutable."""
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    return value
+
+
+class ConversionCache:
+    """A thread-safe LRU cache of the converted arguments.
+
+    Args:
+        maxsize (int): The maximum number of cached conversions, no caching if 0.
+        max_value_length (int): The maximum length of the cached argument strings, longer ones are always converted.
+    """
+
+    def __init__(self, maxsize: int = CONVERSION_CACHE_SIZE, max_value_length: int = CONVERSION_CACHE_MAX_VALUE_LENGTH):
+        self.maxsize = maxsize
+        self.max_value_length = max_value_length
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def convert(self, language: str, value: str, expected_type: str, nested_type: str | None = None) -> Any:
+        """Convert an argument string, reusing the cached conversion if any.
+
+        Args:
+            language (str): The language of the argument, `java` or `javascript`.
+            value (str): The argument string.
+            expected_type (str): The expected type of the argument.
+            nested_type (str): The type of the elements of a collection argument.
+
+        Returns:
+            The converted value, as returned by the converter of the language.
+        """
+        if not self.maxsize or len(value) > self.max_value_length:
+            return _CONVERTERS[language](value, expected_type, nested_type)
+
+        key = (language, expected_type, nested_type, value)
+        with self._lock:
+            hit = key in self._values
+            if hit:
+                self._values.move_to_end(key)
+                converted = self._values[key]
+        CACHE_LOOKUPS.inc(cache="type_conversion", result="hit" if hit else "miss")
+        if hit:
+            return _copy(converted)
+
+        # conversion errors are raised and not cached
+        converted = _CONVERTERS[language](value, expected_type, nested_type)
+        with self._lock:
+            self._values[key] = _copy(converted)
+            if len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return converted
+
+
+CONVERSION_CACHE = ConversionCache()
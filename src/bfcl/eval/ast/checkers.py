@@ -3,12 +3,13 @@
 Reference: https://github.com/ShishirPatil/gorilla/blob/main/berkeley-function-call-leaderboard/bfcl/eval_checker/ast_eval/ast_checker.py
 """
 
-import re
 from collections import defaultdict
 from typing import Any, Dict, List
 
 from bfcl.constants.type_mappings import JAVA_TYPE_CONVERSION, JS_TYPE_CONVERSION
-from bfcl.eval.ast.utils import java_type_converter, js_type_converter
+from bfcl.eval.ast.cache import CONVERSION_CACHE
+from bfcl.eval.ast.normalize import standardize_ground_truth, standardize_string
+from bfcl.profiling import timed
 from bfcl.schemas.responses import (
     BaseResponse,
     FunctionMismatchError,
@@ -40,6 +41,7 @@ NESTED_CONVERSION_TYPE_LIST = ["Array", "ArrayList", "array"]
 
 
 #### Main function ####
+@timed
 def ast_checker(
     func_description: List[Dict[str, Any]],
     tool_calls: ToolCallList,
@@ -165,22 +167,12 @@ def type_checker(
     return result
 
 
-def standardize_string(input_string: str):
-    # This function standardizes the string by removing all the spaces, ",./-_*^" punctuation, and converting it to
-    # lowercase
-    # It will also convert all the single quotes to double quotes
-    # This is used to compare the model output with the possible answers
-    # We don't want to punish model for answer like April 1, 2024 vs April 1,2024, vs April 1 2024
-    regex_string = r"[ \,\.\/\-\_\*\^]"
-    return re.sub(regex_string, "", input_string).lower().replace("'", '"')
-
-
 def string_checker(param: str, model_output: str, possible_answer: list):
     standardize_possible_answer = []
     standardize_model_output = standardize_string(model_output)
     for i in range(len(possible_answer)):
         if type(possible_answer[i]) == str:
-            standardize_possible_answer.append(standardize_string(possible_answer[i]))
+            standardize_possible_answer.append(standardize_ground_truth(possible_answer[i]))
 
     if standardize_model_output not in standardize_possible_answer:
         return {
@@ -211,7 +203,7 @@ def list_checker(param: str, model_output: list, possible_answer: list):
         standardize_possible_answer.append([])
         for j in range(len(possible_answer[i])):
             if type(possible_answer[i][j]) == str:
-                standardize_possible_answer[i].append(standardize_string(possible_answer[i][j]))
+                standardize_possible_answer[i].append(standardize_ground_truth(possible_answer[i][j]))
             else:
                 standardize_possible_answer[i].append(possible_answer[i][j])
 
@@ -260,7 +252,7 @@ def dict_checker(param: str, model_output: dict, possible_answers: list):
             standardize_possible_answer = []
             for i in range(len(possible_answer[key])):
                 if type(possible_answer[key][i]) == str:
-                    standardize_possible_answer.append(standardize_string(possible_answer[key][i]))
+                    standardize_possible_answer.append(standardize_ground_truth(possible_answer[key][i]))
                 else:
                     standardize_possible_answer.append(possible_answer[key][i])
 
@@ -323,6 +315,7 @@ def list_dict_checker(param: str, model_output: list, possible_answers: list):
     return result
 
 
+@timed
 def simple_function_checker(
     func_description: Dict[str, Any],
     model_output: ToolCall,
@@ -387,9 +380,9 @@ def simple_function_checker(
                 if expected_type_description in NESTED_CONVERSION_TYPE_LIST:
                     nested_type = param_details[param]["items"]["type"]
                     nested_type_converted = JAVA_TYPE_CONVERSION[nested_type]
-                    value = java_type_converter(value, expected_type_description, nested_type)
+                    value = CONVERSION_CACHE.convert("java", value, expected_type_description, nested_type)
                 else:
-                    value = java_type_converter(value, expected_type_description)
+                    value = CONVERSION_CACHE.convert("java", value, expected_type_description)
 
         elif language == "javascript":
             expected_type_converted = JS_TYPE_CONVERSION[expected_type_description]
@@ -414,9 +407,9 @@ def simple_function_checker(
                 if expected_type_description in NESTED_CONVERSION_TYPE_LIST:
                     nested_type = param_details[param]["items"]["type"]
                     nested_type_converted = JS_TYPE_CONVERSION[nested_type]
-                    value = js_type_converter(value, expected_type_description, nested_type)
+                    value = CONVERSION_CACHE.convert("javascript", value, expected_type_description, nested_type)
                 else:
-                    value = js_type_converter(value, expected_type_description)
+                    value = CONVERSION_CACHE.convert("javascript", value, expected_type_description)
 
         elif language == "python":
             expected_type_converted = PYTHON_TYPE_MAPPING[expected_type_description]
@@ -463,7 +456,7 @@ def simple_function_checker(
         if not is_variable:
             # Special handle for dictionaries
             if expected_type_converted == dict:
-                checker_result = dict_checker(param, value, possible_answer[param])
+                checker_result = dict_checker(param, value, possible_answer.parameters[param])
                 if not checker_result["valid"]:
                     result.valid = False
                     result.errors = [
@@ -579,6 +572,7 @@ def parallel_function_checker_enforce_order(
     )
 
 
+@timed
 def parallel_function_checker_no_order(
     func_descriptions: list,
     model_output: list,
@@ -643,6 +637,7 @@ def parallel_function_checker_no_order(
     return BaseResponse(valid=True, correct=True, errors=[], results=None)
 
 
+@timed
 def multiple_function_checker(
     func_descriptions: list,
     model_output: list,
@@ -0,0 +1,40 @@
+"""The normalization of the strings compared by the AST checkers, and the patterns of the literals of the converters.
+
+The normalization runs on every string of every model output and possible answer, so it uses a `str.translate` table
+rather than a regex substitution, and the normalized strings of the ground truth, which is a finite set, are computed
+once and interned.
+"""
+
+import re
+import sys
+from functools import lru_cache
+
+# The spaces and ",./-_*^" punctuation are removed, and the single quotes are converted to double quotes
+_STANDARDIZE_TABLE = str.maketrans({**dict.fromkeys(" ,./-_*^"), "'": '"'})
+
+#### Literal patterns of the type converters ####
+INTEGER_PATTERN = re.compile(r"^-?\d+$")
+DOUBLE_PATTERN = re.compile(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?$")
+JAVA_FLOAT_PATTERN = re.compile(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?[fF]$")
+JAVA_FLOAT_SUFFIX_PATTERN = re.compile(r"[fF]$")
+JAVA_LONG_PATTERN = re.compile(r"^-?\d+[lL]$")
+JAVA_LONG_SUFFIX_PATTERN = re.compile(r"[lL]$")
+JAVA_CHAR_PATTERN = re.compile(r"^\'.$\'")
+JS_FLOAT_PATTERN = re.compile(r"^-?\d+(\.\d+)?$")
+JS_BIGINT_PATTERN = re.compile(r"^-?\d+n$")
+
+
+def standardize_string(input_string: str) -> str:
+    """Standardize a string by removing the spaces and ",./-_*^" punctuation, and converting it to lowercase.
+
+    It also converts the single quotes to double quotes. This is used to compare the model output with the possible
+    answers, as we don't want to punish the model for answers like April 1, 2024 vs April 1,2024 vs April 1 2024.
+    """
+    # the lowercase mapping never produces quotes or removed characters, so translating first gives the same result
+    return input_string.translate(_STANDARDIZE_TABLE).lower()
+
+
+@lru_cache(maxsize=None)
+def standardize_ground_truth(possible_answer: str) -> str:
+    """Standardize a string of the ground truth, computed once and interned across all the checks of the string."""
+    return sys.intern(standardize_string(possible_answer))
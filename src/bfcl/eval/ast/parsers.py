@@ -0,0 +1,88 @@
+"""The tree-sitter parsers of the literals in the arguments of the Java and JavaScript tool calls.
+
+A `Parser` is not thread-safe, so every thread lazily creates and then reuses its own parser per language, while the
+compiled grammars are shared.
+"""
+
+import threading
+
+import tree_sitter_java
+import tree_sitter_javascript
+from tree_sitter import Language, Node, Parser
+
+_LANGUAGES = {
+    "java": Language(tree_sitter_java.language(), "java"),
+    "javascript": Language(tree_sitter_javascript.language(), "javascript"),
+}
+
+_local = threading.local()
+
+
+def get_parser(language: str) -> Parser:
+    """Get the parser of a language for the current thread.
+
+    Args:
+        language (str): The language of the parser, `java` or `javascript`.
+
+    Returns:
+        The parser, created on the first call in the thread.
+    """
+    parsers = getattr(_local, "parsers", None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    parser = parsers.get(language)
+    if parser is None:
+        parser = Parser()
+        parser.set_language(_LANGUAGES[language])
+        parsers[language] = parser
+    return parser
+
+
+def named_children(node: Node) -> list:
+    """Get the named children of a node, without the comments."""
+    return [child for child in node.named_children if "comment" not in child.type]
+
+
+def node_text(node: Node) -> str:
+    """Get the source text of a node."""
+    return node.text.decode("utf-8")
+
+
+def parse_java_expression(source: str) -> Node | None:
+    """Parse a Java expression.
+
+    Args:
+        source (str): The source of the expression, e.g. `new int[]{1, 2}`.
+
+    Returns:
+        The node of the expression, or None if the source is not a single valid expression.
+    """
+    tree = get_parser("java").parse(f"{source};".encode("utf-8"))
+    if tree.root_node.has_error:
+        return None
+    statements = named_children(tree.root_node)
+    if len(statements) != 1 or statements[0].type != "expression_statement":
+        return None
+    return named_children(statements[0])[0]
+
+
+def parse_js_expression(source: str) -> Node | None:
+    """Parse a JavaScript expression.
+
+    Args:
+        source (str): The source of the expression, e.g. `[1, 2]`.
+
+    Returns:
+        The node of the expression, or None if the source is not a single valid expression.
+    """
+    # the parentheses make an object literal an expression rather than a block
+    tree = get_parser("javascript").parse(f"({source});".encode("utf-8"))
+    if tree.root_node.has_error:
+        return None
+    statements = named_children(tree.root_node)
+    if len(statements) != 1 or statements[0].type != "expression_statement":
+        return None
+    expression = named_children(statements[0])[0]
+    if expression.type != "parenthesized_expression" or len(named_children(expression)) != 1:
+        return None
+    return named_children(expression)[0]
@@ -9,34 +9,48 @@ Refereces:
 import re
 from typing import Dict, List, Union
 
+from tree_sitter import Node
+
 from bfcl.constants.type_mappings import JAVA_TYPE_CONVERSION, JS_TYPE_CONVERSION
+from bfcl.eval.ast.normalize import (
+    DOUBLE_PATTERN,
+    INTEGER_PATTERN,
+    JAVA_CHAR_PATTERN,
+    JAVA_FLOAT_PATTERN,
+    JAVA_FLOAT_SUFFIX_PATTERN,
+    JAVA_LONG_PATTERN,
+    JAVA_LONG_SUFFIX_PATTERN,
+    JS_BIGINT_PATTERN,
+    JS_FLOAT_PATTERN,
+)
+from bfcl.eval.ast.parsers import named_children, node_text, parse_java_expression, parse_js_expression
 
 
 def java_type_converter(value, expected_type, nested_type=None):
     if expected_type not in JAVA_TYPE_CONVERSION:
         raise ValueError(f"Unsupported type: {expected_type}")
     if expected_type == "byte" or expected_type == "short" or expected_type == "integer":
-        if not re.match(r"^-?\d+$", value):
+        if not INTEGER_PATTERN.match(value):
             return str(value)  # default to string
         return int(value)
     elif expected_type == "float":
-        if not re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?[fF]$", value):
+        if not JAVA_FLOAT_PATTERN.match(value):
             return str(value)  # default to string
-        return float(re.sub(r"[fF]$", "", value))
+        return float(JAVA_FLOAT_SUFFIX_PATTERN.sub("", value))
     elif expected_type == "double":
-        if not re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?$", value):
+        if not DOUBLE_PATTERN.match(value):
             return str(value)  # default to string
         return float(value)
     elif expected_type == "long":
-        if not re.match(r"^-?\d+[lL]$", value):
+        if not JAVA_LONG_PATTERN.match(value):
             return str(value)  # default to string
-        return int(re.sub(r"[lL]$", "", value))
+        return int(JAVA_LONG_SUFFIX_PATTERN.sub("", value))
     elif expected_type == "boolean":
         if value not in ["true", "false"]:
             return str(value)  # default to string
         return parse_java_boolean(value)
     elif expected_type == "char":
-        if not re.match(r"^\'.$\'", value):
+        if not JAVA_CHAR_PATTERN.match(value):
             return str(value)  # default to string
         return value  # Remove the single quotes
     elif expected_type == "Array" or expected_type == "ArrayList":
@@ -71,6 +85,29 @@ def parse_java_collection(input_str: str, type_str: str, nested_type=None) -> Un
 
 
 def parse_arraylist(input_str: str, nested_type=None) -> List:
+    node = parse_java_expression(input_str)
+    if node is None:
+        return _parse_arraylist_regex(input_str, nested_type)
+    return _java_arraylist(node, nested_type, input_str)
+
+
+def parse_array(input_str: str, nested_type=None) -> List:
+    node = parse_java_expression(input_str)
+    if node is None:
+        return _parse_array_regex(input_str, nested_type)
+    return _java_array(node, nested_type, input_str)
+
+
+def parse_hashmap(input_str: str) -> Dict:
+    node = parse_java_expression(input_str)
+    if node is None:
+        return _parse_hashmap_regex(input_str)
+    return _java_hashmap(node, input_str)
+
+
+# The regex parsers are the fallback for the inputs that are not valid Java, such as the unquoted strings in
+# `new String[]{a, b}`, which the ground truth uses for arrays of strings
+def _parse_arraylist_regex(input_str: str, nested_type=None) -> List:
     match_asList = re.search(r"new\s+ArrayList<\w*>\(Arrays\.asList\((.+?)\)\)", input_str)
     if match_asList:
         elements_str = match_asList.group(1)
@@ -111,7 +148,7 @@ def parse_arraylist(input_str: str, nested_type=None) -> List:
     return input_str  # default to string
 
 
-def parse_array(input_str: str, nested_type=None) -> List:
+def _parse_array_regex(input_str: str, nested_type=None) -> List:
     match = re.search(r"new\s+\w+\[\]\s*\{(.*?)\}", input_str)
     if match:
         elements_str = match.group(1)
@@ -125,7 +162,7 @@ def parse_array(input_str: str, nested_type=None) -> List:
         return input_str  # default to string
 
 
-def parse_hashmap(input_str: str) -> Dict:
+def _parse_hashmap_regex(input_str: str) -> Dict:
     elements = {}
     match = re.search(r"new\s+HashMap<.*?>\s*\(\)\s*\{\s*\{?\s*(.*?)\s*\}?\s*\}", input_str, re.DOTALL)
     if match:
@@ -145,6 +182,102 @@ def parse_hashmap(input_str: str) -> Dict:
     return input_str  # default to string
 
 
+def _java_class_name(node: Node) -> str | None:
+    """Get the class name of an object creation, e.g. `ArrayList` for `new ArrayList<Integer>()`."""
+    if node.type != "object_creation_expression":
+        return None
+    type_node = node.child_by_field_name("type")
+    if type_node.type == "generic_type":
+        type_node = type_node.named_children[0]
+    return node_text(type_node)
+
+
+def _java_initializer_calls(node: Node, method: str) -> List[List[Node]] | None:
+    """Get the arguments of the calls to a method in the double brace initializer of an object creation.
+
+    Returns None if the object creation has no initializer, e.g. `new ArrayList<>()`.
+    """
+    body = next((child for child in node.named_children if child.type == "class_body"), None)
+    if body is None:
+        return None
+    calls = []
+    for block in named_children(body):
+        if block.type != "block":
+            continue
+        for statement in named_children(block):
+            call = named_children(statement)[0] if statement.type == "expression_statement" else None
+            if call is not None and call.type == "method_invocation" and call.child_by_field_name("object") is None:
+                if node_text(call.child_by_field_name("name")) == method:
+                    calls.append(named_children(call.child_by_field_name("arguments")))
+    return calls
+
+
+def _java_arraylist(node: Node, nested_type, default):
+    if _java_class_name(node) != "ArrayList":
+        return default
+    arguments = named_children(node.child_by_field_name("arguments"))
+    if len(arguments) == 1 and arguments[0].type == "method_invocation":
+        # new ArrayList<>(Arrays.asList(...))
+        call = arguments[0]
+        if node_text(call.child_by_field_name("name")) != "asList":
+            return default
+        return [
+            _java_element(element, nested_type) for element in named_children(call.child_by_field_name("arguments"))
+        ]
+    if arguments:
+        return default
+
+    # new ArrayList<>() {{ add(...); }}
+    adds = _java_initializer_calls(node, "add")
+    if adds is None:
+        return []  # Return an empty list for an empty ArrayList
+    return [_java_element(add[0], nested_type) for add in adds if len(add) == 1]
+
+
+def _java_array(node: Node, nested_type, default):
+    initializer = node.child_by_field_name("value") if node.type == "array_creation_expression" else None
+    if initializer is None:
+        return default
+    return [_java_element(element, nested_type) for element in named_children(initializer)]
+
+
+def _java_hashmap(node: Node, default):
+    if _java_class_name(node) != "HashMap":
+        return default
+    elements = {}
+    for put in _java_initializer_calls(node, "put") or []:
+        if len(put) == 2 and put[0].type == "string_literal":
+            elements[node_text(put[0])[1:-1]] = _java_value(put[1])
+    return elements
+
+
+def _java_element(node: Node, nested_type):
+    """Convert an element of a collection to the nested type of the collection."""
+    if nested_type in ("char", "String") and node.type in ("character_literal", "string_literal"):
+        return node_text(node)[1:-1]  # Remove the quotes
+    if nested_type in ("Array", "ArrayList", "HashMap"):
+        text = node_text(node)
+        if nested_type == "Array":
+            return _java_array(node, None, text)
+        return _java_arraylist(node, None, text) if nested_type == "ArrayList" else _java_hashmap(node, text)
+    if nested_type:
+        return java_type_converter(node_text(node), nested_type)
+    return _java_value(node)
+
+
+def _java_value(node: Node):
+    """Convert a value without the information of its type, including nested collections."""
+    text = node_text(node)
+    if node.type == "array_creation_expression":
+        return _java_array(node, None, text)
+    class_name = _java_class_name(node)
+    if class_name == "ArrayList":
+        return _java_arraylist(node, None, text)
+    if class_name == "HashMap":
+        return _java_hashmap(node, text)
+    return parse_java_value(text)
+
+
 # This method parses without the information of what each element type is, contrary of the previous
 def parse_java_value(value_str: str):
     # check if it's boolean
@@ -156,11 +289,11 @@ def parse_java_value(value_str: str):
     elif value_str.startswith('"') and value_str.endswith('"'):
         return value_str[1:-1]
     # check if it's a long
-    elif re.match(r"^-?\d+[lL]$", value_str):
+    elif JAVA_LONG_PATTERN.match(value_str):
         return int(value_str[:-1])
     # check if it's a float
-    elif re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?[fF]$", value_str):
-        return float(re.sub(r"[fF]$", "", value_str))
+    elif JAVA_FLOAT_PATTERN.match(value_str):
+        return float(JAVA_FLOAT_SUFFIX_PATTERN.sub("", value_str))
     # check if it's a integer-like and float-like types (including byte, short, integer, double, etc)
     else:
         try:
@@ -390,15 +523,15 @@ def js_type_converter(value, expected_type, nested_type=None):
         return value[1:-1]
 
     elif expected_type == "integer":
-        if not re.match(r"^-?\d+$", value):
+        if not INTEGER_PATTERN.match(value):
             return str(value)  # default to string
         return int(value)
     elif expected_type == "float":
-        if not re.match(r"^-?\d+(\.\d+)?$", value):
+        if not JS_FLOAT_PATTERN.match(value):
             return str(value)  # default to string
         return float(value)
     elif expected_type == "Bigint":
-        if not re.match(r"^-?\d+n$", value):
+        if not JS_BIGINT_PATTERN.match(value):
             return str(value)  # default to string
         return int(value[:-1])
     elif expected_type == "Boolean":
@@ -416,6 +549,19 @@ def js_type_converter(value, expected_type, nested_type=None):
 
 
 def parse_js_collection(code, type_str, nested_type=None):
+    code = code.strip()
+    if type_str not in ("array", "dict"):
+        raise ValueError(f"Unsupported type: {type_str}")
+    node = parse_js_expression(code)
+    if node is None:
+        return _parse_js_collection_regex(code, type_str, nested_type)
+    if type_str == "array":
+        return _js_array(node, nested_type, code)
+    return _js_object(node, code)
+
+
+# The regex parser is the fallback for the inputs that are not valid JavaScript
+def _parse_js_collection_regex(code, type_str, nested_type=None):
     code = code.strip()
     if type_str == "array":
         # Regular expression patterns
@@ -507,6 +653,61 @@ def parse_js_collection(code, type_str, nested_type=None):
         raise ValueError(f"Unsupported type: {type_str}")
 
 
+def _js_array(node: Node, nested_type, default):
+    if node.type == "array":
+        elements = named_children(node)
+    elif node.type == "new_expression" and node_text(node.child_by_field_name("constructor")) == "Array":
+        arguments = node.child_by_field_name("arguments")
+        elements = named_children(arguments) if arguments is not None else []
+    else:
+        return default
+    return [_js_element(element, nested_type) for element in elements]
+
+
+def _js_object(node: Node, default):
+    if node.type != "object":
+        return default
+    dictionary = {}
+    for pair in named_children(node):
+        if pair.type != "pair":
+            return default  # shorthand properties, spreads and methods have no literal value
+        key = pair.child_by_field_name("key")
+        key_text = node_text(key)
+        dictionary[key_text[1:-1] if key.type == "string" else key_text] = _js_value(pair.child_by_field_name("value"))
+    return dictionary
+
+
+def _js_element(node: Node, nested_type):
+    """Convert an element of an array to the nested type of the array."""
+    if nested_type == "array":
+        return _js_array(node, None, node_text(node))
+    if nested_type == "dict":
+        return _js_object(node, node_text(node))
+    if nested_type:
+        return js_type_converter(node_text(node), nested_type)
+    return _js_value(node)
+
+
+def _js_value(node: Node):
+    """Convert a value without the information of its type, including nested arrays and objects."""
+    text = node_text(node)
+    if node.type in ("true", "false"):
+        return node.type == "true"
+    if node.type in ("string", "template_string"):
+        return text[1:-1]
+    if node.type in ("array", "new_expression"):
+        return _js_array(node, None, text)
+    if node.type == "object":
+        return _js_object(node, text)
+    if node.type == "number" and text.endswith("n"):
+        return int(text[:-1])  # BigInt
+    if node.type == "unary_expression" and node_text(node.child_by_field_name("operator")) == "-":
+        argument = node.child_by_field_name("argument")
+        if argument.type == "number" and text.endswith("n"):
+            return -int(node_text(argument)[:-1])
+    return parse_js_value(text)
+
+
 def parse_js_value(value_str: str):
     value_str = value_str.strip()
     if value_str == "true":
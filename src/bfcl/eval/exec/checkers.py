@@ -9,6 +9,8 @@ from typing import List
 import requests  # noqa: F401 - requests is used implicitly in eval() function
 
 from bfcl.constants.config import REAL_TIME_MATCH_ALLOWED_DIFFERENCE
+from bfcl.metrics import EXEC_CALLS
+from bfcl.profiling import timed
 from bfcl.schemas.exceptions import NoAPIKeyError
 from bfcl.schemas.responses import (
     BaseResponse,
@@ -22,11 +24,13 @@ from bfcl.schemas.responses import (
 
 
 #### Main function ####
+@timed
 def executable_checker_rest(func_call: str, ground_truth: dict | List[dict]):
     if "https://geocode.maps.co" in func_call:
         time.sleep(2)
     if "requests_get" in func_call:
         func_call = func_call.replace("requests_get", "requests.get")
+    EXEC_CALLS.inc(kind="rest")
     try:
         response = eval(func_call)
     except Exception as e:
@@ -160,6 +164,7 @@ def executable_checker_rest(func_call: str, ground_truth: dict | List[dict]):
         )
 
 
+@timed
 def executable_checker_non_rest(
     tool_calls: str | List[str],
     ground_truth: dict | List[dict],
@@ -289,9 +294,11 @@ def patten_matcher(exec_output, expected_result, function_call, is_sanity_check)
     return result
 
 
+@timed
 def exec_function_call(function_call: str):
     func_name = function_call.split("(")[0]
     exec_dict = {}
+    EXEC_CALLS.inc(kind="python")
     try:
         exec(
             (f"from bfcl.eval.exec.executable_python_functions import {func_name}\n" f"result = {function_call}"),
@@ -440,12 +447,13 @@ def executable_checker_parallel_no_order(
                     message=[
                         (
                             f"Could not find a matching function among index {considered_indices} "
-                            f"of model output for index {i} of possible answers.",
+                            f"of model output for index {i} of possible answers."
                         )
                     ],
                     error_type="executable_checker:cannot_find_match",
                 ),
             )
+            return BaseResponse(valid=False, correct=False, results=None, errors=all_errors)
 
     return BaseResponse(
         valid=True,
@@ -1 +0,0 @@
-"""Multi-turn evaluation is not yet implemented."""
@@ -0,0 +1,95 @@
+"""The base class of the simulated APIs of the multi-turn categories.
+
+The state of the APIs is copy-on-write: the containers of the state are shared with the scenario they are loaded from
+and with the forks of the API, and are only copied, along the path to the modified one, the first time an instance
+modifies them. A fork is therefore as cheap as the number of attributes of the API, whatever the size of its state.
+
+Reference: https://github.com/ShishirPatil/gorilla/tree/main/berkeley-function-call-leaderboard/bfcl/eval_checker/
+multi_turn_eval/func_source_code
+"""
+
+import copy
+import random
+from typing import Any, Dict, Hashable
+
+
+def int_keys(mapping: Dict[Any, Any]) -> Dict[Any, Any]:
+    """Convert the numeric keys of a mapping loaded from JSON back into the integer ids."""
+    return {int(key) if isinstance(key, str) and key.isdigit() else key: value for key, value in mapping.items()}
+
+
+class BaseAPI:
+    """An in-memory simulated API, loaded from the `initial_config` of a multi-turn entry.
+
+    The state of an API is its public attributes, which are plain JSON-like values compared against the ground truth,
+    and the attributes starting with an underscore are bookkeeping that is not compared. The public methods are the
+    functions of the API as described in `data/multi_turn_func_doc`; they return a dictionary, with an `error` key if
+    the call fails, and never modify their arguments.
+    """
+
+    # The state loaded for the keys missing from the scenario
+    DEFAULT_STATE: Dict[str, Any] = {}
+    # The seed of the generator of the ids and the simulated readings, so that the runs are deterministic
+    RANDOM_SEED = 0
+
+    def _load_scenario(self, scenario: Dict[str, Any], long_context: bool = False):
+        """Load the state of the API from a scenario.
+
+        Args:
+            scenario (Dict[str, Any]): The `initial_config` of the API, the keys that are not part of the state are
+                ignored.
+            long_context (bool): Whether to extend the state with filler data for the long-context category.
+        """
+        # the state is shared with the scenario until it is modified
+        for key, default in self.DEFAULT_STATE.items():
+            setattr(self, key, scenario.get(key, default))
+        self._owned: Dict[int, Any] = {}
+        self._random = random.Random(self.RANDOM_SEED)
+        if long_context:
+            self._extend_long_context()
+
+    def _extend_long_context(self):
+        """Extend the state with deterministic filler data, a no-op for the APIs with no long-context variant."""
+
+    def _writable(self, attribute: str, *path: Hashable) -> Any:
+        """Return the container at a path of an attribute to modify in place.
+
+        The containers along the path that are not owned by the instance, the ones shared with the scenario or with
+        a fork, are copied first, so the other nodes of the state stay shared.
+
+        Args:
+            attribute (str): The name of the attribute of the state.
+            path (Hashable): The keys or indices of the container from the attribute.
+
+        Returns:
+            The container, owned by the instance.
+        """
+        node = getattr(self, attribute)
+        if id(node) not in self._owned:
+            node = self._own(node)
+            setattr(self, attribute, node)
+        for key in path:
+            child = node[key]
+            if id(child) not in self._owned:
+                child = node[key] = self._own(child)
+            node = child
+        return node
+
+    def _own(self, node: Any) -> Any:
+        copied = copy.copy(node)
+        # the owned containers are kept referenced, so that their ids are not reused by the shared ones
+        self._owned[id(copied)] = copied
+        return copied
+
+    def _fork(self) -> "BaseAPI":
+        """Return an independent copy of the API, sharing the whole state until either of them modifies it."""
+        fork = copy.copy(self)
+        self._owned, fork._owned = {}, {}
+        # seeded so as not to read the entropy of the system, the state is replaced anyway
+        fork._random = random.Random(self.RANDOM_SEED)
+        fork._random.setstate(self._random.getstate())
+        return fork
+
+    def _state(self) -> Dict[str, Any]:
+        """Return the state of the API, its public attributes."""
+        return {key: value for key, value in vars(self).items() if not key.startswith("_")}
@@ -0,0 +1,264 @@
+"""The simulated Gorilla file system.
+
+The file system is a tree of dictionaries: a directory maps the names of its entries to either the content of a file,
+a string, or to another directory, a dictionary.
+"""
+
+import copy
+import difflib
+from typing import Any, Dict, List
+
+from bfcl.eval.multi_turn.backends.base import BaseAPI
+
+# The filler appended to the files, and the number of filler files added to the directories, in the long-context
+# category
+FILE_CONTENT_EXTENSION = "\n".join(
+    f"Entry {i:04d}: routine record kept for reference, nothing to report." for i in range(200)
+)
+NUM_FILLER_FILES = 20
+
+
+def _load_directory(contents: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert the `{"type": ..., "contents"/"content": ...}` entries of a scenario into the tree of dictionaries."""
+    directory = {}
+    for name, entry in contents.items():
+        if entry.get("type") == "directory":
+            directory[name] = _load_directory(entry.get("contents", {}))
+        else:
+            directory[name] = entry.get("content", "")
+    return directory
+
+
+def _human_readable(size: int) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:.2f} TB"
+
+
+class GorillaFileSystem(BaseAPI):
+    """A simple file system with the basic file operations, relative to a current directory."""
+
+    def _load_scenario(self, scenario: Dict[str, Any], long_context: bool = False):
+        super()._load_scenario(scenario, long_context=False)
+        root = scenario.get("root", {"workspace": {"type": "directory", "contents": {}}})
+        self._root_name, entry = next(iter(root.items()))
+        self.root = _load_directory(entry.get("contents", {}))
+        self._cwd: List[str] = []
+        if long_context:
+            self._extend_long_context()
+
+    def _extend_long_context(self):
+        def extend(path: List[str]):
+            directory = self._writable("root", *path)
+            for name, entry in list(directory.items()):
+                if isinstance(entry, dict):
+                    extend([*path, name])
+                else:
+                    directory[name] = f"{entry}\n{FILE_CONTENT_EXTENSION}" if entry else FILE_CONTENT_EXTENSION
+            for i in range(NUM_FILLER_FILES):
+                directory.setdefault(f"data_chunk_{i:02d}.bin", FILE_CONTENT_EXTENSION)
+
+        extend([])
+
+    #### Helpers ####
+    def _directory(self, path: List[str]) -> Dict[str, Any]:
+        directory = self.root
+        for name in path:
+            directory = directory[name]
+        return directory
+
+    def _writable_directory(self, path: List[str]) -> Dict[str, Any]:
+        return self._writable("root", *path)
+
+    def _resolve(self, path: str) -> List[str] | None:
+        """Resolve a path into the names from the root, or None if it is not an existing directory."""
+        if path.startswith("/"):
+            names = [name for name in path.split("/") if name]
+            if not names or names[0] != self._root_name:
+                return [] if not names else None
+            names, resolved = names[1:], []
+        else:
+            names, resolved = path.split("/"), list(self._cwd)
+        for name in names:
+            if name in ("", "."):
+                continue
+            if name == "..":
+                if resolved:
+                    resolved.pop()
+                continue
+            directory = self._directory(resolved)
+            if not isinstance(directory.get(name), dict):
+                return None
+            resolved.append(name)
+        return resolved
+
+    def _path(self, names: List[str]) -> str:
+        return "/" + "/".join([self._root_name, *names])
+
+    def _file(self, command: str, file_name: str) -> str | Dict[str, str]:
+        """Return the content of a file of the current directory, or the error of the command."""
+        entry = self._directory(self._cwd).get(file_name)
+        if entry is None:
+            return {"error": f"{command}: {file_name}: No such file or directory"}
+        if isinstance(entry, dict):
+            return {"error": f"{command}: {file_name}: Is a directory"}
+        return entry
+
+    #### Functions ####
+    def pwd(self) -> Dict[str, str]:
+        return {"current_working_directory": self._path(self._cwd)}
+
+    def ls(self, a: bool = False) -> Dict[str, List[str]]:
+        names = [name for name in self._directory(self._cwd) if a or not name.startswith(".")]
+        return {"current_directory_content": names}
+
+    def cd(self, folder: str) -> Dict[str, str]:
+        resolved = self._resolve(folder)
+        if resolved is None:
+            return {"error": f"cd: {folder}: No such file or directory. You cannot use path to change directory."}
+        self._cwd = resolved
+        return {"current_working_directory": self._path(resolved)}
+
+    def mkdir(self, dir_name: str) -> Dict[str, str] | None:
+        if not dir_name or "/" in dir_name:
+            return {"error": f"mkdir: cannot create directory '{dir_name}': Invalid directory name"}
+        directory = self._directory(self._cwd)
+        if dir_name in directory:
+            return {"error": f"mkdir: cannot create directory '{dir_name}': File exists"}
+        self._writable_directory(self._cwd)[dir_name] = {}
+        return None
+
+    def touch(self, file_name: str) -> Dict[str, str] | None:
+        if not file_name or "/" in file_name:
+            return {"error": f"touch: cannot touch '{file_name}': Invalid character"}
+        directory = self._directory(self._cwd)
+        if file_name in directory:
+            return {"error": f"touch: cannot touch '{file_name}': File exists"}
+        self._writable_directory(self._cwd)[file_name] = ""
+        return None
+
+    def echo(self, content: str, file_name: str | None = None) -> Dict[str, str | None]:
+        if file_name is None or file_name == "None":
+            return {"terminal_output": content}
+        if not file_name or "/" in file_name:
+            return {"error": f"echo: cannot write to '{file_name}': Invalid character"}
+        directory = self._directory(self._cwd)
+        if isinstance(directory.get(file_name), dict):
+            return {"error": f"echo: {file_name}: Is a directory"}
+        self._writable_directory(self._cwd)[file_name] = content
+        return {"terminal_output": None}
+
+    def cat(self, file_name: str) -> Dict[str, str]:
+        content = self._file("cat", file_name)
+        return content if isinstance(content, dict) else {"file_content": content}
+
+    def find(self, path: str = ".", name: str | None = None) -> Dict[str, List[str]]:
+        resolved = self._resolve(path)
+        if resolved is None:
+            return {"error": f"find: '{path}': No such file or directory"}
+        matches = []
+
+        def walk(directory: Dict[str, Any], prefix: str):
+            for entry_name, entry in directory.items():
+                entry_path = f"{prefix}/{entry_name}"
+                if name is None or name == "None" or name in entry_name:
+                    matches.append(entry_path)
+                if isinstance(entry, dict):
+                    walk(entry, entry_path)
+
+        walk(self._directory(resolved), path.rstrip("/"))
+        return {"matches": matches}
+
+    def wc(self, file_name: str, mode: str = "l") -> Dict[str, Any]:
+        content = self._file("wc", file_name)
+        if isinstance(content, dict):
+            return content
+        if mode == "l":
+            return {"count": len(content.splitlines()), "type": "lines"}
+        if mode == "w":
+            return {"count": len(content.split()), "type": "words"}
+        if mode == "c":
+            return {"count": len(content), "type": "characters"}
+        return {"error": f"wc: invalid mode '{mode}'"}
+
+    def sort(self, file_name: str) -> Dict[str, str]:
+        content = self._file("sort", file_name)
+        return content if isinstance(content, dict) else {"sorted_content": "\n".join(sorted(content.splitlines()))}
+
+    def grep(self, file_name: str, pattern: str) -> Dict[str, List[str]]:
+        content = self._file("grep", file_name)
+        if isinstance(content, dict):
+            return content
+        return {"matching_lines": [line for line in content.splitlines() if pattern in line]}
+
+    def du(self, human_readable: bool = False) -> Dict[str, str]:
+        def size(directory: Dict[str, Any]) -> int:
+            return sum(size(entry) if isinstance(entry, dict) else len(entry.encode()) for entry in directory.values())
+
+        total = size(self._directory(self._cwd))
+        return {"disk_usage": _human_readable(total) if human_readable else f"{total} bytes"}
+
+    def tail(self, file_name: str, lines: int = 10) -> Dict[str, str]:
+        content = self._file("tail", file_name)
+        if isinstance(content, dict):
+            return content
+        return {"last_lines": "\n".join(content.splitlines()[-lines:] if lines > 0 else [])}
+
+    def diff(self, file_name1: str, file_name2: str) -> Dict[str, str]:
+        content1, content2 = self._file("diff", file_name1), self._file("diff", file_name2)
+        for content in (content1, content2):
+            if isinstance(content, dict):
+                return content
+        diff = difflib.unified_diff(content1.splitlines(), content2.splitlines(), file_name1, file_name2, lineterm="")
+        return {"diff_lines": "\n".join(diff)}
+
+    def _transfer(self, command: str, source: str, destination: str, keep_source: bool) -> Dict[str, str]:
+        directory = self._directory(self._cwd)
+        if source not in directory:
+            return {"error": f"{command}: cannot stat '{source}': No such file or directory"}
+        if "/" in destination or destination == source:
+            return {
+                "error": (
+                    f"{command}: cannot move '{source}' to '{destination}': "
+                    "Destination cannot be a path or the source"
+                )
+            }
+        # a copy is not shared with its source, which the instance may own and modify in place
+        entry = copy.deepcopy(directory[source]) if keep_source else directory[source]
+        verb = "copied" if keep_source else "moved"
+        target = directory.get(destination)
+        if isinstance(target, dict):
+            if source in target:
+                return {"error": f"{command}: cannot {command} '{source}' to '{destination}/{source}': File exists"}
+            self._writable_directory([*self._cwd, destination])[source] = entry
+        elif target is not None:
+            return {"error": f"{command}: cannot {command} '{source}' to '{destination}': File exists"}
+        else:
+            self._writable_directory(self._cwd)[destination] = entry
+        if not keep_source:
+            del self._writable_directory(self._cwd)[source]
+        return {"result": f"'{source}' {verb} to '{destination}'"}
+
+    def mv(self, source: str, destination: str) -> Dict[str, str]:
+        return self._transfer("mv", source, destination, keep_source=False)
+
+    def cp(self, source: str, destination: str) -> Dict[str, str]:
+        return self._transfer("cp", source, destination, keep_source=True)
+
+    def rm(self, file_name: str) -> Dict[str, str]:
+        directory = self._directory(self._cwd)
+        if file_name not in directory:
+            return {"error": f"rm: cannot remove '{file_name}': No such file or directory"}
+        del self._writable_directory(self._cwd)[file_name]
+        return {"result": f"'{file_name}' removed"}
+
+    def rmdir(self, dir_name: str) -> Dict[str, str]:
+        directory = self._directory(self._cwd)
+        if not isinstance(directory.get(dir_name), dict):
+            return {"error": f"rmdir: failed to remove '{dir_name}': No such directory"}
+        if directory[dir_name]:
+            return {"error": f"rmdir: failed to remove '{dir_name}': Directory not empty"}
+        del self._writable_directory(self._cwd)[dir_name]
+        return {"result": f"'{dir_name}' removed"}
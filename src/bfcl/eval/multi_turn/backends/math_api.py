@@ -0,0 +1,120 @@
+"""The simulated math API, which is stateless."""
+
+import math
+from decimal import Decimal, InvalidOperation, localcontext
+from typing import Dict, List
+
+from bfcl.eval.multi_turn.backends.base import BaseAPI
+
+# The size of the SI units in their base unit, by dimension
+SI_UNITS = {
+    "length": {"km": 1e3, "m": 1.0, "cm": 1e-2, "mm": 1e-3, "um": 1e-6, "nm": 1e-9},
+    "mass": {"t": 1e3, "kg": 1.0, "g": 1e-3, "mg": 1e-6, "ug": 1e-9},
+    "time": {"h": 3600.0, "min": 60.0, "s": 1.0, "ms": 1e-3, "us": 1e-6, "ns": 1e-9},
+    "volume": {"m3": 1e3, "l": 1.0, "dl": 1e-1, "cl": 1e-2, "ml": 1e-3},
+    "energy": {"kj": 1e3, "j": 1.0, "cal": 4.184, "kcal": 4184.0, "wh": 3600.0, "kwh": 3.6e6},
+}
+# The factors of the conversions from the imperial units to the SI units
+IMPERIAL_TO_SI = {
+    ("in", "cm"): 2.54,
+    ("ft", "m"): 0.3048,
+    ("yd", "m"): 0.9144,
+    ("mi", "km"): 1.60934,
+    ("oz", "g"): 28.3495,
+    ("lb", "kg"): 0.453592,
+    ("gal", "l"): 3.78541,
+    ("fl_oz", "ml"): 29.5735,
+}
+
+
+def _empty(numbers: List[float]) -> Dict[str, str] | None:
+    return {"error": "Cannot calculate on an empty list"} if not numbers else None
+
+
+class MathAPI(BaseAPI):
+    """The arithmetic, statistics and unit conversion functions."""
+
+    def absolute_value(self, number: float) -> Dict[str, float]:
+        return {"result": abs(number)}
+
+    def add(self, a: float, b: float) -> Dict[str, float]:
+        return {"result": a + b}
+
+    def subtract(self, a: float, b: float) -> Dict[str, float]:
+        return {"result": a - b}
+
+    def multiply(self, a: float, b: float) -> Dict[str, float]:
+        return {"result": a * b}
+
+    def divide(self, a: float, b: float) -> Dict[str, float]:
+        if b == 0:
+            return {"error": "Cannot divide by zero"}
+        return {"result": a / b}
+
+    def power(self, base: float, exponent: float) -> Dict[str, float]:
+        try:
+            return {"result": base**exponent}
+        except (OverflowError, ZeroDivisionError) as e:
+            return {"error": str(e)}
+
+    def percentage(self, part: float, whole: float) -> Dict[str, float]:
+        if whole == 0:
+            return {"error": "Whole value cannot be zero"}
+        return {"result": part / whole * 100}
+
+    def round_number(self, number: float, decimal_places: int = 0) -> Dict[str, float]:
+        return {"result": round(number, decimal_places)}
+
+    def logarithm(self, value: float, base: float, precision: int) -> Dict[str, float]:
+        if value <= 0 or base <= 0 or base == 1:
+            return {"error": "The value must be positive and the base positive and different from 1"}
+        with localcontext() as context:
+            context.prec = max(int(precision), 1)
+            return {"result": float(Decimal(value).ln() / Decimal(base).ln())}
+
+    def square_root(self, number: float, precision: int) -> Dict[str, float]:
+        if number < 0:
+            return {"error": "Cannot calculate the square root of a negative number"}
+        try:
+            with localcontext() as context:
+                context.prec = max(int(precision), 1)
+                return {"result": float(Decimal(number).sqrt())}
+        except InvalidOperation as e:
+            return {"error": str(e)}
+
+    def mean(self, numbers: List[float]) -> Dict[str, float]:
+        return _empty(numbers) or {"result": sum(numbers) / len(numbers)}
+
+    def standard_deviation(self, numbers: List[float]) -> Dict[str, float]:
+        if not numbers:
+            return _empty(numbers)
+        mean = sum(numbers) / len(numbers)
+        return {"result": math.sqrt(sum((number - mean) ** 2 for number in numbers) / len(numbers))}
+
+    def max_value(self, numbers: List[float]) -> Dict[str, float]:
+        return _empty(numbers) or {"result": max(numbers)}
+
+    def min_value(self, numbers: List[float]) -> Dict[str, float]:
+        return _empty(numbers) or {"result": min(numbers)}
+
+    def sum_values(self, numbers: List[float]) -> Dict[str, float]:
+        return _empty(numbers) or {"result": sum(numbers)}
+
+    def si_unit_conversion(self, value: float, unit_in: str, unit_out: str) -> Dict[str, float]:
+        unit_in, unit_out = unit_in.lower(), unit_out.lower()
+        for units in SI_UNITS.values():
+            if unit_in in units and unit_out in units:
+                return {"result": value * units[unit_in] / units[unit_out]}
+        return {"error": f"Cannot convert from {unit_in} to {unit_out}"}
+
+    def imperial_si_conversion(self, value: float, unit_in: str, unit_out: str) -> Dict[str, float]:
+        unit_in, unit_out = unit_in.lower(), unit_out.lower()
+        if (unit_in, unit_out) == ("celsius", "fahrenheit"):
+            return {"result": value * 9 / 5 + 32}
+        if (unit_in, unit_out) == ("fahrenheit", "celsius"):
+            return {"result": (value - 32) * 5 / 9}
+        if (unit_in, unit_out) in IMPERIAL_TO_SI:
+            return {"result": value * IMPERIAL_TO_SI[(unit_in, unit_out)]}
+        if (unit_out, unit_in) in IMPERIAL_TO_SI:
+            return {"result": value / IMPERIAL_TO_SI[(unit_out, unit_in)]}
+        return {"error": f"Cannot convert from {unit_in} to {unit_out}"}
@@ -0,0 +1,157 @@
+"""The simulated messaging API of a workspace."""
+
+from typing import Any, Dict, Iterator, List, Tuple
+
+from bfcl.eval.multi_turn.backends.base import BaseAPI
+
+NUM_FILLER_USERS = 10
+NUM_FILLER_MESSAGES = 50
+
+
+class MessageAPI(BaseAPI):
+    """A messaging workspace of users, where the logged-in user sends messages to the other users.
+
+    The `inbox` is the list of the sent messages, each a dictionary from the id of the receiver to a message or a list
+    of messages.
+    """
+
+    DEFAULT_STATE = {
+        "user_count": 4,
+        "user_map": {"Alice": "USR001", "Bob": "USR002", "Catherine": "USR003", "Daniel": "USR004"},
+        "inbox": [
+            {"USR002": "My name is Alice. I want to connect."},
+            {"USR003": "Could you upload the file?"},
+            {"USR004": "Could you upload the file?"},
+        ],
+        "message_count": 3,
+        "current_user": None,
+    }
+    RANDOM_SEED = 200191
+
+    def _extend_long_context(self):
+        for i in range(NUM_FILLER_USERS):
+            self._add_user(f"Member{i:02d}")
+        user_ids = list(self.user_map.values())
+        for i in range(NUM_FILLER_MESSAGES):
+            self._writable("inbox").append(
+                {user_ids[i % len(user_ids)]: f"Automated notice {i:03d}: no action required."}
+            )
+            self.message_count += 1
+
+    #### Helpers ####
+    def _add_user(self, user_name: str) -> str:
+        taken = set(self.user_map.values())
+        user_id = f"USR{self.user_count + 1:03d}"
+        while user_id in taken:
+            user_id = f"USR{int(user_id[3:]) + 1:03d}"
+        self.user_count += 1
+        self._writable("user_map")[user_name] = user_id
+        return user_id
+
+    def _messages(self) -> Iterator[Tuple[str, str]]:
+        for entry in self.inbox:
+            for receiver_id, messages in entry.items():
+                for message in messages if isinstance(messages, list) else [messages]:
+                    yield receiver_id, message
+
+    def _require_login(self) -> Dict[str, str] | None:
+        return None if self.current_user else {"error": "No user is currently logged in."}
+
+    #### Functions ####
+    def list_users(self) -> Dict[str, List[str]]:
+        return {"user_list": list(self.user_map)}
+
+    def get_user_id(self, user: str) -> Dict[str, str]:
+        if user not in self.user_map:
+            return {"error": f"User '{user}' not found in the workspace."}
+        return {"user_id": self.user_map[user]}
+
+    def message_login(self, user_id: str) -> Dict[str, Any]:
+        if user_id not in self.user_map.values():
+            return {"login_status": False, "message": f"User ID '{user_id}' not found."}
+        self.current_user = user_id
+        return {"login_status": True, "message": f"User '{user_id}' logged in successfully."}
+
+    def message_get_login_status(self) -> Dict[str, bool]:
+        return {"login_status": bool(self.current_user)}
+
+    def add_contact(self, user_name: str) -> Dict[str, Any]:
+        if user_name in self.user_map:
+            return {
+                "added_status": False,
+                "user_id": self.user_map[user_name],
+                "message": f"User '{user_name}' already exists in the workspace.",
+            }
+        user_id = self._add_user(user_name)
+        return {"added_status": True, "user_id": user_id, "message": f"Contact '{user_name}' added successfully."}
+
+    def send_message(self, receiver_id: str, message: str) -> Dict[str, Any]:
+        error = self._require_login()
+        if error:
+            return error
+        if receiver_id not in self.user_map.values():
+            return {"error": f"Receiver ID '{receiver_id}' not found."}
+        message_id = self._random.randint(10000, 99999)
+        self._writable("inbox").append({receiver_id: message})
+        self.message_count += 1
+        return {
+            "sent_status": True,
+            "message_id": message_id,
+            "message": f"Message sent to '{receiver_id}' successfully.",
+        }
+
+    def delete_message(self, receiver_id: str, message_id: int | None = None) -> Dict[str, Any]:
+        error = self._require_login()
+        if error:
+            return error
+        for index in range(len(self.inbox) - 1, -1, -1):
+            messages = self.inbox[index].get(receiver_id)
+            if messages is None:
+                continue
+            inbox = self._writable("inbox")
+            if isinstance(messages, list) and len(messages) > 1:
+                inbox[index] = {**inbox[index], receiver_id: messages[:-1]}
+            elif len(inbox[index]) > 1:
+                inbox[index] = {key: value for key, value in inbox[index].items() if key != receiver_id}
+            else:
+                del inbox[index]
+            return {
+                "deleted_status": True,
+                "message_id": message_id,
+                "message": f"Message to '{receiver_id}' deleted successfully.",
+            }
+        return {"error": f"No message found for receiver '{receiver_id}'."}
+
+    def view_messages_sent(self) -> Dict[str, Dict[str, List[str]]]:
+        error = self._require_login()
+        if error:
+            return error
+        sent = {}
+        for receiver_id, message in self._messages():
+            sent.setdefault(receiver_id, []).append(message)
+        return {"messages": sent}
+
+    def search_messages(self, keyword: str) -> Dict[str, List[Dict[str, str]]]:
+        error = self._require_login()
+        if error:
+            return error
+        keyword = keyword.lower()
+        return {
+            "results": [
+                {"receiver_id": receiver_id, "message": message}
+                for receiver_id, message in self._messages()
+                if keyword in message.lower()
+            ]
+        }
+
+    def get_message_stats(self) -> Dict[str, Dict[str, int]]:
+        error = self._require_login()
+        if error:
+            return error
+        received_count, contacts = 0, set()
+        for receiver_id, _ in self._messages():
+            if receiver_id == self.current_user:
+                received_count += 1
+            else:
+                contacts.add(receiver_id)
+        return {"stats": {"received_count": received_count, "total_contacts": len(contacts)}}
@@ -0,0 +1,149 @@
+"""The simulated Twitter-like posting API."""
+
+from typing import Any, Dict, List
+
+from bfcl.eval.multi_turn.backends.base import BaseAPI, int_keys
+
+NUM_FILLER_TWEETS = 50
+
+
+class TwitterAPI(BaseAPI):
+    """A posting API where the authenticated user posts, comments on, retweets and follows."""
+
+    DEFAULT_STATE = {
+        "username": "john",
+        "password": "john123",
+        "authenticated": False,
+        "tweets": {},
+        "comments": {},
+        "retweets": {},
+        "following_list": ["alice", "bob"],
+        "tweet_counter": 0,
+    }
+
+    def _load_scenario(self, scenario: Dict[str, Any], long_context: bool = False):
+        super()._load_scenario(scenario, long_context=False)
+        self.tweets = int_keys(self.tweets)
+        self.comments = int_keys(self.comments)
+        if long_context:
+            self._extend_long_context()
+
+    def _extend_long_context(self):
+        for i in range(NUM_FILLER_TWEETS):
+            tweet_id = self.tweet_counter
+            self._writable("tweets")[tweet_id] = {
+                "id": tweet_id,
+                "username": f"archive_bot_{i % 5}",
+                "content": f"Scheduled post {i:03d} from the archive, for the record.",
+                "tags": ["#archive"],
+                "mentions": [],
+            }
+            self.tweet_counter += 1
+
+    #### Helpers ####
+    def _require_authentication(self) -> Dict[str, str] | None:
+        return None if self.authenticated else {"error": "User not authenticated. Please authenticate first."}
+
+    def _missing_tweet(self, tweet_id: int) -> Dict[str, str] | None:
+        return None if tweet_id in self.tweets else {"error": f"Tweet with ID {tweet_id} not found."}
+
+    #### Functions ####
+    def authenticate_twitter(self, username: str, password: str) -> Dict[str, bool]:
+        if username != self.username or password != self.password:
+            return {"authentication_status": False}
+        self.authenticated = True
+        return {"authentication_status": True}
+
+    def posting_get_login_status(self) -> Dict[str, bool]:
+        return {"login_status": bool(self.authenticated)}
+
+    def post_tweet(self, content: str, tags: List[str] = [], mentions: List[str] = []) -> Dict[str, Any]:
+        error = self._require_authentication()
+        if error:
+            return error
+        tweet = {
+            "id": self.tweet_counter,
+            "username": self.username,
+            "content": content,
+            "tags": list(tags),
+            "mentions": list(mentions),
+        }
+        self._writable("tweets")[self.tweet_counter] = tweet
+        self.tweet_counter += 1
+        return dict(tweet)
+
+    def retweet(self, tweet_id: int) -> Dict[str, str]:
+        error = self._require_authentication() or self._missing_tweet(tweet_id)
+        if error:
+            return error
+        retweets = self.retweets.get(self.username, [])
+        if tweet_id in retweets:
+            return {"retweet_status": "Already retweeted"}
+        self._writable("retweets")[self.username] = [*retweets, tweet_id]
+        return {"retweet_status": "Successfully retweeted"}
+
+    def comment(self, tweet_id: int, comment_content: str) -> Dict[str, str]:
+        error = self._require_authentication() or self._missing_tweet(tweet_id)
+        if error:
+            return error
+        comment = {"username": self.username, "content": comment_content}
+        self._writable("comments")[tweet_id] = [*self.comments.get(tweet_id, []), comment]
+        return {"comment_status": "Comment added successfully"}
+
+    def mention(self, tweet_id: int, mentioned_usernames: List[str]) -> Dict[str, str]:
+        error = self._missing_tweet(tweet_id)
+        if error:
+            return error
+        tweet = self._writable("tweets", tweet_id)
+        tweet["mentions"] = tweet["mentions"] + list(mentioned_usernames)
+        return {"mention_status": "Users mentioned successfully"}
+
+    def follow_user(self, username_to_follow: str) -> Dict[str, bool]:
+        error = self._require_authentication()
+        if error:
+            return error
+        if username_to_follow in self.following_list:
+            return {"follow_status": False}
+        self._writable("following_list").append(username_to_follow)
+        return {"follow_status": True}
+
+    def list_all_following(self) -> Dict[str, List[str]]:
+        error = self._require_authentication()
+        if error:
+            return error
+        return {"following_list": list(self.following_list)}
+
+    def unfollow_user(self, username_to_unfollow: str) -> Dict[str, bool]:
+        error = self._require_authentication()
+        if error:
+            return error
+        if username_to_unfollow not in self.following_list:
+            return {"unfollow_status": False}
+        self._writable("following_list").remove(username_to_unfollow)
+        return {"unfollow_status": True}
+
+    def get_tweet(self, tweet_id: int) -> Dict[str, Any]:
+        return self._missing_tweet(tweet_id) or dict(self.tweets[tweet_id])
+
+    def get_user_tweets(self, username: str) -> Dict[str, List[Dict[str, Any]]]:
+        return {"user_tweets": [dict(tweet) for tweet in self.tweets.values() if tweet["username"] == username]}
+
+    def search_tweets(self, keyword: str) -> Dict[str, List[Dict[str, Any]]]:
+        keyword = keyword.lower()
+        return {
+            "matching_tweets": [
+                dict(tweet)
+                for tweet in self.tweets.values()
+                if keyword in tweet["content"].lower() or any(keyword in tag.lower() for tag in tweet["tags"])
+            ]
+        }
+
+    def get_tweet_comments(self, tweet_id: int) -> Dict[str, List[Dict[str, str]]]:
+        return self._missing_tweet(tweet_id) or {"comments": list(self.comments.get(tweet_id, []))}
+
+    def get_user_stats(self, username: str) -> Dict[str, int]:
+        return {
+            "tweet_count": sum(tweet["username"] == username for tweet in self.tweets.values()),
+            "following_count": len(self.following_list) if username == self.username else 0,
+            "retweet_count": len(self.retweets.get(username, [])),
+        }
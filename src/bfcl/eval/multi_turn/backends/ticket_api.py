@@ -0,0 +1,118 @@
+"""The simulated support ticket API."""
+
+from typing import Any, Dict, List
+
+from bfcl.eval.multi_turn.backends.base import BaseAPI
+
+NUM_FILLER_TICKETS = 50
+EDITABLE_FIELDS = {"title", "description", "status", "priority"}
+
+
+class TicketAPI(BaseAPI):
+    """A queue of support tickets, created and managed by the logged-in user."""
+
+    DEFAULT_STATE = {"ticket_queue": [], "ticket_counter": 1, "current_user": None}
+
+    def _extend_long_context(self):
+        for i in range(NUM_FILLER_TICKETS):
+            self._writable("ticket_queue").append(
+                {
+                    "id": self.ticket_counter,
+                    "title": f"Routine maintenance {i:03d}",
+                    "description": "Scheduled maintenance task, no user impact.",
+                    "status": "Closed",
+                    "priority": 1,
+                    "created_by": "system",
+                }
+            )
+            self.ticket_counter += 1
+
+    #### Helpers ####
+    def _find_ticket(self, ticket_id: int) -> Dict[str, Any] | None:
+        index = self._ticket_index(ticket_id)
+        return None if index is None else self.ticket_queue[index]
+
+    def _ticket_index(self, ticket_id: int) -> int | None:
+        for index, ticket in enumerate(self.ticket_queue):
+            if ticket.get("id") == ticket_id:
+                return index
+        return None
+
+    def _require_login(self) -> Dict[str, str] | None:
+        return None if self.current_user else {"error": "User not authenticated. Please log in first."}
+
+    #### Functions ####
+    def ticket_login(self, username: str, password: str) -> Dict[str, bool]:
+        if not username or not password:
+            return {"success": False}
+        self.current_user = username
+        return {"success": True}
+
+    def ticket_get_login_status(self) -> Dict[str, bool]:
+        return {"username": bool(self.current_user)}
+
+    def logout(self) -> Dict[str, bool]:
+        if not self.current_user:
+            return {"success": False}
+        self.current_user = None
+        return {"success": True}
+
+    def create_ticket(self, title: str, description: str = "", priority: int = 1) -> Dict[str, Any]:
+        error = self._require_login()
+        if error:
+            return error
+        if not 1 <= priority <= 5:
+            return {"error": "Invalid priority. Priority must be between 1 and 5."}
+        ticket = {
+            "id": self.ticket_counter,
+            "title": title,
+            "description": description,
+            "status": "Open",
+            "priority": priority,
+            "created_by": self.current_user,
+        }
+        self._writable("ticket_queue").append(ticket)
+        self.ticket_counter += 1
+        return dict(ticket)
+
+    def get_ticket(self, ticket_id: int) -> Dict[str, Any]:
+        ticket = self._find_ticket(ticket_id)
+        return dict(ticket) if ticket else {"error": f"Ticket with ID {ticket_id} not found."}
+
+    def get_user_tickets(self, status: str | None = None) -> List[Dict[str, Any]] | Dict[str, str]:
+        error = self._require_login()
+        if error:
+            return error
+        return [
+            dict(ticket)
+            for ticket in self.ticket_queue
+            if ticket.get("created_by") == self.current_user
+            and (status is None or status == "None" or str(ticket.get("status", "")).lower() == status.lower())
+        ]
+
+    def close_ticket(self, ticket_id: int) -> Dict[str, str]:
+        index = self._ticket_index(ticket_id)
+        if index is None:
+            return {"error": f"Ticket with ID {ticket_id} not found."}
+        if self.ticket_queue[index].get("status") == "Closed":
+            return {"error": f"Ticket with ID {ticket_id} is already closed."}
+        self._writable("ticket_queue", index)["status"] = "Closed"
+        return {"status": f"Ticket {ticket_id} has been closed successfully."}
+
+    def resolve_ticket(self, ticket_id: int, resolution: str) -> Dict[str, str]:
+        index = self._ticket_index(ticket_id)
+        if index is None:
+            return {"error": f"Ticket with ID {ticket_id} not found."}
+        ticket = self._writable("ticket_queue", index)
+        ticket["status"] = "Resolved"
+        ticket["resolution"] = resolution
+        return {"status": f"Ticket {ticket_id} has been resolved successfully."}
+
+    def edit_ticket(self, ticket_id: int, updates: Dict[str, Any]) -> Dict[str, str]:
+        index = self._ticket_index(ticket_id)
+        if index is None:
+            return {"error": f"Ticket with ID {ticket_id} not found."}
+        if not set(updates) <= EDITABLE_FIELDS:
+            return {"error": f"Invalid fields for update: {sorted(set(updates) - EDITABLE_FIELDS)}"}
+        self._writable("ticket_queue", index).update(updates)
+        return {"status": f"Ticket {ticket_id} has been updated successfully."}
@@ -0,0 +1,271 @@
+"""The simulated stock trading API."""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from bfcl.eval.multi_turn.backends.base import BaseAPI, int_keys
+
+# The simulated clock of the market, and its opening hours
+CURRENT_TIME = datetime(2024, 9, 19, 10, 30)
+MARKET_OPEN, MARKET_CLOSE = (9, 30), (16, 0)
+NUM_FILLER_TRANSACTIONS = 50
+
+SECTOR_STOCKS = {
+    "Technology": ["AAPL", "GOOG", "MSFT", "NVDA", "ALPH", "SYNX"],
+    "Automobile": ["TSLA", "F", "GM"],
+    "Industrial": ["OMEG", "NEPT"],
+    "Finance": ["QUAS", "ZETA"],
+}
+COMPANY_SYMBOLS = {
+    "Apple": "AAPL",
+    "Google": "GOOG",
+    "Tesla": "TSLA",
+    "Microsoft": "MSFT",
+    "Nvidia": "NVDA",
+    "Zeta Corp": "ZETA",
+    "Alpha Tech": "ALPH",
+    "Omega Industries": "OMEG",
+    "Quasar Ltd.": "QUAS",
+    "Neptune Systems": "NEPT",
+    "Synex Solutions": "SYNX",
+    "Amazon": "AMZN",
+}
+
+
+class TradingBot(BaseAPI):
+    """A brokerage account with the stock quotes, the orders, a watchlist and the transaction history."""
+
+    DEFAULT_STATE = {
+        "orders": {
+            12345: {
+                "id": 12345,
+                "order_type": "Buy",
+                "symbol": "AAPL",
+                "price": 210.65,
+                "amount": 10,
+                "status": "Completed",
+            },
+            12446: {
+                "id": 12446,
+                "order_type": "Sell",
+                "symbol": "GOOG",
+                "price": 2840.56,
+                "amount": 5,
+                "status": "Pending",
+            },
+        },
+        "account_info": {"account_id": 12345, "balance": 10000.0, "binding_card": 1974202140965533},
+        "authenticated": False,
+        "market_status": "Closed",
+        "order_counter": 12446,
+        "stocks": {
+            "AAPL": {"price": 227.16, "percent_change": 0.17, "volume": 2.552, "MA(5)": 227.11, "MA(20)": 227.09},
+            "GOOG": {"price": 2840.34, "percent_change": 0.24, "volume": 1.123, "MA(5)": 2835.67, "MA(20)": 2842.15},
+            "TSLA": {"price": 667.92, "percent_change": -0.12, "volume": 1.654, "MA(5)": 671.15, "MA(20)": 668.2},
+            "MSFT": {"price": 310.23, "percent_change": 0.09, "volume": 3.234, "MA(5)": 309.88, "MA(20)": 310.11},
+            "NVDA": {"price": 220.34, "percent_change": 0.34, "volume": 1.234, "MA(5)": 220.45, "MA(20)": 220.67},
+            "ALPH": {"price": 1320.45, "percent_change": -0.08, "volume": 1.567, "MA(5)": 1321.12, "MA(20)": 1325.78},
+            "OMEG": {"price": 457.23, "percent_change": 0.12, "volume": 2.345, "MA(5)": 456.78, "MA(20)": 458.12},
+            "QUAS": {"price": 725.89, "percent_change": -0.03, "volume": 1.789, "MA(5)": 726.45, "MA(20)": 728.0},
+            "NEPT": {"price": 88.34, "percent_change": 0.19, "volume": 0.654, "MA(5)": 88.21, "MA(20)": 88.67},
+            "SYNX": {"price": 345.67, "percent_change": 0.11, "volume": 2.112, "MA(5)": 345.34, "MA(20)": 346.12},
+            "ZETA": {"price": 150.0, "percent_change": 0.1, "volume": 1.5, "MA(5)": 149.5, "MA(20)": 150.2},
+        },
+        "watch_list": ["NVDA"],
+        "transaction_history": [],
+    }
+
+    def _load_scenario(self, scenario: Dict[str, Any], long_context: bool = False):
+        super()._load_scenario(scenario, long_context=False)
+        self.orders = int_keys(self.orders)
+        if long_context:
+            self._extend_long_context()
+
+    def _extend_long_context(self):
+        for i in range(NUM_FILLER_TRANSACTIONS):
+            self._writable("transaction_history").append(
+                {
+                    "type": "deposit" if i % 2 else "withdrawal",
+                    "amount": float(10 + i),
+                    "timestamp": "2024-01-01 09:00:00",
+                }
+            )
+
+    #### Helpers ####
+    def _require_authentication(self) -> Dict[str, str] | None:
+        return None if self.authenticated else {"error": "User not authenticated. Please log in first."}
+
+    def _record_transaction(self, xact_type: str, amount: float):
+        self._writable("transaction_history").append(
+            {"type": xact_type, "amount": amount, "timestamp": CURRENT_TIME.strftime("%Y-%m-%d %H:%M:%S")}
+        )
+
+    #### Functions ####
+    def trading_login(self, username: str, password: str) -> Dict[str, str]:
+        if self.authenticated:
+            return {"status": "Already logged in"}
+        self.authenticated = True
+        return {"status": "Logged in successfully"}
+
+    def trading_logout(self) -> Dict[str, str]:
+        if not self.authenticated:
+            return {"status": "No user is currently logged in"}
+        self.authenticated = False
+        return {"status": "Logged out successfully"}
+
+    def trading_get_login_status(self) -> Dict[str, bool]:
+        return {"status": bool(self.authenticated)}
+
+    def get_current_time(self) -> Dict[str, str]:
+        return {"current_time": CURRENT_TIME.strftime("%I:%M %p")}
+
+    def update_market_status(self, current_time_str: str) -> Dict[str, str]:
+        try:
+            current_time = datetime.strptime(current_time_str, "%I:%M %p")
+        except ValueError:
+            return {"error": f"Invalid time '{current_time_str}', expected the HH:MM AM/PM format."}
+        is_open = MARKET_OPEN <= (current_time.hour, current_time.minute) < MARKET_CLOSE
+        self.market_status = "Open" if is_open else "Closed"
+        return {"status": self.market_status}
+
+    def get_symbol_by_name(self, name: str) -> Dict[str, str]:
+        return {"symbol": COMPANY_SYMBOLS.get(name, "Stock not found")}
+
+    def get_available_stocks(self, sector: str) -> Dict[str, List[str]]:
+        return {"stock_list": list(SECTOR_STOCKS.get(sector, []))}
+
+    def get_stock_info(self, symbol: str) -> Dict[str, Any]:
+        if symbol not in self.stocks:
+            return {"error": f"Stock with symbol '{symbol}' not found."}
+        return dict(self.stocks[symbol])
+
+    def update_stock_price(self, symbol: str, new_price: float) -> Dict[str, Any]:
+        if symbol not in self.stocks:
+            return {"error": f"Stock with symbol '{symbol}' not found."}
+        if new_price <= 0:
+            return {"error": "New price must be a positive value."}
+        old_price = self.stocks[symbol]["price"]
+        self._writable("stocks")[symbol] = {**self.stocks[symbol], "price": new_price}
+        return {"symbol": symbol, "old_price": old_price, "new_price": new_price}
+
+    def filter_stocks_by_price(self, stocks: List[str], min_price: float, max_price: float) -> Dict[str, List[str]]:
+        return {
+            "filtered_stocks": [
+                symbol
+                for symbol in stocks
+                if symbol in self.stocks and min_price <= self.stocks[symbol]["price"] <= max_price
+            ]
+        }
+
+    def notify_price_change(self, stocks: List[str], threshold: float) -> Dict[str, str]:
+        changed = [
+            symbol
+            for symbol in stocks
+            if symbol in self.stocks and abs(self.stocks[symbol]["percent_change"]) >= threshold
+        ]
+        if not changed:
+            return {"notification": "No significant price changes in the selected stocks."}
+        return {"notification": f"Stocks {', '.join(changed)} have significant price changes."}
+
+    def place_order(self, order_type: str, symbol: str, price: float, amount: int) -> Dict[str, Any]:
+        error = self._require_authentication()
+        if error:
+            return error
+        if symbol not in self.stocks:
+            return {"error": f"Invalid stock symbol: {symbol}"}
+        if price <= 0 or amount <= 0:
+            return {"error": "Price and amount must be positive values."}
+        order_id = self.order_counter
+        self._writable("orders")[order_id] = {
+            "id": order_id,
+            "order_type": order_type,
+            "symbol": symbol,
+            "price": price,
+            "amount": amount,
+            "status": "Open",
+        }
+        self.order_counter += 1
+        return {"order_id": order_id, "order_type": order_type, "status": "Open", "price": price, "amount": amount}
+
+    def get_order_details(self, order_id: int) -> Dict[str, Any]:
+        order = self.orders.get(order_id)
+        if not isinstance(order, dict):
+            return {"error": f"Order with ID {order_id} not found."}
+        return {"id": order_id, **order}
+
+    def cancel_order(self, order_id: int) -> Dict[str, Any]:
+        order = self.orders.get(order_id)
+        if not isinstance(order, dict):
+            return {"error": f"Order with ID {order_id} not found."}
+        if order.get("status") == "Completed":
+            return {"error": f"Can't cancel order {order_id}. Order is already completed."}
+        self._writable("orders")[order_id] = {**order, "status": "Cancelled"}
+        return {"order_id": order_id, "status": "Cancelled"}
+
+    def get_order_history(self) -> Dict[str, List[int]]:
+        error = self._require_authentication()
+        if error:
+            return error
+        return {"order_history": [order_id for order_id, order in self.orders.items() if isinstance(order, dict)]}
+
+    def get_account_info(self) -> Dict[str, Any]:
+        error = self._require_authentication()
+        if error:
+            return error
+        return dict(self.account_info)
+
+    def fund_account(self, amount: float) -> Dict[str, Any]:
+        error = self._require_authentication()
+        if error:
+            return error
+        if amount <= 0:
+            return {"error": "Funding amount must be positive."}
+        self._writable("account_info")["balance"] += amount
+        self._record_transaction("deposit", amount)
+        return {"status": "Account funded successfully", "new_balance": self.account_info["balance"]}
+
+    def make_transaction(self, account_id: int, xact_type: str, amount: float) -> Dict[str, Any]:
+        error = self._require_authentication()
+        if error:
+            return error
+        if account_id != self.account_info["account_id"]:
+            return {"error": f"Account with ID {account_id} not found."}
+        if xact_type not in ("deposit", "withdrawal"):
+            return {"error": "Invalid transaction type. Use 'deposit' or 'withdrawal'."}
+        if amount <= 0:
+            return {"error": "Transaction amount must be positive."}
+        if xact_type == "withdrawal" and amount > self.account_info["balance"]:
+            return {"error": "Insufficient funds for withdrawal."}
+        self._writable("account_info")["balance"] += amount if xact_type == "deposit" else -amount
+        self._record_transaction(xact_type, amount)
+        return {"status": "Transaction successful", "new_balance": self.account_info["balance"]}
+
+    def get_transaction_history(self, start_date: str | None = None, end_date: str | None = None) -> Dict[str, Any]:
+        error = self._require_authentication()
+        if error:
+            return error
+        start = "0000-00-00" if start_date in (None, "None") else start_date
+        end = "9999-99-99" if end_date in (None, "None") else end_date
+        return {
+            "transaction_history": [
+                dict(transaction)
+                for transaction in self.transaction_history
+                if start <= transaction.get("timestamp", "")[:10] <= end
+            ]
+        }
+
+    def add_to_watchlist(self, stock: str) -> Dict[str, Any]:
+        if stock not in self.stocks:
+            return {"error": f"Stock with symbol '{stock}' not found."}
+        if stock not in self.watch_list:
+            self._writable("watch_list").append(stock)
+        return {"symbol": list(self.watch_list)}
+
+    def remove_stock_from_watchlist(self, symbol: str) -> Dict[str, str]:
+        if symbol not in self.watch_list:
+            return {"error": f"Stock {symbol} not found in watchlist."}
+        self._writable("watch_list").remove(symbol)
+        return {"status": f"Stock {symbol} removed from watchlist successfully."}
+
+    def get_watchlist(self) -> Dict[str, List[str]]:
+        return {"watchlist": list(self.watch_list)}
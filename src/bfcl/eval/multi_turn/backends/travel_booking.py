@@ -0,0 +1,308 @@
+"""The simulated travel booking API."""
+
+import zlib
+from datetime import date
+from typing import Any, Dict, List
+
+from bfcl.eval.multi_turn.backends.base import BaseAPI
+
+TODAY = date(2024, 9, 19)
+NUM_FILLER_BOOKINGS = 50
+
+AIRPORTS = {
+    "Rivermist": "RMS",
+    "Stonebrook": "SBK",
+    "Maplecrest": "MPC",
+    "Silverpine": "SVP",
+    "Shadowridge": "SHD",
+    "London": "LHR",
+    "Paris": "CDG",
+    "Sunset Valley": "SSV",
+    "Oakendale": "OKD",
+    "Willowbend": "WLB",
+    "Crescent Hollow": "CRH",
+    "Autumnville": "ATV",
+    "Pinehaven": "PHV",
+    "Greenfield": "GFD",
+    "San Francisco": "SFO",
+    "Los Angeles": "LAX",
+    "New York": "JFK",
+    "Chicago": "ORD",
+    "Boston": "BOS",
+    "Beijing": "PEK",
+    "Hong Kong": "HKG",
+    "Rome": "CIA",
+    "Tokyo": "HND",
+}
+CLASS_MULTIPLIERS = {"economy": 1.0, "business": 2.0, "first": 5.0}
+# The value of one US dollar in the supported currencies
+USD_EXCHANGE_RATES = {
+    "USD": 1.0,
+    "RMB": 7.0,
+    "EUR": 0.8,
+    "JPY": 110.0,
+    "GBP": 0.7,
+    "CAD": 1.3,
+    "AUD": 1.4,
+    "INR": 70.0,
+    "RUB": 60.0,
+    "BRL": 3.8,
+    "MXN": 20.0,
+}
+
+
+def _route_cost(travel_from: str, travel_to: str) -> float:
+    """Return the deterministic economy cost of a route, the same in both directions."""
+    route = "-".join(sorted([travel_from, travel_to]))
+    return float(100 + zlib.crc32(route.encode()) % 1900)
+
+
+class TravelAPI(BaseAPI):
+    """A travel booking account with the credit cards, the bookings and a budget limit."""
+
+    DEFAULT_STATE = {
+        "credit_card_list": {},
+        "booking_record": {},
+        "access_token": None,
+        "token_type": None,
+        "token_expires_in": None,
+        "token_scope": None,
+        "user_first_name": None,
+        "user_last_name": None,
+        "budget_limit": None,
+    }
+    RANDOM_SEED = 141053
+
+    def _extend_long_context(self):
+        for i in range(NUM_FILLER_BOOKINGS):
+            self._writable("booking_record")[f"archived_{i:03d}"] = {
+                "card_id": "archived",
+                "travel_date": "2023-01-01",
+                "travel_from": "RMS",
+                "travel_to": "SBK",
+                "travel_class": "economy",
+                "travel_cost": _route_cost("RMS", "SBK"),
+                "transaction_id": f"archived_{i:03d}",
+            }
+
+    #### Helpers ####
+    def _check_token(self, access_token: str) -> Dict[str, str] | None:
+        return None if self.access_token and access_token == self.access_token else {"error": "Invalid access token"}
+
+    def _new_id(self, digits: int) -> str:
+        return str(self._random.randint(10 ** (digits - 1), 10**digits - 1))
+
+    #### Functions ####
+    def authenticate_travel(
+        self,
+        client_id: str,
+        client_secret: str,
+        refresh_token: str,
+        grant_type: str,
+        user_first_name: str,
+        user_last_name: str,
+    ) -> Dict[str, Any]:
+        self.access_token = self._new_id(6)
+        self.token_type = "Bearer"
+        self.token_expires_in = 2
+        self.token_scope = grant_type
+        self.user_first_name = user_first_name
+        self.user_last_name = user_last_name
+        return {
+            "expires_in": self.token_expires_in,
+            "access_token": self.access_token,
+            "token_type": self.token_type,
+            "scope": self.token_scope,
+        }
+
+    def travel_get_login_status(self) -> Dict[str, bool]:
+        return {"status": bool(self.access_token)}
+
+    def get_budget_fiscal_year(
+        self, lastModifiedAfter: str | None = None, includeRemoved: str | None = None
+    ) -> Dict[str, str]:
+        return {"budget_fiscal_year": "2018"}
+
+    def register_credit_card(
+        self,
+        access_token: str,
+        card_number: str,
+        expiration_date: str,
+        cardholder_name: str,
+        card_verification_number: int,
+    ) -> Dict[str, str]:
+        error = self._check_token(access_token)
+        if error:
+            return error
+        if any(card.get("card_number") == card_number for card in self.credit_card_list.values()):
+            return {"error": "Card already registered"}
+        card_id = self._new_id(12)
+        self._writable("credit_card_list")[card_id] = {
+            "card_number": card_number,
+            "expiration_date": expiration_date,
+            "cardholder_name": cardholder_name,
+            "card_verification_number": card_verification_number,
+            "balance": float(self._random.randint(10000, 99999)),
+        }
+        return {"card_id": card_id}
+
+    def get_all_credit_cards(self) -> Dict[str, Dict[str, Any]]:
+        return {"credit_card_list": {card_id: dict(card) for card_id, card in self.credit_card_list.items()}}
+
+    def get_credit_card_balance(self, access_token: str, card_id: str) -> Dict[str, float]:
+        error = self._check_token(access_token)
+        if error:
+            return error
+        if card_id not in self.credit_card_list:
+            return {"error": "Card not registered"}
+        return {"card_balance": self.credit_card_list[card_id]["balance"]}
+
+    def list_all_airports(self) -> Dict[str, List[str]]:
+        return {"airports": list(AIRPORTS.values())}
+
+    def get_nearest_airport_by_city(self, location: str) -> Dict[str, str]:
+        return {"nearest_airport": AIRPORTS.get(location, "Unknown")}
+
+    def get_flight_cost(
+        self, travel_from: str, travel_to: str, travel_date: str, travel_class: str
+    ) -> Dict[str, List[float]]:
+        airports = set(AIRPORTS.values())
+        if travel_from not in airports or travel_to not in airports or travel_from == travel_to:
+            return {"error": "No available route for the given airports."}
+        if travel_class not in CLASS_MULTIPLIERS:
+            return {"error": f"Invalid travel class '{travel_class}'. Options are: economy, business, first."}
+        return {"travel_cost_list": [_route_cost(travel_from, travel_to) * CLASS_MULTIPLIERS[travel_class]]}
+
+    def compute_exchange_rate(self, base_currency: str, target_currency: str, value: float) -> Dict[str, float]:
+        if base_currency not in USD_EXCHANGE_RATES or target_currency not in USD_EXCHANGE_RATES:
+            return {"error": "No available exchange rate for the given currencies."}
+        exchanged = value / USD_EXCHANGE_RATES[base_currency] * USD_EXCHANGE_RATES[target_currency]
+        return {"exchanged_value": round(exchanged, 2)}
+
+    def set_budget_limit(self, access_token: str, budget_limit: float) -> Dict[str, float]:
+        error = self._check_token(access_token)
+        if error:
+            return error
+        if budget_limit < 0:
+            return {"error": "Budget limit cannot be negative"}
+        self.budget_limit = budget_limit
+        return {"budget_limit": budget_limit}
+
+    def verify_traveler_information(
+        self, first_name: str, last_name: str, date_of_birth: str, passport_number: str
+    ) -> Dict[str, Any]:
+        if (first_name, last_name) != (self.user_first_name, self.user_last_name):
+            return {
+                "verification_status": False,
+                "verification_failure": "Cannot book flight information for another user."
+                + f" Expected {self.user_first_name} {self.user_last_name}, got {first_name} {last_name}",
+            }
+        try:
+            birth = date.fromisoformat(date_of_birth)
+        except ValueError:
+            return {"verification_status": False, "verification_failure": "Invalid date of birth format."}
+        age = TODAY.year - birth.year - ((TODAY.month, TODAY.day) < (birth.month, birth.day))
+        if age < 18:
+            return {"verification_status": False, "verification_failure": "Traveler must be at least 18 years old."}
+        if not passport_number.startswith("US"):
+            return {
+                "verification_status": False,
+                "verification_failure": "Passport must be issued by the United States.",
+            }
+        return {"verification_status": True}
+
+    def book_flight(
+        self,
+        access_token: str,
+        card_id: str,
+        travel_date: str,
+        travel_from: str,
+        travel_to: str,
+        travel_class: str,
+        travel_cost: float,
+    ) -> Dict[str, Any]:
+        error = self._check_token(access_token)
+        if error:
+            return error
+        card = self.credit_card_list.get(card_id)
+        if card is None:
+            return {"booking_status": False, "error": "Card not registered"}
+        if card["balance"] < travel_cost:
+            return {"booking_status": False, "error": "Insufficient funds"}
+        booking_id, transaction_id = self._new_id(7), self._new_id(8)
+        self._writable("credit_card_list")[card_id] = {**card, "balance": card["balance"] - travel_cost}
+        self._writable("booking_record")[booking_id] = {
+            "card_id": card_id,
+            "travel_date": travel_date,
+            "travel_from": travel_from,
+            "travel_to": travel_to,
+            "travel_class": travel_class,
+            "travel_cost": travel_cost,
+            "transaction_id": transaction_id,
+        }
+        return {
+            "booking_id": booking_id,
+            "transaction_id": transaction_id,
+            "booking_status": True,
+            "booking_history": {},
+        }
+
+    def cancel_booking(self, access_token: str, booking_id: str) -> Dict[str, bool]:
+        error = self._check_token(access_token)
+        if error:
+            return error
+        booking = self.booking_record.get(booking_id)
+        if booking is None:
+            return {"cancel_status": False, "error": "Booking not found"}
+        card = self.credit_card_list.get(booking["card_id"])
+        if card is not None:
+            self._writable("credit_card_list")[booking["card_id"]] = {
+                **card,
+                "balance": card["balance"] + booking["travel_cost"],
+            }
+        del self._writable("booking_record")[booking_id]
+        return {"cancel_status": True}
+
+    def purchase_insurance(
+        self, access_token: str, insurance_type: str, booking_id: str, insurance_cost: float, card_id: str
+    ) -> Dict[str, Any]:
+        error = self._check_token(access_token)
+        if error:
+            return error
+        booking = self.booking_record.get(booking_id)
+        if booking is None:
+            return {"insurance_status": False, "error": "Booking not found"}
+        card = self.credit_card_list.get(card_id)
+        if card is None:
+            return {"insurance_status": False, "error": "Credit card not registered"}
+        if card["balance"] < insurance_cost:
+            return {"insurance_status": False, "error": "Insufficient funds"}
+        insurance_id = self._new_id(9)
+        self._writable("credit_card_list")[card_id] = {**card, "balance": card["balance"] - insurance_cost}
+        self._writable("booking_record")[booking_id] = {
+            **booking,
+            "insurance_id": insurance_id,
+            "insurance_type": insurance_type,
+            "insurance_cost": insurance_cost,
+        }
+        return {"insurance_id": insurance_id, "insurance_status": True}
+
+    def retrieve_invoice(
+        self, access_token: str, booking_id: str | None = None, insurance_id: str | None = None
+    ) -> Dict[str, Any]:
+        error = self._check_token(access_token)
+        if error:
+            return error
+        booking = self.booking_record.get(booking_id)
+        if booking is None:
+            return {"error": "Booking not found"}
+        invoice = {"booking_id": booking_id, **{key: value for key, value in booking.items() if key != "card_id"}}
+        return {"invoice": invoice}
+
+    def contact_customer_support(self, booking_id: str, message: str) -> Dict[str, str]:
+        if booking_id not in self.booking_record:
+            return {"error": "Booking not found"}
+        return {
+            "customer_support_message": "Thank you for contacting customer support. We will get back to you shortly. "
+            + message
+        }
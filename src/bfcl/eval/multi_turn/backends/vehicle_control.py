@@ -0,0 +1,234 @@
+"""The simulated vehicle control API."""
+
+import zlib
+from typing import Any, Dict, List
+
+from bfcl.eval.multi_turn.backends.base import BaseAPI
+
+MAX_FUEL_LEVEL = 50.0
+MILES_PER_GALLON = 20.0
+GALLON_TO_LITER = 3.78541
+MAX_BRAKE_FORCE = 1000.0
+PARKING_BRAKE_FORCE = 500.0
+HEALTHY_TIRE_PRESSURE = (30.0, 35.0)
+DOORS = ["driver", "passenger", "rear_left", "rear_right"]
+
+ZIPCODES = {
+    "Rivermist": "83214",
+    "Stonebrook": "74532",
+    "Maplecrest": "56108",
+    "Silverpine": "62947",
+    "Shadowridge": "71832",
+    "Sunset Valley": "31210",
+    "Oakendale": "47329",
+    "Willowbend": "69238",
+    "Crescent Hollow": "51479",
+    "Autumnville": "57921",
+    "Pinehaven": "36215",
+    "Greenfield": "38472",
+    "San Francisco": "94016",
+    "Los Angeles": "90001",
+    "New York": "10001",
+    "Chicago": "60601",
+    "Boston": "02108",
+}
+DISPLAY_OPTIONS = {
+    "fuel": ["fuelLevel"],
+    "battery": ["batteryVoltage"],
+    "doors": ["doorStatus"],
+    "climate": ["acTemperature", "fanSpeed", "acMode", "humidityLevel"],
+    "headlights": ["headLightStatus"],
+    "parkingBrake": ["parkingBrakeStatus", "parkingBrakeForce", "slopeAngle"],
+    "brakePadle": ["brakeStatus", "brakeForce"],
+    "engine": ["engineState"],
+}
+
+
+class VehicleControlAPI(BaseAPI):
+    """The controls and the sensors of a car."""
+
+    DEFAULT_STATE = {
+        "fuelLevel": 0.0,
+        "batteryVoltage": 12.6,
+        "engineState": "stopped",
+        "remainingUnlockedDoors": 4,
+        "doorStatus": {door: "unlocked" for door in DOORS},
+        "acTemperature": 25.0,
+        "fanSpeed": 50,
+        "acMode": "auto",
+        "humidityLevel": 50.0,
+        "headLightStatus": "off",
+        "parkingBrakeStatus": "released",
+        "parkingBrakeForce": 0.0,
+        "slopeAngle": 0.0,
+        "brakeStatus": "released",
+        "brakeForce": 0.0,
+        "distanceToNextVehicle": 50.0,
+        "cruiseStatus": "inactive",
+        "destination": "None",
+        "frontLeftTirePressure": 32.0,
+        "frontRightTirePressure": 32.0,
+        "rearLeftTirePressure": 30.0,
+        "rearRightTirePressure": 30.0,
+    }
+    RANDOM_SEED = 3425
+
+    def _load_scenario(self, scenario: Dict[str, Any], long_context: bool = False):
+        super()._load_scenario(scenario, long_context)
+        if "remainingUnlockedDoors" not in scenario:
+            self.remainingUnlockedDoors = sum(value == "unlocked" for value in self.doorStatus.values())
+        self._speed = 0.0
+
+    #### Functions ####
+    def startEngine(self, ignitionMode: str) -> Dict[str, Any]:
+        if ignitionMode == "STOP":
+            self.engineState = "stopped"
+            self._speed = 0.0
+        elif ignitionMode == "START":
+            if "unlocked" in self.doorStatus.values():
+                return {"error": "All doors must be locked before starting the engine."}
+            if self.brakeStatus != "pressed":
+                return {"error": "Brake pedal needs to be pressed when starting the engine."}
+            if self.fuelLevel <= 0:
+                return {"error": "Fuel tank is empty."}
+            self.engineState = "running"
+        else:
+            return {"error": f"Invalid ignition mode '{ignitionMode}'. Use 'START' or 'STOP'."}
+        return {"engineState": self.engineState, "fuelLevel": self.fuelLevel, "batteryVoltage": self.batteryVoltage}
+
+    def fillFuelTank(self, fuelAmount: float) -> Dict[str, float]:
+        if fuelAmount < 0:
+            return {"error": "Fuel amount cannot be negative."}
+        if self.fuelLevel + fuelAmount > MAX_FUEL_LEVEL:
+            return {"error": f"Cannot fill gas above the tank capacity of {MAX_FUEL_LEVEL} gallons."}
+        self.fuelLevel += fuelAmount
+        return {"fuelLevel": self.fuelLevel}
+
+    def lockDoors(self, unlock: bool, door: List[str]) -> Dict[str, Any]:
+        invalid = [name for name in door if name not in DOORS]
+        if invalid:
+            return {"error": f"Invalid doors: {invalid}"}
+        status = "unlocked" if unlock else "locked"
+        self.doorStatus = {**self.doorStatus, **{name: status for name in door}}
+        self.remainingUnlockedDoors = sum(value == "unlocked" for value in self.doorStatus.values())
+        return {"lockStatus": status, "remainingUnlockedDoors": self.remainingUnlockedDoors}
+
+    def adjustClimateControl(
+        self, temperature: float, unit: str = "celsius", fanSpeed: int = 50, mode: str = "auto"
+    ) -> Dict[str, Any]:
+        if not 0 <= fanSpeed <= 100:
+            return {"error": "Fan speed must be between 0 and 100."}
+        if unit not in ("celsius", "fahrenheit"):
+            return {"error": f"Invalid unit '{unit}'."}
+        if mode not in ("auto", "cool", "heat", "defrost"):
+            return {"error": f"Invalid climate mode '{mode}'."}
+        self.acTemperature = (temperature - 32) * 5 / 9 if unit == "fahrenheit" else temperature
+        self.fanSpeed = fanSpeed
+        self.acMode = mode
+        return {
+            "currentTemperature": self.acTemperature,
+            "climateMode": self.acMode,
+            "humidityLevel": self.humidityLevel,
+        }
+
+    def get_outside_temperature_from_google(self) -> Dict[str, float]:
+        return {"outsideTemperature": round(self._random.uniform(-10.0, 40.0), 1)}
+
+    def get_outside_temperature_from_weather_com(self) -> Dict[str, float]:
+        return {"outsideTemperature": round(self._random.uniform(-10.0, 40.0), 1)}
+
+    def setHeadlights(self, mode: str) -> Dict[str, str]:
+        if mode not in ("on", "off", "auto"):
+            return {"error": f"Invalid headlight mode '{mode}'."}
+        self.headLightStatus = "off" if mode == "off" else "on"
+        return {"headlightStatus": self.headLightStatus}
+
+    def displayCarStatus(self, option: str) -> Dict[str, Dict[str, Any]]:
+        if option not in DISPLAY_OPTIONS:
+            return {"error": f"Invalid option '{option}'."}
+        return {"status": {key: getattr(self, key) for key in DISPLAY_OPTIONS[option]}}
+
+    def activateParkingBrake(self, mode: str) -> Dict[str, Any]:
+        if mode == "engage":
+            self.parkingBrakeStatus, self.parkingBrakeForce, self.slopeAngle = "engaged", PARKING_BRAKE_FORCE, 10.0
+        elif mode == "release":
+            self.parkingBrakeStatus, self.parkingBrakeForce, self.slopeAngle = "released", 0.0, 0.0
+        else:
+            return {"error": f"Invalid mode '{mode}'. Use 'engage' or 'release'."}
+        return {
+            "parkingBrakeStatus": self.parkingBrakeStatus,
+            "_parkingBrakeForce": self.parkingBrakeForce,
+            "_slopeAngle": self.slopeAngle,
+        }
+
+    def pressBrakePedal(self, pedalPosition: float) -> Dict[str, Any]:
+        if not 0 <= pedalPosition <= 1:
+            return {"error": "Pedal position must be between 0 and 1."}
+        if pedalPosition == 0:
+            return self.releaseBrakePedal()
+        self.brakeStatus, self.brakeForce = "pressed", MAX_BRAKE_FORCE * pedalPosition
+        return {"brakePedalStatus": self.brakeStatus, "brakePedalForce": self.brakeForce}
+
+    def releaseBrakePedal(self) -> Dict[str, Any]:
+        self.brakeStatus, self.brakeForce = "released", 0.0
+        return {"brakePedalStatus": self.brakeStatus, "brakePedalForce": self.brakeForce}
+
+    def setCruiseControl(self, speed: float, activate: bool, distanceToNextVehicle: float) -> Dict[str, Any]:
+        if self.engineState != "running":
+            return {"error": "Start the engine before activating the cruise control."}
+        if activate and (not 0 <= speed <= 120 or speed % 5 != 0):
+            return {"error": "Invalid speed. The speed should be between 0 and 120 and a multiple of 5."}
+        self.cruiseStatus = "active" if activate else "inactive"
+        self.distanceToNextVehicle = distanceToNextVehicle
+        if activate:
+            self._speed = float(speed)
+        return {
+            "cruiseStatus": self.cruiseStatus,
+            "currentSpeed": self._speed,
+            "distanceToNextVehicle": self.distanceToNextVehicle,
+        }
+
+    def get_current_speed(self) -> Dict[str, float]:
+        return {"currentSpeed": self._speed}
+
+    def display_log(self, messages: List[str]) -> Dict[str, List[str]]:
+        return {"log": list(messages)}
+
+    def estimate_drive_feasibility_by_mileage(self, distance: float) -> Dict[str, bool]:
+        return {"canDrive": self.fuelLevel * MILES_PER_GALLON >= distance}
+
+    def liter_to_gallon(self, liter: float) -> Dict[str, float]:
+        return {"gallon": liter / GALLON_TO_LITER}
+
+    def gallon_to_liter(self, gallon: float) -> Dict[str, float]:
+        return {"liter": gallon * GALLON_TO_LITER}
+
+    def get_zipcode_based_on_city(self, city: str) -> Dict[str, str]:
+        return {"zipcode": ZIPCODES.get(city, "00000")}
+
+    def estimate_distance(self, cityA: str, cityB: str) -> Dict[str, Any]:
+        zipcodes = set(ZIPCODES.values())
+        if cityA not in zipcodes or cityB not in zipcodes:
+            return {"error": "distance not found in database."}
+        if cityA == cityB:
+            return {"distance": 0.0}
+        route = "-".join(sorted([cityA, cityB]))
+        return {"distance": float(50 + zlib.crc32(route.encode()) % 950)}
+
+    def find_nearest_tire_shop(self) -> Dict[str, str]:
+        return {"shopLocation": "456 Oakwood Avenue, Rivermist, 83214"}
+
+    def check_tire_pressure(self) -> Dict[str, Dict[str, Any]]:
+        pressures = {
+            "frontLeftTirePressure": self.frontLeftTirePressure,
+            "frontRightTirePressure": self.frontRightTirePressure,
+            "rearLeftTirePressure": self.rearLeftTirePressure,
+            "rearRightTirePressure": self.rearRightTirePressure,
+        }
+        low, high = HEALTHY_TIRE_PRESSURE
+        healthy = all(low <= pressure <= high for pressure in pressures.values())
+        return {"tirePressure": {**pressures, "healthy_tire_pressure": healthy}}
+
+    def set_navigation(self, destination: str) -> Dict[str, str]:
+        self.destination = destination
+        return {"status": f"Navigating to {destination}"}
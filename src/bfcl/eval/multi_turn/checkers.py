@@ -0,0 +1,154 @@
+"""Checkers for the multi-turn categories.
+
+The trajectory of the model is executed against its own simulated APIs and compared with the ground truth trajectory,
+executed once per entry, see `GroundTruthTrajectory`. After every turn with ground truth calls, the states of the APIs
+must match, and the results of the ground truth calls must all be among the results of the model calls.
+
+Reference: https://github.com/ShishirPatil/gorilla/blob/main/berkeley-function-call-leaderboard/bfcl/eval_checker/
+multi_turn_eval/multi_turn_checker.py
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from bfcl.eval.multi_turn.environment import MultiTurnEnvironment
+from bfcl.eval.multi_turn.trajectories import GroundTruthTrajectory
+from bfcl.profiling import timed
+from bfcl.schemas.responses import (
+    BaseError,
+    BaseResponse,
+    MultiTurnEmptyTurnError,
+    MultiTurnFormatError,
+    MultiTurnResponseMismatchError,
+    MultiTurnStateMismatchError,
+    MultiTurnTurnCountMismatchError,
+)
+
+
+#### Helper functions ####
+def flatten_turn(turn: Any) -> List[str | Dict[str, Dict[str, Any]]] | None:
+    """Flatten the calls of a turn, given either as a list of calls or as a list of steps that are lists of calls.
+
+    Returns:
+        The calls of the turn in order, or None if the turn is malformed.
+    """
+    if not isinstance(turn, list):
+        return None
+    calls = []
+    for step in turn:
+        for call in step if isinstance(step, list) else [step]:
+            if not isinstance(call, (str, dict)):
+                return None
+            calls.append(call)
+    return calls
+
+
+def state_differences(
+    model_state: Dict[str, Dict[str, Any]], ground_truth_state: Dict[str, Dict[str, Any]]
+) -> List[str]:
+    """List the attributes of the APIs whose state differ, as `ClassName.attribute`.
+
+    The copy-on-write states share the values that neither trajectory modified, so they are skipped by identity, and
+    the comparison of the other ones stops at the shared containers, see `BaseAPI`.
+    """
+    differences = []
+    for class_name, state in ground_truth_state.items():
+        model_class_state = model_state.get(class_name, {})
+        for key, value in state.items():
+            model_value = model_class_state.get(key)
+            if model_value is not value and model_value != value:
+                differences.append(f"{class_name}.{key}")
+    return differences
+
+
+def check_turn(
+    turn_index: int,
+    calls: List[str | Dict[str, Dict[str, Any]]],
+    model_environment: MultiTurnEnvironment,
+    ground_truth: GroundTruthTrajectory,
+) -> Tuple[List[str], BaseError | None]:
+    """Execute the calls of one turn and check the turn against the ground truth trajectory.
+
+    Only the calls of the turn are executed, the environment carries the state of the earlier turns.
+
+    Args:
+        turn_index (int): The index of the turn.
+        calls (List[str | Dict[str, Dict[str, Any]]]): The flattened calls of the model, see `flatten_turn`.
+        model_environment (MultiTurnEnvironment): The environment of the model trajectory.
+        ground_truth (GroundTruthTrajectory): The executed ground truth trajectory of the entry.
+
+    Returns:
+        The execution results of the model calls, and the error of the turn or None if the turn is correct.
+    """
+    model_results = model_environment.execute_all(calls)
+
+    # the turns without ground truth ask for a missing function or parameter, there is nothing to check
+    if not ground_truth.turns[turn_index]:
+        return model_results, None
+    if not calls:
+        return model_results, MultiTurnEmptyTurnError(message=[f"The model response of turn {turn_index} is empty."])
+
+    differences = state_differences(model_environment.state(), ground_truth.states[turn_index])
+    if differences:
+        return model_results, MultiTurnStateMismatchError(
+            message=[f"The state does not match the ground truth after turn {turn_index}.", *differences]
+        )
+
+    missing = Counter(ground_truth.results[turn_index]) - Counter(model_results)
+    if missing:
+        return model_results, MultiTurnResponseMismatchError(
+            message=[f"The execution results of turn {turn_index} miss some ground truth results.", *missing.elements()]
+        )
+    return model_results, None
+
+
+def _failure(error: BaseError, results: List[List[str]]) -> BaseResponse:
+    return BaseResponse(valid=False, correct=False, results=results, errors=[error])
+
+
+#### Main function ####
+@timed
+def multi_turn_checker(
+    model_turns: Any,
+    ground_truth_turns: List[List[str]],
+    initial_config: Dict[str, Dict[str, Any]],
+    involved_classes: List[str],
+    long_context: bool = False,
+    ground_truth: GroundTruthTrajectory | None = None,
+) -> BaseResponse:
+    """Check a multi-turn trajectory against the ground truth.
+
+    Args:
+        model_turns (Any): The calls of the model, a list with a list of calls (or of steps of calls) per turn.
+        ground_truth_turns (List[List[str]]): The ground truth calls of every turn, as python code.
+        initial_config (Dict[str, Dict[str, Any]]): The initial state of the APIs, by class name.
+        involved_classes (List[str]): The class names of the APIs available in the entry.
+        long_context (bool): Whether the APIs are extended with filler data, for the long-context category.
+        ground_truth (GroundTruthTrajectory): The ground truth trajectory already executed, e.g. from
+            `GROUND_TRUTH_TRAJECTORIES`, executed from the other arguments if None.
+
+    Returns:
+        A `BaseResponse` object, with the execution results of the model calls of every turn.
+    """
+    turns = [flatten_turn(turn) for turn in model_turns] if isinstance(model_turns, list) else None
+    if turns is None or any(calls is None for calls in turns):
+        return _failure(MultiTurnFormatError(), [])
+    if len(turns) != len(ground_truth_turns):
+        return _failure(
+            MultiTurnTurnCountMismatchError(
+                message=[f"Expected {len(ground_truth_turns)} turns, got {len(turns)} turns."]
+            ),
+            [],
+        )
+
+    if ground_truth is None:
+        ground_truth = GroundTruthTrajectory(ground_truth_turns, initial_config, involved_classes, long_context)
+    model_environment = ground_truth.environment()
+    results = []
+    for turn_index, calls in enumerate(turns):
+        model_results, error = check_turn(turn_index, calls, model_environment, ground_truth)
+        results.append(model_results)
+        if error is not None:
+            return _failure(error, results)
+
+    return BaseResponse(valid=True, correct=True, results=results, errors=[])
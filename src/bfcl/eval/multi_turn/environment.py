@@ -0,0 +1,178 @@
+"""The execution environment of the multi-turn categories.
+
+An environment holds one instance of every simulated API involved in an entry, loaded from its `initial_config`, and
+executes the function calls of a trajectory against them.
+
+Reference: https://github.com/ShishirPatil/gorilla/blob/main/berkeley-function-call-leaderboard/bfcl/eval_checker/
+multi_turn_eval/multi_turn_utils.py
+"""
+
+import ast
+import copy
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from bfcl.constants.category_mappings import MULTI_TURN_FUNC_DOC_FILE_MAPPING
+from bfcl.constants.config import MULTI_TURN_FUNC_DOC_PATH
+from bfcl.eval.multi_turn.backends.base import BaseAPI
+from bfcl.eval.multi_turn.backends.gorilla_file_system import GorillaFileSystem
+from bfcl.eval.multi_turn.backends.math_api import MathAPI
+from bfcl.eval.multi_turn.backends.message_api import MessageAPI
+from bfcl.eval.multi_turn.backends.posting_api import TwitterAPI
+from bfcl.eval.multi_turn.backends.ticket_api import TicketAPI
+from bfcl.eval.multi_turn.backends.trading_bot import TradingBot
+from bfcl.eval.multi_turn.backends.travel_booking import TravelAPI
+from bfcl.eval.multi_turn.backends.vehicle_control import VehicleControlAPI
+from bfcl.utils.ops import iter_jsonl
+
+BACKENDS = {
+    "GorillaFileSystem": GorillaFileSystem,
+    "MathAPI": MathAPI,
+    "MessageAPI": MessageAPI,
+    "TwitterAPI": TwitterAPI,
+    "TicketAPI": TicketAPI,
+    "TradingBot": TradingBot,
+    "TravelAPI": TravelAPI,
+    "VehicleControlAPI": VehicleControlAPI,
+}
+
+
+@lru_cache(maxsize=None)
+def load_func_docs(class_name: str) -> Tuple[Dict[str, Any], ...]:
+    """Load the function descriptions of a simulated API, shared by all the entries involving it.
+
+    Args:
+        class_name (str): The class name of the API, as in the `involved_classes` of the entries.
+
+    Returns:
+        The function descriptions, which must not be modified.
+    """
+    return tuple(iter_jsonl(Path(MULTI_TURN_FUNC_DOC_PATH) / MULTI_TURN_FUNC_DOC_FILE_MAPPING[class_name]))
+
+
+def function_descriptions(involved_classes: List[str], excluded: List[str] | None = None) -> List[Dict[str, Any]]:
+    """Get the function descriptions of the involved APIs, except the excluded functions."""
+    excluded = set(excluded or [])
+    return [
+        func_doc
+        for class_name in involved_classes
+        for func_doc in load_func_docs(class_name)
+        if func_doc["name"] not in excluded
+    ]
+
+
+@lru_cache(maxsize=65536)
+def _parse_call_string(call: str) -> Tuple[str, Tuple[Any, ...], Tuple[Tuple[str, Any], ...]]:
+    node = ast.parse(call.strip(), mode="eval").body
+    if not isinstance(node, ast.Call) or not isinstance(node.func, (ast.Name, ast.Attribute)):
+        raise ValueError(f"Not a function call: {call}")
+    name = node.func.id if isinstance(node.func, ast.Name) else node.func.attr
+    args = tuple(ast.literal_eval(arg) for arg in node.args)
+    kwargs = tuple((keyword.arg, ast.literal_eval(keyword.value)) for keyword in node.keywords)
+    return name, args, kwargs
+
+
+def parse_call(call: str | Dict[str, Dict[str, Any]]) -> Tuple[str, Tuple[Any, ...], Dict[str, Any]]:
+    """Parse a function call with literal arguments.
+
+    The parsed call strings are cached, as the same calls come up across the samples of an entry, so the arguments
+    are shared and must not be modified.
+
+    Args:
+        call (str | Dict[str, Dict[str, Any]]): The call, either as python code such as `cd(folder='document')`, or as
+            a dictionary `{function name: parameters}`.
+
+    Returns:
+        The function name, the positional arguments and the keyword arguments.
+
+    Raises:
+        ValueError: If the call is not a single function call with literal arguments.
+    """
+    if isinstance(call, dict):
+        if len(call) != 1:
+            raise ValueError(f"Expected one function call, got {len(call)}")
+        name, parameters = next(iter(call.items()))
+        if not isinstance(parameters, dict):
+            raise ValueError(f"The parameters of {name} are not a dictionary")
+        return name, (), dict(parameters)
+    if not isinstance(call, str):
+        raise ValueError(f"Not a function call: {call!r}")
+    try:
+        name, args, kwargs = _parse_call_string(call)
+    except SyntaxError as e:
+        raise ValueError(f"Invalid function call {call}: {e.msg}") from e
+    return name, args, dict(kwargs)
+
+
+def format_result(result: Any) -> str:
+    """Format the result of a function call as the model would read it."""
+    if isinstance(result, str):
+        return result
+    if isinstance(result, (dict, list)):
+        try:
+            return json.dumps(result)
+        except (TypeError, ValueError):
+            pass
+    return str(result)
+
+
+class MultiTurnEnvironment:
+    """The simulated APIs of a multi-turn entry.
+
+    Args:
+        initial_config (Dict[str, Dict[str, Any]]): The initial state of the APIs, by class name.
+        involved_classes (List[str]): The class names of the APIs available in the entry.
+        long_context (bool): Whether the APIs are extended with filler data, for the long-context category.
+    """
+
+    def __init__(
+        self, initial_config: Dict[str, Dict[str, Any]], involved_classes: List[str], long_context: bool = False
+    ):
+        self.instances: Dict[str, BaseAPI] = {}
+        # the class name of every available function
+        self._function_classes: Dict[str, str] = {}
+        for class_name in involved_classes:
+            instance = BACKENDS[class_name]()
+            scenario = initial_config.get(class_name)
+            instance._load_scenario(scenario if isinstance(scenario, dict) else {}, long_context=long_context)
+            self.instances[class_name] = instance
+            for func_doc in load_func_docs(class_name):
+                self._function_classes[func_doc["name"]] = class_name
+
+    def execute(self, call: str | Dict[str, Dict[str, Any]]) -> str:
+        """Execute a function call, the failures are reported in the result as the model would read them.
+
+        Args:
+            call (str | Dict[str, Dict[str, Any]]): The call, see `parse_call`.
+
+        Returns:
+            The formatted result of the call.
+        """
+        try:
+            name, args, kwargs = parse_call(call)
+            if name not in self._function_classes:
+                return f"Error during execution: Function {name} is not available."
+            function = getattr(self.instances[self._function_classes[name]], name)
+            return format_result(function(*args, **kwargs))
+        except Exception as e:
+            return f"Error during execution: {str(e)}"
+
+    def execute_all(self, calls: List[str | Dict[str, Dict[str, Any]]]) -> List[str]:
+        """Execute function calls in order, see `execute`."""
+        return [self.execute(call) for call in calls]
+
+    def fork(self) -> "MultiTurnEnvironment":
+        """Return an independent copy of the environment, which shares the state of the APIs until it is modified.
+
+        The cost of a fork does not depend on the size of the state, the modified parts of the state are copied by
+        the APIs as they are modified, see `BaseAPI`.
+        """
+        fork = copy.copy(self)
+        fork.instances = {class_name: instance._fork() for class_name, instance in self.instances.items()}
+        return fork
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        """Return the state of every API, by class name."""
+        return {class_name: instance._state() for class_name, instance in self.instances.items()}
@@ -0,0 +1,200 @@
+"""The stateful sessions of the multi-turn categories.
+
+A session keeps the environment of the model trajectory of an entry on the server, so that the turns are applied one at
+a time as the conversation goes on. Each turn only executes its own calls, instead of replaying the whole trajectory,
+and is checked against the cached ground truth trajectory of the entry. A session may be forked at any turn to explore
+several continuations, the forks share the state of the simulated APIs until they modify it. The sessions left idle for
+longer than their TTL are evicted.
+"""
+
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+from bfcl.constants.config import MULTI_TURN_MAX_SESSIONS, MULTI_TURN_SESSION_TTL
+from bfcl.constants.id_mapper import IDMapper
+from bfcl.eval.multi_turn.checkers import check_turn, flatten_turn
+from bfcl.eval.multi_turn.trajectories import GROUND_TRUTH_TRAJECTORIES
+from bfcl.metrics import MULTI_TURN_SESSION_EVICTIONS, MULTI_TURN_SESSIONS
+from bfcl.schemas.responses import BaseError, MultiTurnFormatError
+
+
+class MultiTurnSession:
+    """The state of the trajectories of a multi-turn entry, turn after turn.
+
+    Args:
+        session_id (str): The id of the session.
+        id (str): The id of the multi-turn entry.
+        id_mapper (IDMapper): The mapper to take the entry and its ground truth from.
+    """
+
+    def __init__(self, session_id: str, id: str, id_mapper: IDMapper):
+        self.ground_truth = GROUND_TRUTH_TRAJECTORIES.get(id, id_mapper)
+        self.session_id = session_id
+        self.id = id
+        self.category = id_mapper.get_category(id)
+        self.model_environment = self.ground_truth.environment()
+        self.num_turns_applied = 0
+        self.errors: List[BaseError] = []
+        # the turns of a session are applied one at a time
+        self.lock = threading.Lock()
+
+    @property
+    def num_turns(self) -> int:
+        return len(self.ground_truth)
+
+    @property
+    def done(self) -> bool:
+        return self.num_turns_applied >= self.num_turns
+
+    def apply_turn(self, turn: Any) -> Dict[str, Any]:
+        """Apply the calls of the next turn, and check the turn against the ground truth.
+
+        Args:
+            turn (Any): The calls of the model in the turn, a list of calls or of steps of calls.
+
+        Returns:
+            A dictionary with the `turn` index, the execution `results` of the calls, whether the turn is `correct` and
+            its `errors`, and the `summary` of the session.
+
+        Raises:
+            ValueError: If the turn is malformed or all the turns have been applied.
+        """
+        calls = flatten_turn(turn)
+        if calls is None:
+            raise ValueError(MultiTurnFormatError().message[0])
+        with self.lock:
+            if self.done:
+                raise ValueError(f"All the {self.num_turns} turns of the session have been applied.")
+            turn_index = self.num_turns_applied
+            results, error = check_turn(turn_index, calls, self.model_environment, self.ground_truth)
+            self.num_turns_applied += 1
+            if error is not None:
+                self.errors.append(error)
+            return {
+                "turn": turn_index,
+                "results": results,
+                "correct": error is None,
+                "errors": [] if error is None else [error.model_dump()],
+                "summary": self.summary(),
+            }
+
+    def fork(self, session_id: str) -> "MultiTurnSession":
+        """Return a copy of the session at its current turn, under a new session id.
+
+        Args:
+            session_id (str): The id of the fork.
+
+        Returns:
+            The fork, whose turns are applied independently of the session.
+        """
+        with self.lock:
+            fork = copy.copy(self)
+            fork.session_id = session_id
+            fork.model_environment = self.model_environment.fork()
+            fork.errors = list(self.errors)
+            fork.lock = threading.Lock()
+        return fork
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarize the session, which is `correct` once all its turns are applied without error."""
+        return {
+            "session_id": self.session_id,
+            "id": self.id,
+            "category": self.category.name,
+            "num_turns": self.num_turns,
+            "num_turns_applied": self.num_turns_applied,
+            "done": self.done,
+            "correct": self.done and not self.errors,
+            "errors": [error.model_dump() for error in self.errors],
+        }
+
+
+class SessionManager:
+    """The thread-safe store of the open multi-turn sessions.
+
+    The sessions are kept in the order of their last access, so that the idle ones are found at the front and evicted
+    on the next access to the store, and the least recently used one is evicted if the store is full.
+
+    Args:
+        id_mapper (IDMapper): The mapper to take the entries and their ground truth from.
+        ttl (float): The seconds a session is kept without being accessed.
+        max_sessions (int): The maximum number of sessions kept.
+        clock (Callable[[], float]): The monotonic clock of the last accesses.
+    """
+
+    def __init__(
+        self,
+        id_mapper: IDMapper,
+        ttl: float = MULTI_TURN_SESSION_TTL,
+        max_sessions: int = MULTI_TURN_MAX_SESSIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.id_mapper = id_mapper
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self._sessions: OrderedDict[str, MultiTurnSession] = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _remove(self, session_id: str) -> MultiTurnSession:
+        del self._last_access[session_id]
+        MULTI_TURN_SESSIONS.dec()
+        return self._sessions.pop(session_id)
+
+    def _evict_expired(self, now: float):
+        while self._sessions:
+            session_id = next(iter(self._sessions))
+            if now - self._last_access[session_id] <= self.ttl:
+                break
+            self._remove(session_id)
+            MULTI_TURN_SESSION_EVICTIONS.inc(reason="ttl")
+
+    def create(self, id: str) -> MultiTurnSession:
+        """Open a session for a multi-turn entry.
+
+        Raises:
+            ValueError: If the id is not a multi-turn entry.
+        """
+        return self._add(MultiTurnSession(uuid.uuid4().hex, id, self.id_mapper))
+
+    def fork(self, session_id: str) -> MultiTurnSession | None:
+        """Fork an open session at its current turn, or return None if it does not exist or has expired."""
+        session = self.get(session_id)
+        return None if session is None else self._add(session.fork(uuid.uuid4().hex))
+
+    def _add(self, session: MultiTurnSession) -> MultiTurnSession:
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            while len(self._sessions) >= self.max_sessions:
+                self._remove(next(iter(self._sessions)))
+                MULTI_TURN_SESSION_EVICTIONS.inc(reason="capacity")
+            self._sessions[session.session_id] = session
+            self._last_access[session.session_id] = now
+            MULTI_TURN_SESSIONS.inc()
+        return session
+
+    def get(self, session_id: str) -> MultiTurnSession | None:
+        """Get an open session and refresh its last access, or None if it does not exist or has expired."""
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                self._last_access[session_id] = now
+            return session
+
+    def close(self, session_id: str) -> MultiTurnSession | None:
+        """Close a session, returning it, or None if it does not exist or has expired."""
+        with self._lock:
+            self._evict_expired(self.clock())
+            return self._remove(session_id) if session_id in self._sessions else None
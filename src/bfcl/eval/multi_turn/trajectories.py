@@ -0,0 +1,105 @@
+"""The cache of the executed ground truth trajectories of the multi-turn categories.
+
+The ground truth trajectory of an entry is the same for every completion scored against it, so it is executed once
+and its results and states after every turn are cached for the lifetime of the process, keyed by id. The states are
+snapshots of the copy-on-write APIs, which share their unmodified parts with each other and with the initial config.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List
+
+from bfcl.constants.id_mapper import IDMapper
+from bfcl.eval.multi_turn.environment import MultiTurnEnvironment
+from bfcl.metrics import CACHE_LOOKUPS
+
+
+class GroundTruthTrajectory:
+    """The ground truth trajectory of a multi-turn entry, executed turn after turn.
+
+    The trajectory is not modified once built, so it is shared across threads and by all the checks of the entry.
+
+    Args:
+        ground_truth_turns (List[List[str]]): The ground truth calls of every turn, as python code.
+        initial_config (Dict[str, Dict[str, Any]]): The initial state of the APIs, by class name.
+        involved_classes (List[str]): The class names of the APIs available in the entry.
+        long_context (bool): Whether the APIs are extended with filler data, for the long-context category.
+    """
+
+    def __init__(
+        self,
+        ground_truth_turns: List[List[str]],
+        initial_config: Dict[str, Dict[str, Any]],
+        involved_classes: List[str],
+        long_context: bool = False,
+    ):
+        self.turns = ground_truth_turns
+        environment = MultiTurnEnvironment(initial_config, involved_classes, long_context)
+        # the initial environment is only ever forked, so that the model trajectories start from it without loading
+        # the scenario and the long-context filler again
+        self._initial_environment = environment.fork()
+        self.results: List[List[str]] = []
+        self.states: List[Dict[str, Dict[str, Any]]] = []
+        for calls in ground_truth_turns:
+            self.results.append(environment.execute_all(calls))
+            # a fork is never modified, so its state is a snapshot of the turn
+            self.states.append(environment.fork().state())
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def environment(self) -> MultiTurnEnvironment:
+        """Return a new environment in the initial state of the entry, to execute a model trajectory."""
+        return self._initial_environment.fork()
+
+
+class TrajectoryCache:
+    """The thread-safe cache of the ground truth trajectories, by id.
+
+    The cache is not bounded, the ground truth of the multi-turn categories is a fixed set of entries.
+    """
+
+    def __init__(self):
+        self._trajectories: Dict[str, GroundTruthTrajectory] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._trajectories)
+
+    def clear(self):
+        with self._lock:
+            self._trajectories.clear()
+
+    def get(self, id: str, id_mapper: IDMapper) -> GroundTruthTrajectory:
+        """Get the ground truth trajectory of an entry, executing it on the first lookup.
+
+        Args:
+            id (str): The id of the multi-turn entry.
+            id_mapper (IDMapper): The mapper to take the entry and its ground truth from.
+
+        Returns:
+            The ground truth trajectory of the entry.
+
+        Raises:
+            ValueError: If the id is not a multi-turn entry.
+        """
+        trajectory = self._trajectories.get(id)
+        CACHE_LOOKUPS.inc(cache="multi_turn_ground_truth", result="miss" if trajectory is None else "hit")
+        if trajectory is not None:
+            return trajectory
+
+        # the trajectory is executed outside of the lock, the first one stored wins if several threads miss
+        entry = id_mapper.get_multi_turn_entry(id)
+        trajectory = GroundTruthTrajectory(
+            id_mapper.get_ground_truth(id), entry["initial_config"], entry["involved_classes"], entry["long_context"]
+        )
+        with self._lock:
+            return self._trajectories.setdefault(id, trajectory)
+
+    def warm(self, ids: Iterable[str], id_mapper: IDMapper):
+        """Execute the ground truth trajectories of the multi-turn entries among the ids that are not cached yet."""
+        for id in ids:
+            if id in id_mapper.id_to_multi_turn_entry and id not in self._trajectories:
+                self.get(id, id_mapper)
+
+
+GROUND_TRUTH_TRAJECTORIES = TrajectoryCache()
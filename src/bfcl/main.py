@@ -1,53 +1,337 @@
 import argparse
+import atexit
+import contextvars
+import hashlib
+import json
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 import uvicorn
 from asgiref.wsgi import WsgiToAsgi
-from flask import Flask, jsonify, request
+from flask import Flask, Response, abort, g, jsonify, request, stream_with_context
 
+from bfcl.constants.category_mappings import TestCategory, TestCollection
+from bfcl.constants.config import PROMPTS_MAX_PAGE_SIZE, PROMPTS_PAGE_SIZE
+from bfcl.eval.multi_turn.sessions import SessionManager
+from bfcl.metrics import CACHE_LOOKUPS, QUEUE_DEPTH, REGISTRY, REQUESTS, REQUESTS_IN_FLIGHT
+from bfcl.profiling import SamplingProfiler, debug_timings, enable_timings
+from bfcl.results.sqlite_store import SQLiteResultStore
+from bfcl.results.store import make_record, response_from_record
 from bfcl.runners import PlainJsonRunner
+from bfcl.utils.log import JsonFormatter, Payload, request_id_var, setup_queue_logging
+from bfcl.utils.ops import hash_completion
 
 app = Flask(__name__)
 
 logger = logging.getLogger(__name__)
 runner = PlainJsonRunner()
+profiler = SamplingProfiler()
+sessions = SessionManager(runner.id_mapper)
+# The optional store of scored results, set up by `--result_db`
+result_store: SQLiteResultStore | None = None
+
+
+def run_tool_call(func_call: dict) -> dict:
+    """Run a tool call with the runner, reusing and recording its result in the result store if configured."""
+    id, completion = func_call["id"], func_call["completion"]
+    if result_store is None:
+        return runner.run(id, completion)
+
+    run_id = func_call.get("run_id")
+    completion_hash = hash_completion(completion)
+    if app.config.get("SKIP_SCORED", False):
+        record = result_store.lookup(id, completion_hash, run_id)
+        CACHE_LOOKUPS.inc(cache="result_store", result="miss" if record is None else "hit")
+        if record is not None:
+            return response_from_record(record)
+
+    response = runner.run(id, completion)
+    category = runner.id_mapper.id_to_category.get(id)
+    result = {**response, "id": id, "category": category.name if category else None}
+    result_store.put(make_record(result, completion_hash), run_id)
+    return response
+
+
+def sampled_payload(value) -> Payload | None:
+    """Wrap a payload for logging if the payloads of the current request are sampled."""
+    return Payload(value) if g.get("log_payload", False) else None
+
+
+@app.before_request
+def track_request_start():
+    REQUESTS_IN_FLIGHT.inc()
+    g.start_time = time.perf_counter()
+    g.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    g.log_payload = random.random() < app.config.get("LOG_PAYLOAD_RATE", 0.0)
+    request_id_var.set(g.request_id)
+
+
+@app.after_request
+def track_request_end(response):
+    endpoint = request.endpoint or "unknown"
+    REQUESTS.inc(endpoint=endpoint, status=str(response.status_code))
+    response.headers["X-Request-ID"] = g.request_id
+    logger.info(
+        "Handled request",
+        extra={
+            "endpoint": endpoint,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - g.start_time) * 1000, 3),
+        },
+    )
+    return response
+
+
+@app.teardown_request
+def track_request_teardown(_):
+    REQUESTS_IN_FLIGHT.dec()
+    request_id_var.set(None)
 
 
 @app.route("/call", methods=["GET"])
 def call():
-    logging.info(f"Received the following request to execute: {request.json}")
     func_call = request.json
-    response = runner.run(func_call["id"], func_call["completion"])
-    logging.info(f"Returning the following result: {response}")
+    response = run_tool_call(func_call)
+    logger.info(
+        "Ran tool call",
+        extra={
+            "id": func_call.get("id"),
+            "correct": response["correct"],
+            "payload": sampled_payload(func_call),
+            "result": sampled_payload(response),
+        },
+    )
     return jsonify(response)
 
 
 @app.route("/calls", methods=["GET"])
 def calls():
     # NOTE: input is a list of tool-calls
-    logging.info(f"Received the following requests to execute: {request.json}")
     func_calls = request.json
 
     # Get the number of workers from the app config
     max_workers = app.config.get("NUM_WORKERS", 16)
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(runner.run, func_call["id"], func_call["completion"]) for func_call in func_calls]
+        QUEUE_DEPTH.inc(len(func_calls))
+        # copy the context so that the records of the workers carry the request id
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_tool_call, func_call) for func_call in func_calls
+        ]
+        for future in futures:
+            future.add_done_callback(lambda _: QUEUE_DEPTH.dec())
         responses = [future.result() for future in futures]
+    logger.info(
+        "Ran tool calls",
+        extra={
+            "num_calls": len(func_calls),
+            "num_correct": sum(response["correct"] for response in responses),
+            "payload": sampled_payload(func_calls),
+        },
+    )
     return jsonify(responses)
 
 
+@app.route("/calls/stream", methods=["GET"])
+def calls_stream():
+    # NOTE: input is a list of tool-calls, the responses are streamed as JSON lines in the order they finish, each
+    # with the `index` of its tool call in the input
+    func_calls = request.json
+    max_workers = app.config.get("NUM_WORKERS", 16)
+
+    def generate():
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            QUEUE_DEPTH.inc(len(func_calls))
+            futures = {
+                executor.submit(contextvars.copy_context().run, run_tool_call, func_call): index
+                for index, func_call in enumerate(func_calls)
+            }
+            for future in futures:
+                future.add_done_callback(lambda _: QUEUE_DEPTH.dec())
+            for future in as_completed(futures):
+                yield json.dumps({"index": futures[future], **future.result()}) + "\n"
+        logger.info("Streamed tool calls", extra={"num_calls": len(func_calls), "payload": sampled_payload(func_calls)})
+
+    return Response(stream_with_context(generate()), content_type="application/x-ndjson")
+
+
+@app.route("/samples", methods=["GET"])
+def samples():
+    # NOTE: input is `{"id": ..., "completions": [...], "k": [...]}`, the sampled completions of a single id which
+    # are scored together, `k` is optional
+    body = request.json
+    response = runner.run_samples(body["id"], body["completions"], body.get("k"))
+    logger.info(
+        "Ran samples",
+        extra={
+            "id": body["id"],
+            "num_samples": response.get("num_samples"),
+            "num_correct": response.get("num_correct"),
+            "payload": sampled_payload(body),
+        },
+    )
+    return jsonify(response)
+
+
+def parse_json_body(*keys: str) -> dict:
+    """Parse a JSON object body with the given string fields, raising ValueError if it is not one."""
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict) or not all(isinstance(body.get(key), str) for key in keys):
+        raise ValueError(f"The body must be a JSON object with the string fields {list(keys)}.")
+    return body
+
+
+@app.route("/sessions", methods=["POST"])
+def create_session():
+    # NOTE: input is `{"id": ...}`, the id of a multi-turn entry whose turns are then applied one at a time
+    try:
+        body = parse_json_body("id")
+        session = sessions.create(body["id"])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    logger.info("Created session", extra={"id": session.id, "session_id": session.session_id})
+    return jsonify({**session.summary(), "ttl": sessions.ttl}), 201
+
+
+@app.route("/sessions/<session_id>", methods=["GET", "DELETE"])
+def session_summary(session_id: str):
+    session = sessions.get(session_id) if request.method == "GET" else sessions.close(session_id)
+    if session is None:
+        return jsonify({"error": f"Session {session_id} is not found or has expired."}), 404
+    return jsonify(session.summary())
+
+
+@app.route("/sessions/<session_id>/fork", methods=["POST"])
+def fork_session(session_id: str):
+    # NOTE: the fork starts at the current turn of the session, and shares its state until either of them changes it
+    session = sessions.fork(session_id)
+    if session is None:
+        return jsonify({"error": f"Session {session_id} is not found or has expired."}), 404
+    logger.info("Forked session", extra={"id": session.id, "session_id": session.session_id, "source": session_id})
+    return jsonify({**session.summary(), "ttl": sessions.ttl}), 201
+
+
+@app.route("/sessions/<session_id>/turn", methods=["POST"])
+def session_turn(session_id: str):
+    # NOTE: input is `{"completion": ...}`, the calls of the model in the next turn as a JSON list
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": f"Session {session_id} is not found or has expired."}), 404
+    try:
+        body = parse_json_body("completion")
+        response = session.apply_turn(json.loads(body["completion"]))
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+    logger.info(
+        "Applied turn",
+        extra={
+            "id": session.id,
+            "session_id": session_id,
+            "turn": response["turn"],
+            "correct": response["correct"],
+            "payload": sampled_payload(body),
+        },
+    )
+    return jsonify(response)
+
+
+def parse_names_arg(name: str, enum: type[TestCategory] | type[TestCollection]) -> list:
+    """Parse the repeated or comma-separated lowercase names of an enum, raising ValueError on an unknown name."""
+    members = {member.name.lower(): member for member in enum}
+    names = [value.strip().lower() for arg in request.args.getlist(name) for value in arg.split(",") if value.strip()]
+    unknown = [value for value in names if value not in members]
+    if unknown:
+        raise ValueError(f"Unknown {name} {unknown}, expected some of {list(members)}.")
+    return [members[value] for value in names]
+
+
+@app.route("/prompts", methods=["GET"])
+def prompts():
+    # NOTE: the prompts of the loaded categories in the order of `prompt_set`, filtered by `collection` and `category`
+    # (both repeatable or comma-separated), a page of `limit` prompts `after` an id, with their `functions` and all
+    # their `turns` if asked; the response is cached by ETag, as the prompts do not change while the server runs
+    try:
+        collections = parse_names_arg("collection", TestCollection)
+        categories = parse_names_arg("category", TestCategory)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    limit = request.args.get("limit", PROMPTS_PAGE_SIZE, type=int)
+    if not 0 < limit <= PROMPTS_MAX_PAGE_SIZE:
+        return jsonify({"error": f"The limit must be between 1 and {PROMPTS_MAX_PAGE_SIZE}."}), 400
+    after = request.args.get("after")
+    functions, turns = bool(parse_bool_arg("functions")), bool(parse_bool_arg("turns"))
+
+    # the filters are normalized, so that the same query spelled differently has the same ETag
+    selected = set(runner.id_mapper.id_to_category.values())
+    if collections:
+        selected &= {category for collection in collections for category in collection.value[2]}
+    if categories:
+        selected &= set(categories)
+    query = [sorted(category.name for category in selected), after, limit, functions, turns]
+    etag = hashlib.sha256(json.dumps([runner.id_mapper.prompts_digest(), query]).encode("utf-8")).hexdigest()
+    if etag in request.if_none_match:
+        CACHE_LOOKUPS.inc(cache="prompts_etag", result="hit")
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    CACHE_LOOKUPS.inc(cache="prompts_etag", result="miss")
+
+    try:
+        # one more id tells whether there is a next page, which starts after the last id of this one
+        ids, total = runner.id_mapper.get_prompt_ids(selected, after, limit + 1)
+    except (ValueError, IndexError):
+        return jsonify({"error": f"Invalid id {after}."}), 400
+    page = [runner.id_mapper.get_prompt(id, functions, turns) for id in ids[:limit]]
+    response = jsonify({"prompts": page, "total": total, "next": ids[limit - 1] if len(ids) > limit else None})
+    response.set_etag(etag)
+    return response
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def require_debug_endpoints():
+    if not app.config.get("DEBUG_ENDPOINTS", False):
+        abort(404)
+
+
+def parse_bool_arg(name: str) -> bool | None:
+    value = request.args.get(name)
+    return None if value is None else value.lower() in ("1", "true", "yes")
+
+
+@app.route("/debug/profile", methods=["GET"])
+def debug_profile():
+    # NOTE: blocks the request for the duration of the profile, capped at 5 minutes
+    require_debug_endpoints()
+    seconds = min(request.args.get("seconds", 30, type=float), 300)
+    profile = profiler.profile(seconds)
+    if profile is None:
+        return Response("A profile is already running.\n", status=409, content_type="text/plain")
+    return Response(profile, content_type="text/plain; charset=utf-8")
+
+
+@app.route("/debug/timings", methods=["GET"])
+def timings():
+    require_debug_endpoints()
+    return jsonify(debug_timings(enable=parse_bool_arg("enable"), reset=bool(parse_bool_arg("reset"))))
+
+
 def setup_logging(log_dir: str = "./logs"):
     os.makedirs(log_dir, exist_ok=True)
     current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     log_file = os.path.join(log_dir, f"bfcl_server_{current_time}.log")
-    logging.basicConfig(
-        filename=log_file,
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-    )
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    # the records are written by a background thread, stop it at exit to flush the queued records
+    listener = setup_queue_logging([file_handler])
+    atexit.register(listener.stop)
 
 
 def init_logging(host, port, num_workers=16):
@@ -61,9 +345,48 @@ def main():
     parser.add_argument("--host", default="127.0.0.1", help="Host to listen on")
     parser.add_argument("--port", type=int, default=1123, help="Port to listen on")
     parser.add_argument("--num_workers", type=int, default=16, help="Number of workers for concurrent requests")
+    parser.add_argument("--result_db", default=None, help="SQLite database to record every scored tool call in")
+    parser.add_argument("--run_id", default="default", help="Run to record results under if not given in a request")
+    parser.add_argument(
+        "--skip_scored",
+        action="store_true",
+        help="Answer completions already scored in the run from the result database instead of re-running checkers",
+    )
+    parser.add_argument(
+        "--debug_endpoints",
+        action="store_true",
+        help="Expose the /debug/profile and /debug/timings endpoints for diagnosing hot paths",
+    )
+    parser.add_argument(
+        "--session_ttl",
+        type=float,
+        default=sessions.ttl,
+        help="Seconds a multi-turn session is kept without a turn applied",
+    )
+    parser.add_argument(
+        "--max_sessions", type=int, default=sessions.max_sessions, help="Maximum number of multi-turn sessions kept"
+    )
+    parser.add_argument("--stage_timings", action="store_true", help="Record detailed stage and checker timings")
+    parser.add_argument(
+        "--log_payload_rate",
+        type=float,
+        default=0.01,
+        help="Fraction of requests whose (truncated) payloads are logged",
+    )
     args = parser.parse_args()
     init_logging(args.host, args.port, args.num_workers)
     app.config["NUM_WORKERS"] = args.num_workers
+    app.config["SKIP_SCORED"] = args.skip_scored
+    app.config["DEBUG_ENDPOINTS"] = args.debug_endpoints
+    app.config["LOG_PAYLOAD_RATE"] = args.log_payload_rate
+    sessions.ttl = args.session_ttl
+    sessions.max_sessions = args.max_sessions
+    enable_timings(args.stage_timings)
+    if args.result_db:
+        global result_store
+        result_store = SQLiteResultStore(args.result_db, run_id=args.run_id)
+        # the records are written by a background thread in batches, close the store at exit to commit the queued ones
+        atexit.register(result_store.close)
     uvicorn.run(WsgiToAsgi(app), host=args.host, port=args.port)
 
 
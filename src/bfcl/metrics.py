@@ -0,0 +1,242 @@
+"""Prometheus-style metrics of the server.
+
+A minimal, dependency-free implementation of counters, gauges and histograms that renders the Prometheus text
+exposition format for the `/metrics` endpoint. Metrics are process-local and thread-safe.
+"""
+
+import bisect
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Latencies of the runner stages range from microseconds (decoding) to seconds (REST execution)
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Metric {self.name} expects labels {self.label_names}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """A monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help, label_names)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self.values().items())
+        ]
+
+
+class Gauge(Counter):
+    """A value that can go up and down."""
+
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class CallbackGauge(_Metric):
+    """A gauge whose values are computed by a callback at render time."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: Sequence[str],
+        callback: Callable[[], Dict[Tuple[str, ...], float]],
+    ):
+        super().__init__(name, help, label_names)
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self.callback().items())
+        ]
+
+
+class Histogram(_Metric):
+    """A histogram of observed values with cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # per label values: [bucket counts..., +Inf count], sum
+        self._counts = {}
+        self._sums = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            counts = {key: list(value) for key, value in self._counts.items()}
+            sums = dict(self._sums)
+
+        lines = []
+        for key in sorted(counts):
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + (float("inf"),), counts[key]):
+                cumulative += count
+                le = f'le="{_format_value(upper_bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(sums[key])}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The registry of metrics rendered by the `/metrics` endpoint."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+def _cache_hit_ratios() -> Dict[Tuple[str, ...], float]:
+    lookups = {}
+    for (cache, result), value in CACHE_LOOKUPS.values().items():
+        hits, total = lookups.get(cache, (0, 0))
+        lookups[cache] = (hits + (value if result == "hit" else 0), total + value)
+    return {(cache,): hits / total for cache, (hits, total) in lookups.items() if total}
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.register(Counter("bfcl_requests_total", "Number of HTTP requests handled.", ["endpoint", "status"]))
+REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge("bfcl_requests_in_flight", "Number of HTTP requests being handled."))
+QUEUE_DEPTH = REGISTRY.register(
+    Gauge("bfcl_queue_depth", "Number of tool calls submitted to the worker pool and not yet finished.")
+)
+TOOL_CALLS = REGISTRY.register(
+    Counter("bfcl_tool_calls_total", "Number of tool calls run, per category.", ["category"])
+)
+STAGE_LATENCY = REGISTRY.register(
+    Histogram(
+        "bfcl_stage_latency_seconds",
+        "Latency of the runner stages (validate, decode, checker, serialization), per category.",
+        ["category", "stage"],
+    )
+)
+CACHE_LOOKUPS = REGISTRY.register(
+    Counter(
+        "bfcl_cache_lookups_total", "Number of cache lookups, per cache and result (hit or miss).", ["cache", "result"]
+    )
+)
+CACHE_HIT_RATIO = REGISTRY.register(
+    CallbackGauge("bfcl_cache_hit_ratio", "Ratio of cache lookups that hit, per cache.", ["cache"], _cache_hit_ratios)
+)
+EXEC_CALLS = REGISTRY.register(
+    Counter("bfcl_exec_calls_total", "Number of function calls executed by the executable checkers.", ["kind"])
+)
+MULTI_TURN_SESSIONS = REGISTRY.register(Gauge("bfcl_multi_turn_sessions", "Number of open multi-turn sessions."))
+MULTI_TURN_SESSION_EVICTIONS = REGISTRY.register(
+    Counter(
+        "bfcl_multi_turn_session_evictions_total",
+        "Number of multi-turn sessions evicted, per reason (ttl or capacity).",
+        ["reason"],
+    )
+)
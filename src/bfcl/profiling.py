@@ -0,0 +1,154 @@
+"""Timing instrumentation and sampling profiler for diagnosing hot paths.
+
+- `stage()` times a stage of the runners; the latency is always reported to the `/metrics` histogram and, when the
+  detailed timings are enabled, also recorded in `TIMINGS`.
+- `timed()` decorates checker functions; it only measures them when the detailed timings are enabled, so the disabled
+  overhead is a single flag check per call.
+- `SamplingProfiler` periodically samples the stacks of all threads and reports them as collapsed stacks, the input
+  format of flame graph tools.
+"""
+
+import functools
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+from bfcl.metrics import STAGE_LATENCY
+
+_timings_enabled = False
+
+
+def enable_timings(enabled: bool = True):
+    """Enable or disable the detailed timings."""
+    global _timings_enabled
+    _timings_enabled = enabled
+
+
+def timings_enabled() -> bool:
+    return _timings_enabled
+
+
+class TimingRecorder:
+    """Thread-safe count, total and maximum durations, keyed by name and category."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def record(self, name: str, elapsed: float, category: str | None = None):
+        key = (name, category)
+        with self._lock:
+            count, total, maximum = self._timings.get(key, (0, 0.0, 0.0))
+            self._timings[key] = (count + 1, total + elapsed, max(maximum, elapsed))
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Get the timings as `{name: {category: {"count", "total", "mean", "max"}}}`, in seconds."""
+        with self._lock:
+            timings = dict(self._timings)
+        snapshot = {}
+        for (name, category), (count, total, maximum) in sorted(timings.items(), key=lambda item: str(item[0])):
+            snapshot.setdefault(name, {})[category or "ALL"] = {
+                "count": count,
+                "total": total,
+                "mean": total / count,
+                "max": maximum,
+            }
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._timings = {}
+
+
+TIMINGS = TimingRecorder()
+
+
+@contextmanager
+def stage(name: str, category: str):
+    """Time a stage of the runners for the given `TestCategory` name."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.observe(elapsed, category=category, stage=name)
+        if _timings_enabled:
+            TIMINGS.record(f"runner.{name}", elapsed, category)
+
+
+def timed(func: Callable) -> Callable:
+    """Record the duration of every call to the decorated function when the detailed timings are enabled."""
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _timings_enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            TIMINGS.record(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+class SamplingProfiler:
+    """A sampling profiler of all threads of the process.
+
+    Only one profile runs at a time, since overlapping profiles would sample each other.
+
+    Args:
+        interval (float): The time in seconds between two samples.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_filename}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+    def profile(self, seconds: float) -> str | None:
+        """Sample the stacks of all other threads for the given duration.
+
+        Args:
+            seconds (float): The duration of the profile.
+
+        Returns:
+            The collapsed stacks as lines of `frame;frame;... count`, most frequent first, or None if another profile
+            is already running.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            current = threading.get_ident()
+            stacks = Counter()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id != current:
+                        stacks[self._collapse(frame)] += 1
+                time.sleep(self.interval)
+        finally:
+            self._lock.release()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def debug_timings(enable: bool | None = None, reset: bool = False) -> Dict[str, Any]:
+    """Optionally switch and reset the detailed timings, and return their state and snapshot."""
+    if enable is not None:
+        enable_timings(enable)
+    snapshot = TIMINGS.snapshot()
+    if reset:
+        TIMINGS.reset()
+    return {"enabled": _timings_enabled, "timings": snapshot}
@@ -1,58 +1,162 @@
 import argparse
 import json
 import logging
+import multiprocessing
+import os
+import zlib
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
 
-from bfcl.constants.category_mappings import TestCollection
+from bfcl.constants.category_mappings import TestCategory, TestCollection
+from bfcl.constants.config import JSONL_WRITE_BUFFER_SIZE, POSSIBLE_ANSWER_PATH, PROMPT_PATH
+from bfcl.eval.multi_turn.environment import function_descriptions
+from bfcl.utils.ops import extract_test_category, iter_jsonl, sort_key, to_json_line
+from bfcl.utils.tool_schemas import ToolSchemaStore
 
 logger = logging.getLogger(__name__)
 
 
-def build_prompt_dataset(categories: List[TestCollection]) -> List[Dict[str, Any]]:
+# The optional fields of the prompt samples: the function docs and all the turns of the question next to the prompt, and
+# the category, the language and the number of expected calls in the metainfo
+PROMPT_METADATA = ("functions", "turns", "category", "language", "num_expected_calls")
+
+
+def _ordered_test_categories(categories: List[TestCollection]) -> List[TestCategory]:
+    """Return the test categories of the collections once each, ordered as their ids are by `sort_key`.
+
+    The order of the collections does not matter, the samples of all the categories come in the order of their ids.
     """
-    Build a prompt dataset based on test categories.
+    test_categories = {test_category for category in categories for test_category in category.value[2]}
+    return sorted(test_categories, key=lambda test_category: extract_test_category(test_category.value[2]))
+
+
+def _num_expected_calls(test_category: TestCategory, ground_truth: Any) -> int | None:
+    """Return the number of calls expected from the ground truth of a sample, None if unknown."""
+    if test_category in TestCollection.IRRELEVANCE:
+        return 0
+    if test_category == TestCategory.REST:
+        return 1
+    if ground_truth is None:
+        return None
+    if test_category in TestCollection.MULTI_TURN:
+        return sum(len(turn) for turn in ground_truth)
+    return len(ground_truth)
+
+
+def _read_category(task: Tuple[TestCategory, Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    """Read the prompt samples of a test category, sorted by `sort_key`."""
+    test_category, metadata = task
+    file_path = Path(PROMPT_PATH) / test_category.value[2]
+    samples = []
+    try:
+        ground_truth = {}
+        if "num_expected_calls" in metadata and test_category.value[3]:
+            if test_category in TestCollection.EXECUTABLE:
+                ground_truth = {sample["id"]: sample["ground_truth"] for sample in iter_jsonl(file_path)}
+            else:
+                ground_truth = {
+                    sample["id"]: sample["ground_truth"]
+                    for sample in iter_jsonl(Path(POSSIBLE_ANSWER_PATH) / test_category.value[2])
+                }
+
+        for sample in iter_jsonl(file_path):
+            prompt_sample = {"metainfo": {"id": sample["id"]}, "prompt": sample["question"][0]}
+            if "functions" in metadata:
+                if test_category in TestCollection.MULTI_TURN:
+                    # the missed functions are only described at the turn they are added
+                    missed = [name for names in sample.get("missed_function", {}).values() for name in names]
+                    prompt_sample["functions"] = function_descriptions(sample["involved_classes"], missed)
+                else:
+                    prompt_sample["functions"] = sample["function"]
+            if "turns" in metadata:
+                prompt_sample["turns"] = sample["question"]
+            if "category" in metadata:
+                prompt_sample["metainfo"]["category"] = test_category.name
+            if "language" in metadata:
+                language = "python" if test_category in TestCollection.PYTHON else test_category.value[1]
+                prompt_sample["metainfo"]["language"] = language
+            if "num_expected_calls" in metadata:
+                num_expected_calls = _num_expected_calls(test_category, ground_truth.get(sample["id"]))
+                prompt_sample["metainfo"]["num_expected_calls"] = num_expected_calls
+
+            samples.append(prompt_sample)
+
+    except FileNotFoundError as e:
+        logger.warning(f"Warning: File {e.filename} not found. Skipping...")
+    except json.JSONDecodeError:
+        logger.warning(f"Warning: Error parsing JSON in {file_path}. Skipping...")
+    except (KeyError, IndexError) as e:
+        logger.warning(f"Warning: Error processing data in {file_path}: {e}. Skipping...")
+
+    samples.sort(key=lambda prompt_sample: sort_key(prompt_sample["metainfo"]))
+    return samples
+
+
+def iter_prompt_dataset(
+    categories: List[TestCollection], metadata: Sequence[str] = (), num_workers: int = 1
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the prompt samples of test categories, in a deterministic order.
+
+    The category files are parsed in parallel, and the samples are yielded category by category, ordered by `sort_key`
+    of their ids, so only the categories being parsed are held in memory. The categories come in the order of their ids
+    whatever the order of the collections, which may overlap.
 
     Args:
         categories: List of TestCollection categories to process
+        metadata: The optional fields to add to every sample, among `PROMPT_METADATA`
+        num_workers: The number of processes parsing the category files; 1 parses them in the current process
 
-    Returns:
-        List of prompt samples with metadata and content
+    Yields:
+        Prompt samples with metadata and content
     """
-    prompt_dataset = []
+    unknown = set(metadata) - set(PROMPT_METADATA)
+    if unknown:
+        raise ValueError(f"Unknown prompt metadata {sorted(unknown)}, expected some of {list(PROMPT_METADATA)}.")
 
-    all_test_categories = []
-    for category in categories:
-        all_test_categories.extend(category.value[2])
+    tasks = [(test_category, tuple(metadata)) for test_category in _ordered_test_categories(categories)]
+    if num_workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield from _read_category(task)
+        return
 
-    all_test_categories = list(set(all_test_categories))
+    with multiprocessing.Pool(processes=min(num_workers, len(tasks))) as pool:
+        for samples in pool.imap(_read_category, tasks):
+            yield from samples
 
-    data_dir = Path(__file__).parent / "data"
 
-    for test_category in all_test_categories:
-        filename = test_category.value[2]
-        file_path = data_dir / filename
+def build_prompt_dataset(
+    categories: List[TestCollection], metadata: Sequence[str] = (), num_workers: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Build a prompt dataset based on test categories.
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    if not line.strip():
-                        continue
+    Args:
+        categories: List of TestCollection categories to process
+        metadata: The optional fields to add to every sample, among `PROMPT_METADATA`
+        num_workers: The number of processes parsing the category files
 
-                    sample = json.loads(line)
+    Returns:
+        List of prompt samples with metadata and content, see `iter_prompt_dataset`
+    """
+    return list(iter_prompt_dataset(categories, metadata, num_workers))
 
-                    prompt_sample = {"metainfo": {"id": sample["id"]}, "prompt": sample["question"][0]}
 
-                    prompt_dataset.append(prompt_sample)
+def reference_tool_schemas(samples: Iterable[Dict[str, Any]], store: ToolSchemaStore) -> Iterator[Dict[str, Any]]:
+    """
+    Replace the function docs of prompt samples by references to their tool schemas, rendered once per unique doc.
 
-        except FileNotFoundError:
-            logger.warning(f"Warning: File {file_path} not found. Skipping...")
-        except json.JSONDecodeError:
-            logger.warning(f"Warning: Error parsing JSON in {file_path}. Skipping...")
-        except (KeyError, IndexError) as e:
-            logger.warning(f"Warning: Error processing data in {file_path}: {e}. Skipping...")
+    Args:
+        samples: The prompt samples, built with the `functions` metadata
+        store: The store the tool schemas are added to, to be saved next to the dataset
 
-    return prompt_dataset
+    Yields:
+        The prompt samples, with the digests of their function docs in `tools` instead of the docs
+    """
+    for sample in samples:
+        sample["tools"] = [store.add(func_doc) for func_doc in sample.pop("functions")]
+        yield sample
 
 
 def save_prompt_dataset(dataset: List[Dict[str, Any]], output_file: str) -> None:
@@ -67,6 +171,44 @@ def save_prompt_dataset(dataset: List[Dict[str, Any]], output_file: str) -> None
         json.dump(dataset, f, ensure_ascii=False, indent=2)
 
 
+def shard_index(id: str, num_shards: int) -> int:
+    """Return the shard of a sample, by a hash of its id that is stable across runs, processes and machines."""
+    return zlib.crc32(id.encode("utf-8")) % num_shards
+
+
+def shard_file(output_file: str, index: int, num_shards: int) -> str:
+    """Return the path of a shard of an output file, e.g. `prompts-00001-of-00004.jsonl`, or the file itself."""
+    if num_shards == 1:
+        return output_file
+    path = Path(output_file)
+    return str(path.with_name(f"{path.stem}-{index:05d}-of-{num_shards:05d}{path.suffix}"))
+
+
+def stream_prompt_dataset(samples: Iterable[Dict[str, Any]], output_file: str, num_shards: int = 1) -> List[int]:
+    """
+    Write prompt samples as JSON lines as they come, without holding the dataset in memory.
+
+    Args:
+        samples: The prompt samples to write, e.g. from `iter_prompt_dataset`
+        output_file: Path to the output file, or the base path of the shards if there are several
+        num_shards: The number of files to split the samples across, by `shard_index` of their id
+
+    Returns:
+        The number of samples written to every shard
+    """
+    counts = [0] * num_shards
+    with ExitStack() as stack:
+        files = []
+        for index in range(num_shards):
+            path = shard_file(output_file, index, num_shards)
+            files.append(stack.enter_context(open(path, "w", encoding="utf-8", buffering=JSONL_WRITE_BUFFER_SIZE)))
+        for sample in samples:
+            index = shard_index(sample["metainfo"]["id"], num_shards)
+            files[index].write(to_json_line(sample))
+            counts[index] += 1
+    return counts
+
+
 def main():
     """
     Main function to handle command line arguments and build the prompt dataset.
@@ -78,7 +220,10 @@ def main():
         nargs="+",
         choices=[category.name.lower() for category in TestCollection],
         required=True,
-        help="Specify one or more TestCollection categories to process ('all', 'single_turn', 'live', 'non_live', 'executable', 'non_python', 'python', 'python_ast', 'irrelevance')",
+        help=(
+            "Specify one or more TestCollection categories to process "
+            f"({', '.join(repr(category.name.lower()) for category in TestCollection)})"
+        ),
     )
 
     parser.add_argument(
@@ -88,7 +233,51 @@ def main():
         help="Path to save the output dataset (default: prompt_dataset.json)",
     )
 
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default=None,
+        help="Save the dataset as one JSON array, or stream it as JSON lines (default: jsonl for a .jsonl output)",
+    )
+
+    parser.add_argument(
+        "--num_shards",
+        "--num-shards",
+        type=int,
+        default=1,
+        help="Split the JSONL output across this many files by a stable hash of the ids (default: 1)",
+    )
+
+    parser.add_argument(
+        "--metadata",
+        nargs="*",
+        choices=PROMPT_METADATA,
+        default=[],
+        help="Optional fields to add to every sample (function docs, all the turns, category, language, and number of "
+        "expected calls)",
+    )
+
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes parsing the category files",
+    )
+
+    parser.add_argument(
+        "--tool_schemas",
+        type=str,
+        default=None,
+        help="Path to save the tool schemas of the unique function docs to, the samples then reference them by digest "
+        "in `tools` instead of holding the docs",
+    )
+
     args = parser.parse_args()
+    output_format = args.format or ("jsonl" if args.output.endswith(".jsonl") else "json")
+    if args.num_shards < 1:
+        parser.error("--num_shards must be at least 1")
+    if args.num_shards > 1 and output_format != "jsonl":
+        parser.error("--num_shards requires the jsonl format")
 
     categories = []
     for category_name in args.categories:
@@ -101,7 +290,33 @@ def main():
         logger.error("Error: No valid categories specified.")
         return
 
-    prompt_dataset = build_prompt_dataset(categories)
+    metadata = list(args.metadata)
+    store = None
+    if args.tool_schemas is not None:
+        store = ToolSchemaStore()
+        if "functions" not in metadata:
+            metadata.append("functions")
+
+    if output_format == "jsonl":
+        samples = iter_prompt_dataset(categories, metadata, args.num_workers)
+        if store is not None:
+            samples = reference_tool_schemas(samples, store)
+        counts = stream_prompt_dataset(samples, args.output, args.num_shards)
+        if store is not None:
+            store.save(args.tool_schemas)
+            logger.info(f"Tool schemas of {len(store)} unique function docs saved to {args.tool_schemas}")
+        logger.info(f"Successfully built prompt dataset with {sum(counts)} samples.")
+        for index, count in enumerate(counts):
+            logger.info(
+                f"Dataset shard with {count} samples saved to {shard_file(args.output, index, args.num_shards)}"
+            )
+        return
+
+    prompt_dataset = build_prompt_dataset(categories, metadata, args.num_workers)
+    if store is not None:
+        prompt_dataset = list(reference_tool_schemas(prompt_dataset, store))
+        store.save(args.tool_schemas)
+        logger.info(f"Tool schemas of {len(store)} unique function docs saved to {args.tool_schemas}")
 
     save_prompt_dataset(prompt_dataset, args.output)
 
@@ -0,0 +1,101 @@
+"""Leaderboard-style aggregation of scored results.
+
+The aggregator only keeps per-category counts, so results can be added, removed and replaced one at a time and the
+per-category, per-collection and overall accuracies are always up to date without recomputing from scratch.
+"""
+
+from typing import Any, Dict, Iterable
+
+from bfcl.constants.category_mappings import Category2CollectionMapping, TestCategory, TestCollection
+
+
+def _accuracy(total: int, correct: int) -> float:
+    return correct / total if total else 0.0
+
+
+class ScoreAggregator:
+    """The incremental aggregator of scored results.
+
+    A result is any dictionary with a `category` key (the `TestCategory` name, or None for unknown ids) and a
+    `correct` key, such as the per-item results of `bfcl-score` or the records of a result store.
+    """
+
+    def __init__(self):
+        self.category_totals = {category: 0 for category in TestCategory}
+        self.category_corrects = {category: 0 for category in TestCategory}
+        self.num_unknown = 0
+        self._category_to_collection = Category2CollectionMapping()
+
+    @classmethod
+    def from_results(cls, results: Iterable[Dict[str, Any]]) -> "ScoreAggregator":
+        """Build an aggregator from an iterable of results."""
+        aggregator = cls()
+        for result in results:
+            aggregator.add(result)
+        return aggregator
+
+    def add(self, result: Dict[str, Any]):
+        """Count a result."""
+        self._update(result, 1)
+
+    def remove(self, result: Dict[str, Any]):
+        """Uncount a result that was previously added."""
+        self._update(result, -1)
+
+    def replace(self, old_result: Dict[str, Any] | None, new_result: Dict[str, Any]):
+        """Replace a previously added result, e.g. after re-scoring a changed completion."""
+        if old_result is not None:
+            self.remove(old_result)
+        self.add(new_result)
+
+    def _update(self, result: Dict[str, Any], delta: int):
+        if result["category"] is None:
+            self.num_unknown += delta
+            return
+        category = TestCategory[result["category"]]
+        self.category_totals[category] += delta
+        self.category_corrects[category] += delta * int(result["correct"])
+
+    def summary(self) -> Dict[str, Any]:
+        """Compute the accuracies of the counted results.
+
+        Returns:
+            A dictionary with the following keys
+                - categories: the total, correct and accuracy of each category with results, along with the
+                  collection it is reported under.
+                - collections: the total, correct, accuracy (weighted by the number of results) and unweighted
+                  accuracy (averaged over categories) of each collection with results.
+                - overall: the accuracies over all categories.
+                - unknown_ids: the number of results whose id is not found.
+        """
+        summary = {"categories": {}, "collections": {}}
+        for category in TestCategory:
+            total, correct = self.category_totals[category], self.category_corrects[category]
+            if total:
+                summary["categories"][category.name] = {
+                    "total": total,
+                    "correct": correct,
+                    "accuracy": _accuracy(total, correct),
+                    "collection": self._category_to_collection.get_collection(category).name,
+                }
+
+        for collection in TestCollection:
+            categories = [category for category in collection.value[2] if self.category_totals[category]]
+            if not categories:
+                continue
+            total = sum(self.category_totals[category] for category in categories)
+            correct = sum(self.category_corrects[category] for category in categories)
+            summary["collections"][collection.name] = {
+                "total": total,
+                "correct": correct,
+                "accuracy": _accuracy(total, correct),
+                "unweighted_accuracy": sum(
+                    _accuracy(self.category_totals[category], self.category_corrects[category])
+                    for category in categories
+                )
+                / len(categories),
+            }
+
+        summary["overall"] = summary["collections"].get(TestCollection.ALL.name, {"total": 0, "correct": 0})
+        summary["unknown_ids"] = self.num_unknown
+        return summary
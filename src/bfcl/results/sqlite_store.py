@@ -0,0 +1,233 @@
+"""SQLite-backed persistent store of scored results.
+
+The store runs in WAL mode so that readers are never blocked by the writer, and all inserts go through a single
+background writer thread that commits them in batches. Records are keyed by `(run_id, id, completion_hash)`, so every
+distinct completion scored within a run is kept and can be looked up again instead of re-running the checkers.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ("run_id", "id", "category", "completion_hash", "formatted", "valid", "correct", "error_type", "scored_at")
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    category TEXT,
+    completion_hash TEXT NOT NULL,
+    formatted INTEGER NOT NULL,
+    valid INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    error_type TEXT,
+    scored_at REAL NOT NULL,
+    PRIMARY KEY (run_id, id, completion_hash)
+)
+"""
+
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM results"
+_INSERT = f"INSERT OR REPLACE INTO results ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+# Sentinel put on the queue to stop the writer thread
+_STOP = object()
+
+
+class SQLiteResultStore:
+    """The SQLite store of scored results.
+
+    Args:
+        path (str): The path of the SQLite database.
+        run_id (str): The default run the records are written to and queried from.
+        batch_size (int): The maximum number of records committed in one transaction.
+        flush_interval (float): The maximum time in seconds a record waits in the queue before being committed.
+    """
+
+    def __init__(self, path: str, run_id: str = "default", batch_size: int = 256, flush_interval: float = 1.0):
+        self.path = path
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(_CREATE_TABLE)
+        connection.execute("CREATE INDEX IF NOT EXISTS results_run_category ON results (run_id, category)")
+        connection.commit()
+        connection.close()
+
+        self._queue = queue.Queue()
+        # records queued but not yet committed, so that lookups see them immediately
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        # one read connection shared by all the threads, as the request handlers run on short-lived thread pools
+        self._read_connection = self._connect()
+        self._read_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-result-store-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _read(self, query: str, params=()) -> List[tuple]:
+        """Run a read query on the shared read connection, and fetch all its rows."""
+        with self._read_lock:
+            return self._read_connection.execute(query, params).fetchall()
+
+    def __enter__(self) -> "SQLiteResultStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    #### Writing ####
+    def put(self, record: Dict[str, Any], run_id: str | None = None):
+        """Queue a record for insertion; it replaces any record of the same run, id and completion hash."""
+        row = (
+            run_id or self.run_id,
+            record["id"],
+            record["category"],
+            record["completion_hash"],
+            int(record["formatted"]),
+            int(record["valid"]),
+            int(record["correct"]),
+            record["error_type"],
+            time.time(),
+        )
+        with self._pending_lock:
+            self._pending[row[0], row[1], row[3]] = row
+        self._queue.put(row)
+
+    def _write_loop(self):
+        connection = self._connect()
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is _STOP
+            rows = [row for row in batch if row is not _STOP]
+            if rows:
+                try:
+                    connection.executemany(_INSERT, rows)
+                    connection.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to write {len(rows)} results to {self.path}, error: {str(e)}")
+                with self._pending_lock:
+                    for row in rows:
+                        if self._pending.get((row[0], row[1], row[3])) is row:
+                            del self._pending[row[0], row[1], row[3]]
+            for _ in batch:
+                self._queue.task_done()
+        connection.close()
+
+    def flush(self):
+        """Block until all queued records are committed."""
+        self._queue.join()
+
+    def close(self):
+        """Commit the queued records and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._read_lock:
+            self._read_connection.close()
+
+    #### Reading ####
+    @staticmethod
+    def _to_record(row) -> Dict[str, Any]:
+        record = dict(zip(_COLUMNS, row))
+        for key in ("formatted", "valid", "correct"):
+            record[key] = bool(record[key])
+        return record
+
+    def lookup(self, id: str, completion_hash: str, run_id: str | None = None) -> Dict[str, Any] | None:
+        """Get the record of an already-scored completion, or None if it has not been scored in the run."""
+        run_id = run_id or self.run_id
+        with self._pending_lock:
+            row = self._pending.get((run_id, id, completion_hash))
+        if row is None:
+            rows = self._read(
+                f"{_SELECT} WHERE run_id = ? AND id = ? AND completion_hash = ?", (run_id, id, completion_hash)
+            )
+            row = rows[0] if rows else None
+        return None if row is None else self._to_record(row)
+
+    def get(self, id: str, run_id: str | None = None) -> Dict[str, Any] | None:
+        """Get the most recently scored record of an id, or None if it has not been scored in the run."""
+        self.flush()
+        rows = self._read(
+            f"{_SELECT} WHERE run_id = ? AND id = ? ORDER BY scored_at DESC LIMIT 1", (run_id or self.run_id, id)
+        )
+        return self._to_record(rows[0]) if rows else None
+
+    def records(self, run_id: str | None = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over all records of a run."""
+        self.flush()
+        with self._read_lock:
+            cursor = self._read_connection.execute(
+                f"{_SELECT} WHERE run_id = ? ORDER BY scored_at", (run_id or self.run_id,)
+            )
+
+        def iterate() -> Iterator[Dict[str, Any]]:
+            # the rows are fetched in batches, so that the other readers are not blocked for the whole iteration
+            while True:
+                with self._read_lock:
+                    rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    return
+                yield from map(self._to_record, rows)
+
+        return iterate()
+
+    def run_ids(self) -> List[str]:
+        """List the runs in the store."""
+        self.flush()
+        return [row[0] for row in self._read("SELECT DISTINCT run_id FROM results ORDER BY run_id")]
+
+    def category_accuracy(self, run_id: str | None = None) -> Dict[str, Dict[str, Any]]:
+        """Get the total, correct, and accuracy of every category in a run."""
+        self.flush()
+        rows = self._read(
+            "SELECT category, COUNT(*), SUM(correct) FROM results WHERE run_id = ? GROUP BY category ORDER BY category",
+            (run_id or self.run_id,),
+        )
+        return {
+            category: {"total": total, "correct": correct, "accuracy": correct / total}
+            for category, total, correct in rows
+        }
+
+    def error_breakdown(self, run_id: str | None = None, category: str | None = None) -> Dict[str, Dict[str, int]]:
+        """Count the error types of the incorrect records of a run, per category.
+
+        Args:
+            run_id (str): The run to query, defaults to the run of the store.
+            category (str): The `TestCategory` name to restrict the breakdown to, defaults to all categories.
+
+        Returns:
+            A dictionary from category names to dictionaries from error types to counts, most frequent first.
+        """
+        self.flush()
+        query = "SELECT category, error_type, COUNT(*) AS count FROM results WHERE run_id = ? AND correct = 0"
+        params = [run_id or self.run_id]
+        if category is not None:
+            query += " AND category = ?"
+            params.append(category)
+        query += " GROUP BY category, error_type ORDER BY category, count DESC"
+
+        breakdown = {}
+        for category_name, error_type, count in self._read(query, params):
+            breakdown.setdefault(category_name, {})[error_type] = count
+        return breakdown
@@ -0,0 +1,115 @@
+"""Persistent stores of scored results.
+
+A stored record summarises the scoring of one completion of an id:
+`{"id", "category", "completion_hash", "formatted", "valid", "correct", "error_type"}`.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterator
+
+from bfcl.utils.ops import to_json_line, write_jsonl
+
+logger = logging.getLogger(__name__)
+
+
+def make_record(result: Dict[str, Any], completion_hash: str) -> Dict[str, Any]:
+    """Make a store record from a per-item result of the runners."""
+    errors = result.get("errors") or []
+    return {
+        "id": result["id"],
+        "category": result["category"],
+        "completion_hash": completion_hash,
+        "formatted": result["formatted"],
+        "valid": result["valid"],
+        "correct": result["correct"],
+        "error_type": errors[0]["error_type"] if errors else None,
+    }
+
+
+def response_from_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a runner response from a store record, used to answer already-scored completions.
+
+    Only the error type is kept in the store, so the error messages and execution results are not restored.
+    """
+    return {
+        "formatted": record["formatted"],
+        "valid": record["valid"],
+        "correct": record["correct"],
+        "results": None,
+        "errors": [{"message": [], "error_type": record["error_type"]}] if record["error_type"] else [],
+    }
+
+
+class JsonlResultStore:
+    """An append-only JSONL store of scored results, keyed by id.
+
+    Every `put()` appends a line and the latest record of an id wins when the file is loaded again, so updating a
+    result never rewrites the file. Superseded lines are dropped by `compact()`. A trailing partial line, left behind by
+    an interrupted run, is truncated so that the next record is not appended to it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._records = {}
+        self.num_stale = 0
+        if os.path.exists(path):
+            valid_size = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_size += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping a corrupted line in {path}.")
+                        continue
+                    self.num_stale += record["id"] in self._records
+                    self._records[record["id"]] = record
+            if valid_size != os.path.getsize(path):
+                logger.warning(f"Truncating the partial last line of {path}.")
+                with open(path, "rb+") as f:
+                    f.truncate(valid_size)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __enter__(self) -> "JsonlResultStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, id: str) -> Dict[str, Any] | None:
+        """Get the latest record of the given id, or None if it has not been scored."""
+        return self._records.get(id)
+
+    def put(self, record: Dict[str, Any]):
+        """Store a record, superseding the previous record of its id."""
+        self.num_stale += record["id"] in self._records
+        self._records[record["id"]] = record
+        self._file.write(to_json_line(record))
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the latest record of every id."""
+        return iter(self._records.values())
+
+    def compact(self):
+        """Rewrite the file with only the latest record of every id."""
+        self._file.close()
+        tmp_path = f"{self.path}.tmp"
+        write_jsonl(tmp_path, self._records.values())
+        os.replace(tmp_path, self.path)
+        self.num_stale = 0
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
@@ -10,12 +10,29 @@ from bfcl.constants.category_mappings import TestCategory, TestCollection
 from bfcl.constants.id_mapper import IDMapper
 from bfcl.eval.ast.checkers import ast_checker
 from bfcl.eval.exec.checkers import executable_checker_non_rest, executable_checker_rest
-from bfcl.schemas.responses import ASTRunTimeError, BaseResponse
+from bfcl.eval.multi_turn.checkers import multi_turn_checker
+from bfcl.eval.multi_turn.trajectories import GROUND_TRUTH_TRAJECTORIES
+from bfcl.metrics import TOOL_CALLS
+from bfcl.profiling import stage
+from bfcl.schemas.responses import ASTRunTimeError, BaseResponse, ExecutionError
 from bfcl.schemas.tool_calls import ToolCallList
+from bfcl.utils.ops import pass_at_k
 
 logger = logging.getLogger(__name__)
 
 
+def _tool_calls_key(tool_calls: ToolCallList | List[str] | str | None) -> str | None:
+    """Return a canonical key of decoded tool calls, or None if they cannot be keyed."""
+    try:
+        if isinstance(tool_calls, ToolCallList):
+            return json.dumps(tool_calls.model_dump(), sort_keys=True, default=str)
+        if isinstance(tool_calls, list):
+            return json.dumps(tool_calls)
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
 class BaseRunner(ABC):
     """The base class for all runners."""
 
@@ -47,6 +64,11 @@ class BaseRunner(ABC):
             TestCategory.JAVA: self.run_ast_calls,
             TestCategory.JAVASCRIPT: self.run_ast_calls,
             TestCategory.REST: self.run_executable_calls,
+            # multi-turn
+            TestCategory.MULTI_TURN_BASE: self.run_multi_turn_calls,
+            TestCategory.MULTI_TURN_MISS_FUNC: self.run_multi_turn_calls,
+            TestCategory.MULTI_TURN_MISS_PARAM: self.run_multi_turn_calls,
+            TestCategory.MULTI_TURN_LONG_CONTEXT: self.run_multi_turn_calls,
         }
 
     @abstractmethod
@@ -127,6 +149,13 @@ class BaseRunner(ABC):
         response = BaseResponse()
         _, __ = id, category
 
+        if not isinstance(tool_calls, list) or not tool_calls:
+            return BaseResponse(
+                valid=False,
+                correct=False,
+                errors=[ExecutionError(message=["Failed to decode the completion into a list of function calls."])],
+            )
+
         ground_truth = self.id_mapper.get_ground_truth(id)
 
         if category == TestCategory.REST:
@@ -160,7 +189,8 @@ class BaseRunner(ABC):
                 category_name=category.value[1],
             )
         except Exception as e:
-            logger.info(f"Failed to run AST tool calls: {tool_calls}, error: {str(e)}")
+            # NOTE: lazy formatting, the tool calls are only rendered if the record is emitted
+            logger.info("Failed to run AST tool calls: %s, error: %s", tool_calls, e)
             return BaseResponse(
                 errors=[ASTRunTimeError(message=["AST checker failed for unknown reason."])],
                 results=None,
@@ -168,6 +198,25 @@ class BaseRunner(ABC):
 
         return checker_result
 
+    def run_multi_turn_calls(self, id: str, tool_calls: List[Any] | None, category: TestCategory) -> BaseResponse:
+        """Run the tool calls for the multi-turn categories.
+
+        Args:
+            tool_calls (List[Any]): The calls of every turn, a list of calls or of steps of calls per turn.
+
+        Returns:
+            A `BaseResponse` object
+        """
+        entry = self.id_mapper.get_multi_turn_entry(id)
+        return multi_turn_checker(
+            tool_calls,
+            self.id_mapper.get_ground_truth(id),
+            entry["initial_config"],
+            entry["involved_classes"],
+            entry["long_context"],
+            ground_truth=GROUND_TRUTH_TRAJECTORIES.get(id, self.id_mapper),
+        )
+
     def run(self, id: str, completion: str) -> BaseResponse:
         """Run the tool call provided.
 
@@ -178,37 +227,113 @@ class BaseRunner(ABC):
         Returns:
             A `BaseResponse` object
         """
-        response = BaseResponse()
-
         # get the category
         category = self.id_mapper.get_category(id)
         if category is None:
+            response = BaseResponse()
             response.errors[0].message = [f"Category for id {id} is not found."]
             return response.model_dump()
 
+        TOOL_CALLS.inc(category=category.name)
+        return self._serialize(self._check(id, completion, category), category)
+
+    def run_samples(self, id: str, completions: List[str], k: List[int] | None = None) -> Dict[str, Any]:
+        """Run the tool calls of several sampled completions of the same id together.
+
+        The identical completions are checked once, and so are the completions that decode into the same tool calls,
+        while the function description and the normalized possible answers of the id are shared across the samples.
+
+        Args:
+            id (str): The id of the question the completions were sampled for.
+            completions (List[str]): The sampled completions.
+            k (List[int]): The values of k to estimate pass@k for, 1 and the number of samples by default.
+
+        Returns:
+            A dictionary with the response of each sample under `results`, in the order of the completions, and the
+            summary statistics of the samples.
+        """
+        category = self.id_mapper.get_category(id)
+        if category is None:
+            response = BaseResponse()
+            response.errors[0].message = [f"Category for id {id} is not found."]
+            return {"id": id, "category": None, "results": [response.model_dump()] * len(completions)}
+
+        TOOL_CALLS.inc(amount=len(completions), category=category.name)
+        responses, checked = {}, {}
+        for completion in completions:
+            if completion not in responses:
+                responses[completion] = self._serialize(self._check(id, completion, category, checked), category)
+        results = [responses[completion] for completion in completions]
+
+        num_samples = len(results)
+        num_correct = sum(bool(result["correct"]) for result in results)
+        k = sorted({1, num_samples, *(value for value in k or [] if 0 < value <= num_samples)}) if num_samples else []
+        return {
+            "id": id,
+            "category": category.name,
+            "results": results,
+            "num_samples": num_samples,
+            "num_unique_completions": len(responses),
+            "num_checked": len(checked),
+            "num_correct": num_correct,
+            "accuracy": num_correct / num_samples if num_samples else 0.0,
+            "pass_at_k": {str(value): pass_at_k(num_samples, num_correct, value) for value in k},
+        }
+
+    def _check(
+        self, id: str, completion: str, category: TestCategory, checked: Dict[str, BaseResponse] | None = None
+    ) -> BaseResponse:
+        """Validate, decode and check a completion.
+
+        Args:
+            id (str): The id of the question to run the tool call for.
+            completion (str): The completion to run the tool call for.
+            category (TestCategory): The category of the id.
+            checked (Dict[str, BaseResponse]): The responses of the handler by decoded tool calls, shared by the
+                samples of the id so that the tool calls are checked once.
+
+        Returns:
+            A `BaseResponse` object
+        """
+        response = BaseResponse()
+
         # validate the tool call format for non-irrelevance categories
         if not category in TestCollection.IRRELEVANCE + TestCollection.EXECUTABLE:
-            response.formatted = self.validate_raw_completion_format(completion)
+            with stage("validate", category.name):
+                response.formatted = self.validate_raw_completion_format(completion)
             if not response.formatted:
-                return response.model_dump()
+                return response
         response.formatted = True
 
         # decode the tool calls
-        tool_calls = self.decode_tool_calls(completion, category)
+        with stage("decode", category.name):
+            tool_calls = self.decode_tool_calls(completion, category)
 
         # run the tool calls
         handler = self.category_handlers.get(category)
         if handler is None:
             response.errors[0].message = [f"Handler for category {category} is not supported yet."]
-            return response.model_dump()
+            return response
 
-        category_response = handler(id, tool_calls, category)
+        key = _tool_calls_key(tool_calls) if checked is not None else None
+        if key is not None and key in checked:
+            category_response = checked[key]
+        else:
+            with stage("checker", category.name):
+                category_response = handler(id, tool_calls, category)
+            if key is not None:
+                checked[key] = category_response
 
         response.valid = category_response.valid
         response.correct = category_response.correct
         response.results = category_response.results
         response.errors = category_response.errors
-        return response.model_dump()
+        return response
+
+    def _serialize(self, response: BaseResponse, category: TestCategory) -> Dict[str, Any]:
+        """Dump the response of a tool call, timing the serialization stage of its category."""
+        with stage("serialization", category.name):
+            return response.model_dump()
 
     def get_category(self, id: str) -> str:
         """Get the category for a given id.
@@ -251,7 +376,7 @@ class PlainJsonRunner(BaseRunner):
         """
         if category in TestCollection.IRRELEVANCE:
             return completion  # for rest category, the completion is an eval() python code
-        elif category in TestCollection.EXECUTABLE:
+        elif category in TestCollection.EXECUTABLE + TestCollection.MULTI_TURN:
             try:
                 tool_calls = json.loads(completion)
                 return tool_calls
@@ -85,11 +85,41 @@ class WrongFunctionNameError(BaseError):
     error_type: str = "simple_function_checker:wrong_func_name"
 
 
+class MultiTurnFormatError(BaseError):
+    message: List[str] = ["The completion is not a list of turns of function calls."]
+    error_type: str = "multi_turn:wrong_format"
+
+
+class MultiTurnTurnCountMismatchError(BaseError):
+    message: List[str] = ["The number of turns does not match the ground truth."]
+    error_type: str = "multi_turn:wrong_turn_count"
+
+
+class MultiTurnEmptyTurnError(BaseError):
+    message: List[str] = ["The model response of a turn is empty."]
+    error_type: str = "multi_turn:empty_turn_model_response"
+
+
+class MultiTurnStateMismatchError(BaseError):
+    message: List[str] = ["The state of the model instance does not match the ground truth instance."]
+    error_type: str = "multi_turn:instance_state_mismatch"
+
+
+class MultiTurnResponseMismatchError(BaseError):
+    message: List[str] = ["The execution results do not include the ground truth results."]
+    error_type: str = "multi_turn:execution_response_mismatch"
+
+
 class NullCategoryError(BaseError):
     message: List[str] = ["Category is not found."]
     error_type: str = "runner:null_category"
 
 
+class RunnerRunTimeError(BaseError):
+    message: List[str] = ["Runner failed for unknown reason."]
+    error_type: str = "runner:runtime_error"
+
+
 class BaseResponse(BaseModel):
     formatted: bool = Field(default=False, description="Whether a completion is of the correct format")
     valid: bool = Field(default=False, description="Whether all tool calls are of the correct format")
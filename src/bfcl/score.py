@@ -0,0 +1,302 @@
+"""Offline batch scoring of model completions.
+
+Reads a JSONL file of `{"id": ..., "completion": ...}` records, scores them with a pool of `PlainJsonRunner`
+processes, and writes per-item results together with per-category and per-collection accuracy summaries. Unlike the
+`bfcl` server, no HTTP or JSON framing is involved, which makes it the preferred entry for full-leaderboard runs. The
+ground truth trajectories of the multi-turn entries are executed once, in the parent process, and inherited by the
+workers.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+from typing import Any, Dict, Iterable, Iterator, Set, Tuple
+
+from tqdm import tqdm
+
+from bfcl.eval.multi_turn.trajectories import GROUND_TRUTH_TRAJECTORIES
+from bfcl.results.aggregator import ScoreAggregator
+from bfcl.results.sqlite_store import SQLiteResultStore
+from bfcl.results.store import JsonlResultStore, make_record
+from bfcl.runners import PlainJsonRunner
+from bfcl.schemas.responses import BaseResponse, NullCategoryError, RunnerRunTimeError
+from bfcl.utils.ops import hash_completion, iter_jsonl, to_json_line
+
+logger = logging.getLogger(__name__)
+
+# The runner of the current process. It is built once in the parent process so that forked workers inherit the loaded
+# `IDMapper` instead of re-reading the data files.
+_runner: PlainJsonRunner | None = None
+
+
+def _init_worker():
+    global _runner
+    if _runner is None:
+        _runner = PlainJsonRunner()
+
+
+def _warm_ground_truth(ids: Iterable[str] | None = None):
+    """Execute the multi-turn ground truth trajectories of the ids, all by default, in the current process.
+
+    Called in the parent process before the pool is started, so that the forked workers inherit the cached
+    trajectories instead of each executing them again.
+    """
+    id_mapper = _runner.id_mapper
+    GROUND_TRUTH_TRAJECTORIES.warm(id_mapper.id_to_multi_turn_entry if ids is None else ids, id_mapper)
+
+
+def _score_record(item: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Score a single `(index, record)` pair with the runner of the current process."""
+    index, record = item
+    id = record["id"]
+    completion_hash = hash_completion(record["completion"])
+    category = _runner.id_mapper.id_to_category.get(id)
+    if category is None:
+        response = BaseResponse(errors=[NullCategoryError(message=[f"Category for id {id} is not found."])])
+        return {"index": index, "id": id, "category": None, "completion_hash": completion_hash, **response.model_dump()}
+
+    try:
+        response = _runner.run(id, record["completion"])
+    except Exception as e:
+        logger.info(f"Failed to score id {id}, error: {str(e)}")
+        response = BaseResponse(errors=[RunnerRunTimeError(message=[f"Runner failed: {str(e)}"])]).model_dump()
+    return {"index": index, "id": id, "category": category.name, "completion_hash": completion_hash, **response}
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """Parse a shard specification of the form `i/n`.
+
+    Args:
+        shard (str): The shard specification, e.g. `0/4` for the first of four shards.
+
+    Returns:
+        A `(shard_index, num_shards)` tuple.
+    """
+    try:
+        index, num_shards = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard specification: {shard}, expected the form `i/n`.")
+    if num_shards <= 0 or not 0 <= index < num_shards:
+        raise ValueError(f"Invalid shard specification: {shard}, expected 0 <= i < n.")
+    return index, num_shards
+
+
+def iter_records(input_file: str, shard_index: int = 0, num_shards: int = 1) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Iterate over the `(index, record)` pairs of the given shard of a JSONL file.
+
+    The index is the position of the record among the non-empty lines of the file, so that it is stable across
+    shards and resumed runs.
+    """
+    index = 0
+    with open(input_file, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            if index % num_shards == shard_index:
+                record = json.loads(line)
+                if "id" not in record or "completion" not in record:
+                    raise ValueError(f"Record at line {line_number} of {input_file} must have `id` and `completion`.")
+                yield index, record
+            index += 1
+
+
+def load_scored_indices(output_file: str) -> Set[int]:
+    """Load the indices already scored in an output file.
+
+    A trailing partial line, left behind by an interrupted run, is truncated so that new results can be appended.
+    """
+    if not os.path.exists(output_file):
+        return set()
+
+    scored_indices = set()
+    valid_size = 0
+    with open(output_file, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            valid_size += len(line)
+            if line.strip():
+                scored_indices.add(json.loads(line)["index"])
+
+    if valid_size != os.path.getsize(output_file):
+        logger.warning(f"Truncating the partial last line of {output_file}.")
+        with open(output_file, "rb+") as f:
+            f.truncate(valid_size)
+    return scored_indices
+
+
+def summarize(output_file: str) -> Dict[str, Any]:
+    """Compute the per-category and per-collection accuracy of the results in an output file."""
+    return ScoreAggregator.from_results(iter_jsonl(output_file)).summary()
+
+
+def score_file(
+    input_file: str,
+    output_file: str,
+    num_workers: int = 8,
+    shard: str = "0/1",
+    resume: bool = False,
+    chunksize: int = 16,
+    result_db: SQLiteResultStore | None = None,
+) -> Dict[str, Any]:
+    """Score the completions of a JSONL file and write the per-item results to `output_file`.
+
+    Args:
+        input_file (str): The JSONL file of `{"id": ..., "completion": ...}` records.
+        output_file (str): The JSONL file to write the per-item results to.
+        num_workers (int): The number of scoring processes; 1 scores in the current process.
+        shard (str): The shard of the input to score, in the form `i/n`.
+        resume (bool): Whether to skip the records already scored in `output_file`.
+        chunksize (int): The number of records sent to a worker at once.
+        result_db (SQLiteResultStore): The optional SQLite store to also record the results in.
+
+    Returns:
+        The accuracy summary of all results in `output_file`.
+    """
+    shard_index, num_shards = parse_shard(shard)
+    scored_indices = load_scored_indices(output_file) if resume else set()
+    if scored_indices:
+        logger.info(f"Resuming from {len(scored_indices)} results already in {output_file}.")
+    records = (
+        (index, record)
+        for index, record in iter_records(input_file, shard_index, num_shards)
+        if index not in scored_indices
+    )
+
+    _init_worker()
+    with open(output_file, "a" if resume else "w", encoding="utf-8") as f:
+        if num_workers <= 1:
+            results = map(_score_record, records)
+            _write_results(f, results, result_db)
+        else:
+            _warm_ground_truth()
+            with multiprocessing.Pool(processes=num_workers, initializer=_init_worker) as pool:
+                results = pool.imap(_score_record, records, chunksize=chunksize)
+                _write_results(f, results, result_db)
+
+    return summarize(output_file)
+
+
+def rescore_file(
+    input_file: str,
+    store_file: str,
+    num_workers: int = 8,
+    shard: str = "0/1",
+    chunksize: int = 16,
+    result_db: SQLiteResultStore | None = None,
+) -> Dict[str, Any]:
+    """Incrementally score the completions of a JSONL file against a persistent result store.
+
+    Only the ids whose completion is new or has changed since it was stored are re-scored; the aggregates of the
+    unchanged ids are carried over from the store and updated with the new results.
+
+    Args:
+        input_file (str): The JSONL file of `{"id": ..., "completion": ...}` records, one completion per id.
+        store_file (str): The JSONL result store to read and update.
+        num_workers (int): The number of scoring processes; 1 scores in the current process.
+        shard (str): The shard of the input to score, in the form `i/n`.
+        chunksize (int): The number of records sent to a worker at once.
+        result_db (SQLiteResultStore): The optional SQLite store to also record the re-scored results in.
+
+    Returns:
+        The accuracy summary of all results in the store.
+    """
+    shard_index, num_shards = parse_shard(shard)
+    with JsonlResultStore(store_file) as store:
+        aggregator = ScoreAggregator.from_results(store.records())
+
+        # the last completion of an id wins if the input has several
+        changed_records = {}
+        for index, record in iter_records(input_file, shard_index, num_shards):
+            stored = store.get(record["id"])
+            if stored is not None and stored["completion_hash"] == hash_completion(record["completion"]):
+                changed_records.pop(record["id"], None)
+                continue
+            changed_records[record["id"]] = (index, record)
+        changed_records = list(changed_records.values())
+        logger.info(f"Re-scoring {len(changed_records)} changed completions, {len(store)} results already stored.")
+
+        _init_worker()
+        if num_workers <= 1:
+            results = map(_score_record, changed_records)
+            _store_results(store, aggregator, results, result_db)
+        else:
+            _warm_ground_truth(record["id"] for _, record in changed_records)
+            with multiprocessing.Pool(processes=num_workers, initializer=_init_worker) as pool:
+                results = pool.imap(_score_record, changed_records, chunksize=chunksize)
+                _store_results(store, aggregator, results, result_db)
+
+        if store.num_stale > len(store):
+            store.compact()
+
+    return aggregator.summary()
+
+
+def _store_results(
+    store: JsonlResultStore,
+    aggregator: ScoreAggregator,
+    results: Iterator[Dict[str, Any]],
+    result_db: SQLiteResultStore | None,
+):
+    for result in tqdm(results, desc="Re-scoring"):
+        record = make_record(result, result["completion_hash"])
+        aggregator.replace(store.get(record["id"]), record)
+        store.put(record)
+        if result_db is not None:
+            result_db.put(record)
+
+
+def _write_results(f, results: Iterator[Dict[str, Any]], result_db: SQLiteResultStore | None):
+    for result in tqdm(results, desc="Scoring"):
+        f.write(to_json_line(result))
+        if result_db is not None:
+            result_db.put(make_record(result, result["completion_hash"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score model completions offline with the BFCL runners")
+    parser.add_argument("--input", required=True, help="JSONL file of {id, completion} records")
+    output_group = parser.add_mutually_exclusive_group(required=True)
+    output_group.add_argument("--output", help="JSONL file to write the per-item results to")
+    output_group.add_argument(
+        "--store",
+        help="JSONL result store to update incrementally; only new or changed completions are re-scored",
+    )
+    parser.add_argument(
+        "--summary",
+        default=None,
+        help="JSON file to write the accuracy summary to (default: <output or store>_summary.json)",
+    )
+    parser.add_argument("--num_workers", type=int, default=os.cpu_count() or 1, help="Number of scoring processes")
+    parser.add_argument("--shard", default="0/1", help="Shard of the input to score, in the form i/n (default: 0/1)")
+    parser.add_argument("--resume", action="store_true", help="Skip the records already scored in the output file")
+    parser.add_argument("--chunksize", type=int, default=16, help="Number of records sent to a worker at once")
+    parser.add_argument("--result_db", default=None, help="SQLite database to also record the scored results in")
+    parser.add_argument("--run_id", default="default", help="Run to record the results under in the result database")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    result_db = SQLiteResultStore(args.result_db, run_id=args.run_id) if args.result_db else None
+    try:
+        if args.store:
+            summary = rescore_file(args.input, args.store, args.num_workers, args.shard, args.chunksize, result_db)
+        else:
+            summary = score_file(
+                args.input, args.output, args.num_workers, args.shard, args.resume, args.chunksize, result_db
+            )
+    finally:
+        if result_db is not None:
+            result_db.close()
+
+    results_file = args.store or args.output
+    summary_file = args.summary or f"{os.path.splitext(results_file)[0]}_summary.json"
+    with open(summary_file, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    logger.info(f"Results saved to {results_file}, summary saved to {summary_file}")
+
+
+if __name__ == "__main__":
+    main()
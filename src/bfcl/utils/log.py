@@ -0,0 +1,108 @@
+"""Queue-based structured logging for the server.
+
+Records are put on an in-memory queue by the request threads and written to the handlers by a background
+`QueueListener` thread, so that requests never block on disk writes. Records are formatted as JSON lines only when the
+listener emits them, and payloads are wrapped in `Payload` so that their (truncated) representation is built lazily.
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import reprlib
+from datetime import datetime, timezone
+from typing import Any, List
+
+# The id of the request being handled, attached to every record emitted while handling it
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+# Attributes of every `LogRecord`, anything else on a record comes from `extra`
+_RECORD_ATTRIBUTES = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+
+
+class Payload:
+    """A lazily rendered, truncated representation of a request or response payload.
+
+    Args:
+        value (Any): The payload to log.
+        max_chars (int): The maximum length of the rendered payload.
+    """
+
+    _repr = reprlib.Repr()
+    _repr.maxlevel = 4
+    _repr.maxlist = 8
+    _repr.maxdict = 16
+    _repr.maxstring = 256
+    _repr.maxother = 256
+
+    def __init__(self, value: Any, max_chars: int = 2048):
+        self.value = value
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        rendered = self._repr.repr(self.value)
+        if len(rendered) > self.max_chars:
+            rendered = rendered[: self.max_chars] + "..."
+        return rendered
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the id of the current request to the records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """A `QueueHandler` that enqueues records as they are, leaving the formatting to the listener thread.
+
+    The default `prepare()` formats the message in the calling thread, which is exactly the cost to move off the
+    request path. Records never leave the process, so they do not need to be made picklable.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON lines, including the fields passed in `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_queue_logging(handlers: List[logging.Handler], level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Route the records of the root logger through a queue to the given handlers.
+
+    Args:
+        handlers (List[logging.Handler]): The handlers written to by the background listener.
+        level (int): The level of the root logger.
+
+    Returns:
+        The started `QueueListener`, to be stopped on shutdown to flush the queued records.
+    """
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -4,13 +4,15 @@ The utility functions for the evaluation.
 Reference: https://github.com/ShishirPatil/gorilla/blob/main/berkeley-function-call-leaderboard/bfcl/utils.py
 """
 
+import hashlib
 import json
 import os
 import re
 from pathlib import Path
-from typing import Union
+from typing import Any, Iterable, Iterator, Union
 
 from bfcl.constants.category_mappings import TEST_COLLECTION_MAPPING, TEST_FILE_MAPPING, VERSION_PREFIX
+from bfcl.constants.config import JSONL_WRITE_BUFFER_SIZE
 
 
 def extract_test_category(input_string: Union[str, Path]) -> str:
@@ -72,12 +74,52 @@ def is_sql(test_category):
     return "sql" in test_category
 
 
+def iter_jsonl(file_path: Union[str, Path]) -> Iterator[Any]:
+    """Iterate over the records of a JSONL file one line at a time, skipping the empty lines.
+
+    Only the current line is held in memory, whatever the size of the file.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def to_json_line(value: Any, ensure_ascii: bool = False) -> str:
+    """Serialize a record as a JSON line, converting the values that are not JSON serializable to strings.
+
+    The record is serialized in one pass, and only converted with `make_json_serializable` if that fails.
+    """
+    try:
+        return json.dumps(value, ensure_ascii=ensure_ascii) + "\n"
+    except (TypeError, ValueError):
+        return json.dumps(make_json_serializable(value), ensure_ascii=ensure_ascii) + "\n"
+
+
+def write_jsonl(
+    file_path: Union[str, Path], records: Iterable[Any], mode: str = "w", ensure_ascii: bool = False
+) -> int:
+    """Write records to a JSONL file as they come, through a large write buffer.
+
+    Args:
+        file_path (Union[str, Path]): The JSONL file.
+        records (Iterable[Any]): The records, e.g. from a generator, which is consumed without being materialized.
+        mode (str): `w` to overwrite the file, or `a` to append to it.
+        ensure_ascii (bool): Whether to escape the non-ASCII characters.
+
+    Returns:
+        The number of records written.
+    """
+    num_records = 0
+    with open(file_path, mode, encoding="utf-8", buffering=JSONL_WRITE_BUFFER_SIZE) as f:
+        for record in records:
+            f.write(to_json_line(record, ensure_ascii))
+            num_records += 1
+    return num_records
+
+
 def load_file(file_path, sort_by_id=False):
-    result = []
-    with open(file_path) as f:
-        file = f.readlines()
-        for line in file:
-            result.append(json.loads(line))
+    result = list(iter_jsonl(file_path))
 
     if sort_by_id:
         result.sort(key=sort_key)
@@ -92,15 +134,8 @@ def write_list_of_dicts_to_file(filename, data, subdir=None):
         # Construct the full path to the file
         filename = os.path.join(subdir, filename)
 
-    # Write the list of dictionaries to the file in JSON format
-    with open(filename, "w") as f:
-        for i, entry in enumerate(data):
-            # Go through each key-value pair in the dictionary to make sure the values are JSON serializable
-            entry = make_json_serializable(entry)
-            json_str = json.dumps(entry)
-            f.write(json_str)
-            if i < len(data) - 1:
-                f.write("\n")
+    # Write the list of dictionaries to the file in JSON format, the values that are not JSON serializable as strings
+    write_jsonl(filename, data, ensure_ascii=True)
 
 
 def make_json_serializable(value):
@@ -119,6 +154,13 @@ def make_json_serializable(value):
             return str(value)
 
 
+def hash_completion(completion: Any) -> str:
+    """Return a stable content hash of a model completion, used to detect changed completions."""
+    if not isinstance(completion, str):
+        completion = json.dumps(completion, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(completion.encode("utf-8")).hexdigest()
+
+
 def sort_key(entry):
     """
     Index comes in two forms: TestCategory_Index or TestCategory_Index-FuncDocSubIndex-PromptSubIndex; both 0-indexed.
@@ -224,3 +266,26 @@ def parse_test_category_argument(test_category_args):
             raise Exception(f"Invalid test category name provided: {test_category}")
 
     return sorted(list(test_filename_total)), sorted(list(test_name_total))
+
+
+def pass_at_k(num_samples: int, num_correct: int, k: int) -> float:
+    """Estimate pass@k, the probability that at least one of k samples drawn out of `num_samples` is correct.
+
+    This is the unbiased estimator `1 - C(n - c, k) / C(n, k)`, computed as a product for numerical stability.
+
+    Args:
+        num_samples (int): The number of samples n.
+        num_correct (int): The number of correct samples c.
+        k (int): The number of drawn samples, at most n.
+
+    Returns:
+        The estimated pass@k.
+    """
+    if not 0 < k <= num_samples:
+        raise ValueError(f"k must be between 1 and the number of samples {num_samples}, got {k}")
+    if num_samples - num_correct < k:
+        return 1.0
+    failure = 1.0
+    for i in range(num_samples - num_correct + 1, num_samples + 1):
+        failure *= 1.0 - k / i
+    return 1.0 - failure
@@ -0,0 +1,180 @@
+"""
+The tool schemas of the BFCL function docs, rendered once per unique function doc.
+
+The model handlers convert the function docs of every prompt to the tool format they send to the model, while the same
+docs come up across many prompts. The renderings are instead computed once per unique doc, in every format, and stored
+by the digest of the doc so that the prompts only reference them.
+
+Reference: https://github.com/ShishirPatil/gorilla/blob/main/berkeley-function-call-leaderboard/bfcl/model_handler/
+utils.py
+"""
+
+import hashlib
+import json
+import keyword
+import re
+from typing import Any, Dict, Iterable, List
+
+from bfcl.constants.type_mappings import GORILLA_TO_OPENAPI, GORILLA_TO_PYTHON
+
+# The formats of the tool schemas: OpenAI tools, the JSON of the function doc as prompted to the models, and a python
+# function signature with its docstring
+TOOL_SCHEMA_FORMATS = ("openai", "json", "python")
+
+
+def function_doc_digest(func_doc: Dict[str, Any]) -> str:
+    """Return the content address of a function doc.
+
+    The order of the keys is part of the content, as the order of the parameters is part of the renderings.
+    """
+    canonical = json.dumps(func_doc, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _openai_parameter(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert the schema of a parameter to the OpenAPI types, the unknown types are taken as strings."""
+    schema = dict(schema)
+    var_type = schema.get("type")
+    schema["type"] = GORILLA_TO_OPENAPI.get(var_type, "string")
+    if var_type == "float":
+        schema["format"] = "float"
+    if isinstance(schema.get("properties"), dict):
+        schema["properties"] = {name: _openai_parameter(value) for name, value in schema["properties"].items()}
+    if isinstance(schema.get("items"), dict):
+        schema["items"] = _openai_parameter(schema["items"])
+    return schema
+
+
+def _tool_name(name: str) -> str:
+    """Return the name of a function as a tool, whose names may not contain dots."""
+    return name.replace(".", "_")
+
+
+def to_openai_tool(func_doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a function doc as an OpenAI tool."""
+    parameters = _openai_parameter(func_doc.get("parameters", {}))
+    parameters["type"] = "object"
+    parameters.setdefault("properties", {})
+    function = {"name": _tool_name(func_doc["name"]), "description": func_doc.get("description", "")}
+    function["parameters"] = parameters
+    return {"type": "function", "function": function}
+
+
+def to_json(func_doc: Dict[str, Any]) -> str:
+    """Render a function doc as the JSON the prompting models read."""
+    return json.dumps(func_doc, ensure_ascii=False)
+
+
+def _python_type(schema: Dict[str, Any]) -> str:
+    python_type = GORILLA_TO_PYTHON.get(schema.get("type"), "Any")
+    items = schema.get("items")
+    if python_type == "list" and isinstance(items, dict):
+        return f"list[{_python_type(items)}]"
+    if python_type == "tuple" and isinstance(items, dict):
+        return f"tuple[{_python_type(items)}, ...]"
+    return python_type
+
+
+def _python_identifier(name: str) -> str:
+    """Return a python identifier for a name, with a trailing underscore for the keywords such as `from`."""
+    identifier = re.sub(r"\W", "_", name)
+    if not identifier or identifier[0].isdigit():
+        identifier = f"_{identifier}"
+    return f"{identifier}_" if keyword.iskeyword(identifier) else identifier
+
+
+def _docstring_text(text: str) -> str:
+    """Escape a text so that it does not end the docstring it is written in."""
+    text = text.replace("\\", "\\\\").replace('"""', '\\"\\"\\"')
+    # a quote right before the closing quotes would end the docstring early
+    return f'{text[:-1]}\\"' if text.endswith('"') else text
+
+
+def to_python_signature(func_doc: Dict[str, Any]) -> str:
+    """Render a function doc as a valid python signature with a docstring, the optional parameters last.
+
+    The function is named as the OpenAI tool, and the parameters named after python keywords take a trailing underscore.
+    """
+    properties = func_doc.get("parameters", {}).get("properties", {})
+    required = func_doc.get("parameters", {}).get("required", [])
+    arguments, optional_arguments, descriptions = [], [], []
+    for name, schema in properties.items():
+        python_type = _python_type(schema)
+        identifier = _python_identifier(name)
+        if name in required:
+            arguments.append(f"{identifier}: {python_type}")
+        else:
+            optional_arguments.append(f"{identifier}: {python_type} = {schema.get('default')!r}")
+        descriptions.append(
+            f"        {identifier} ({python_type}): {_docstring_text(str(schema.get('description', '')))}"
+        )
+
+    name = _python_identifier(_tool_name(func_doc["name"]))
+    lines = [f"def {name}({', '.join(arguments + optional_arguments)}):", '    """']
+    lines[-1] += _docstring_text(func_doc.get("description", ""))
+    if descriptions:
+        lines += ["", "    Args:", *descriptions]
+    lines.append('    """')
+    return "\n".join(lines)
+
+
+def render_tool_schemas(func_doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a function doc in all the `TOOL_SCHEMA_FORMATS`."""
+    return {"openai": to_openai_tool(func_doc), "json": to_json(func_doc), "python": to_python_signature(func_doc)}
+
+
+class ToolSchemaStore:
+    """The content-addressed store of the tool schemas, every unique function doc is rendered once.
+
+    Args:
+        schemas (Dict[str, Dict[str, Any]]): The renderings by digest, e.g. as saved by `save`.
+    """
+
+    def __init__(self, schemas: Dict[str, Dict[str, Any]] | None = None):
+        self.schemas: Dict[str, Dict[str, Any]] = dict(schemas or {})
+
+    def __len__(self) -> int:
+        return len(self.schemas)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self.schemas
+
+    def add(self, func_doc: Dict[str, Any]) -> str:
+        """Render a function doc unless it is already stored, and return its digest."""
+        digest = function_doc_digest(func_doc)
+        if digest not in self.schemas:
+            self.schemas[digest] = render_tool_schemas(func_doc)
+        return digest
+
+    def get(self, digest: str, format: str = "openai") -> Any:
+        """Get the tool schema of a function doc by its digest.
+
+        Args:
+            digest (str): The digest of the function doc, as returned by `add`.
+            format (str): One of `TOOL_SCHEMA_FORMATS`.
+
+        Returns:
+            The tool schema of the function doc in the format.
+
+        Raises:
+            ValueError: If the format is unknown.
+            KeyError: If no function doc with the digest is stored.
+        """
+        if format not in TOOL_SCHEMA_FORMATS:
+            raise ValueError(f"Unknown tool schema format {format}, expected one of {list(TOOL_SCHEMA_FORMATS)}.")
+        return self.schemas[digest][format]
+
+    def tools(self, digests: Iterable[str], format: str = "openai") -> List[Any]:
+        """Get the tool schemas of the function docs of a prompt, see `get`."""
+        return [self.get(digest, format) for digest in digests]
+
+    def save(self, file_path: str):
+        """Save the renderings as one JSON object by digest, in a deterministic order."""
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({digest: self.schemas[digest] for digest in sorted(self.schemas)}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, file_path: str) -> "ToolSchemaStore":
+        """Load the renderings saved by `save`."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
@@ -0,0 +1,72 @@
+import pytest
+
+from bfcl.benchmarks import checkers, startup
+from bfcl.benchmarks.cli import load_baseline, save_results
+from bfcl.constants import category_mappings
+from bfcl.constants.id_mapper import IDMapper
+
+
+@pytest.fixture(scope="module")
+def cases():
+    """Return a fixture for the benchmark inputs of a few ids per category."""
+    return checkers.build_cases(IDMapper(), num_per_category=3)
+
+
+def make_results(commit, dirty=False, **medians):
+    return {
+        "suite": "checkers",
+        "commit": commit,
+        "dirty": dirty,
+        "benchmarks": {name: {"median_us": median} for name, median in medians.items()},
+    }
+
+
+class TestCheckerBenchmarks:
+    """Test the checker micro-benchmarks and their regression tracking."""
+
+    def test_inputs_are_valid(self, cases):
+        """Test that every benchmark has inputs, and that the checkers accept the inputs of the ground truth."""
+        for name, func in checkers.BENCHMARKS.items():
+            assert cases[name], name
+            if name.endswith("_checker") or name == "executable_checker_simple":
+                results = [func(*args) for args in cases[name]]
+                assert all(result["valid"] if isinstance(result, dict) else result.valid for result in results), name
+
+    def test_time_benchmark(self, cases):
+        """Test the timing statistics of a benchmark."""
+        timing = checkers.time_benchmark(checkers.BENCHMARKS["string_checker"], cases["string_checker"], repeat=3)
+        assert timing["num_inputs"] == len(cases["string_checker"])
+        assert 0 < timing["min_us"] <= timing["median_us"]
+
+    def test_compare(self, tmp_path):
+        """Test that slowdowns above the threshold are regressions, and that baselines are found by commit."""
+        baseline = make_results("abc123", ast_checker=10.0, string_checker=1.0)
+        save_results(baseline, str(tmp_path))
+        save_results(make_results("abc123", dirty=True, ast_checker=50.0), str(tmp_path))
+        assert load_baseline("abc", str(tmp_path), "checkers") == baseline
+
+        results = make_results("def456", ast_checker=10.5, string_checker=1.2, dict_checker=3.0)
+        comparison = checkers.compare(results, baseline, threshold=0.1)
+        assert not comparison["ast_checker"]["regressed"]
+        assert comparison["string_checker"]["regressed"]
+        assert "dict_checker" not in comparison
+
+
+class TestStartupBenchmarks:
+    """Test the startup and memory benchmarks."""
+
+    def test_id_mapper_categories(self):
+        """Test that an IDMapper of a subset of the categories only loads their ids."""
+        id_mapper = IDMapper([category_mappings.TestCategory.EXEC_SIMPLE])
+        assert set(id_mapper.id_to_category.values()) == {category_mappings.TestCategory.EXEC_SIMPLE}
+        assert "execution_result_type" in id_mapper.get_function_description("exec_simple_0")[0]
+
+    def test_run_worker(self):
+        """Test that a scenario is measured in a fresh interpreter, with and without tracing the allocations."""
+        result = startup.run_worker("category:live_parallel")
+        assert result["num_ids"] == 16
+        assert set(result["stages_s"]) == {"import", "construct"}
+        assert result["rss_steady_mb"] > 0
+
+        traced = startup.run_worker("category:live_parallel", top=3)
+        assert len(traced["top_allocators"]) == 3
@@ -0,0 +1,49 @@
+from bfcl.eval.ast.checkers import simple_function_checker
+from bfcl.eval.exec.checkers import executable_checker_parallel_no_order
+from bfcl.schemas.tool_calls import ToolCall
+
+FUNC_DESCRIPTION = {
+    "name": "book_hotel",
+    "description": "Book a hotel room.",
+    "parameters": {
+        "type": "dict",
+        "properties": {
+            "city": {"type": "string", "description": "The city."},
+            "room": {"type": "dict", "description": "The room, by type and number of beds."},
+        },
+        "required": ["city", "room"],
+    },
+}
+
+
+class TestCheckers:
+    """Test the branches of the checkers that used to crash or pass wrong completions."""
+
+    def test_dict_parameter(self):
+        """Test that the dict parameters are checked against the possible answers of the ground truth."""
+        possible_answer = ToolCall(
+            function_name="book_hotel",
+            parameters={"city": ["Paris"], "room": [{"type": ["double"], "beds": [1, 2]}]},
+        )
+        model_output = ToolCall(
+            function_name="book_hotel", parameters={"city": "Paris", "room": {"type": "double", "beds": 2}}
+        )
+        assert simple_function_checker(FUNC_DESCRIPTION, model_output, possible_answer, "python").valid
+
+        model_output.parameters["room"]["beds"] = 3
+        result = simple_function_checker(FUNC_DESCRIPTION, model_output, possible_answer, "python")
+        assert not result.valid
+        assert result.errors[0].error_type == "value_error:dict_value"
+
+    def test_parallel_no_order_mismatch(self):
+        """Test that the parallel calls without a match for a possible answer are reported as a mismatch."""
+        expected = ["math_lcm(2, 3)", "math_gcd(12, 8)"]
+        result_types = ["exact_match", "exact_match"]
+        assert executable_checker_parallel_no_order(["math_gcd(12, 8)", "math_lcm(2, 3)"], expected, result_types).valid
+
+        result = executable_checker_parallel_no_order(["math_gcd(12, 8)", "math_lcm(2, 5)"], expected, result_types)
+        assert not result.valid and not result.correct
+        assert result.errors[0].error_type == "executable_checker:cannot_find_match"
+        assert result.errors[0].message == [
+            "Could not find a matching function among index [0, 1] of model output for index 0 of possible answers."
+        ]
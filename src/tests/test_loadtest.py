@@ -0,0 +1,58 @@
+import json
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from bfcl.benchmarks.loadtest import LoadTest, category_of, load_corpus, percentiles
+from bfcl.main import app
+
+
+@pytest.fixture(scope="module")
+def url():
+    """Return a fixture for the URL of a server running in a background thread."""
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+class TestLoadTest:
+    """Test the load-test harness against a server running in a thread."""
+
+    @pytest.fixture
+    def records(self, tmp_path):
+        """Return a fixture for a shuffled corpus of completions."""
+        records = [
+            {"id": "simple_2", "completion": '[{"math.hypot": {"x": 4, "y": 5, "z": 0}}]'},
+            {"id": "simple_2", "completion": '[{"math.hypot": {"x": 5, "y": 5, "z": 1}}]'},
+            {"id": "live_irrelevance_9-0-9", "completion": "I'm sorry, I don't understand."},
+        ]
+        path = tmp_path / "corpus.jsonl"
+        path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+        return load_corpus(str(path), repeat=2, seed=0)
+
+    def test_helpers(self):
+        """Test the category lookup and the latency percentiles."""
+        assert category_of("live_relevance_1-1-0") == "LIVE_RELEVENCE"
+        assert category_of("exec_parallel_multiple_3") == "EXEC_PARALLEL_MULTIPLE"
+        assert category_of("unknown_0") == "UNKNOWN"
+        latencies = percentiles([i / 1000 for i in range(1, 101)])
+        assert (latencies["p50"], latencies["p95"], latencies["p99"]) == pytest.approx((50, 95, 99))
+
+    @pytest.mark.parametrize("mode", ["call", "calls", "stream"])
+    def test_modes(self, url, records, mode):
+        """Test that every mode replays all records and reports per-category accuracy."""
+        report = LoadTest(url, mode, concurrency=2, batch_size=4, rate=100).run(records)
+        assert (report["items"]["total"], report["items"]["errors"]) == (6, 0)
+        assert report["requests"]["total"] == (6 if mode == "call" else 2)
+        assert report["categories"]["SIMPLE"]["accuracy"] == 0.5
+        assert report["categories"]["LIVE_IRRELEVANCE"]["accuracy"] == 1.0
+        assert ("first_item_latency_ms" in report["requests"]) == (mode == "stream")
+
+    def test_request_errors(self, records):
+        """Test that failed requests are counted as errors of their items."""
+        report = LoadTest("http://127.0.0.1:1", "calls", concurrency=1, batch_size=6, timeout=1).run(records)
+        assert report["requests"]["error_rate"] == 1.0
+        assert report["categories"]["SIMPLE"]["error_rate"] == 1.0
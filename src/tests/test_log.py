@@ -0,0 +1,35 @@
+import json
+import logging
+import queue
+
+from bfcl.utils.log import DeferredQueueHandler, JsonFormatter, Payload, RequestIdFilter, request_id_var
+
+
+class TestLog:
+    """Test the structured logging pipeline."""
+
+    def test_deferred_json_record(self):
+        """Test that records are enqueued unformatted and rendered as JSON lines with extra fields."""
+        log_queue = queue.SimpleQueue()
+        handler = DeferredQueueHandler(log_queue)
+        handler.addFilter(RequestIdFilter())
+        logger = logging.getLogger("tests.test_log")
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+        token = request_id_var.set("request_0")
+        try:
+            logger.info("Ran %d tool calls", 2, extra={"num_correct": 1, "payload": Payload(["x" * 1000] * 100)})
+        finally:
+            request_id_var.reset(token)
+            logger.removeHandler(handler)
+
+        record = log_queue.get_nowait()
+        assert record.args == (2,) and not hasattr(record, "message")
+
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "Ran 2 tool calls"
+        assert entry["num_correct"] == 1
+        assert entry["request_id"] == "request_0"
+        assert len(entry["payload"]) <= 2048 + 3
@@ -0,0 +1,39 @@
+import pytest
+
+from bfcl.metrics import Counter, Histogram, MetricsRegistry
+
+
+class TestMetrics:
+    """Test the Prometheus-style metrics."""
+
+    @pytest.fixture
+    def registry(self):
+        """Return a fixture for an empty MetricsRegistry instance."""
+        return MetricsRegistry()
+
+    def test_counter(self, registry):
+        """Test rendering a labelled counter."""
+        counter = registry.register(Counter("requests_total", "Requests.", ["endpoint"]))
+        counter.inc(endpoint="call")
+        counter.inc(2, endpoint='a"b')
+        assert registry.render().splitlines() == [
+            "# HELP requests_total Requests.",
+            "# TYPE requests_total counter",
+            'requests_total{endpoint="a\\"b"} 2',
+            'requests_total{endpoint="call"} 1',
+        ]
+        with pytest.raises(ValueError):
+            counter.inc(category="SIMPLE")
+
+    def test_histogram(self, registry):
+        """Test that the histogram buckets are cumulative."""
+        histogram = registry.register(Histogram("latency_seconds", "Latency.", ["stage"], buckets=(0.1, 1.0)))
+        histogram.observe(0.05, stage="decode")
+        histogram.observe(0.5, stage="decode")
+        histogram.observe(5.0, stage="decode")
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{stage="decode",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{stage="decode",le="1.0"} 2' in lines
+        assert 'latency_seconds_bucket{stage="decode",le="+Inf"} 3' in lines
+        assert 'latency_seconds_count{stage="decode"} 3' in lines
+        assert 'latency_seconds_sum{stage="decode"} 5.55' in lines
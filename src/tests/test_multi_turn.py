@@ -0,0 +1,242 @@
+import json
+
+import pytest
+
+from bfcl.constants import category_mappings
+from bfcl.eval.multi_turn.checkers import state_differences
+from bfcl.eval.multi_turn.environment import MultiTurnEnvironment, parse_call
+from bfcl.eval.multi_turn.sessions import SessionManager
+from bfcl.eval.multi_turn.trajectories import GROUND_TRUTH_TRAJECTORIES
+from bfcl.runners import PlainJsonRunner
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Return a fixture for the PlainJsonRunner instance shared by the tests."""
+    return PlainJsonRunner()
+
+
+@pytest.fixture(scope="module")
+def multi_turn_ids(runner):
+    """Return a fixture for the ids of the multi-turn categories."""
+    multi_turn = category_mappings.TestCollection.MULTI_TURN
+    return [id for id, category in runner.id_mapper.id_to_category.items() if category in multi_turn]
+
+
+class TestMultiTurnChecker:
+    """Test the scoring of multi-turn trajectories."""
+
+    def test_ground_truth_is_correct(self, runner, multi_turn_ids):
+        """Test that the ground truth trajectory of every entry is scored correct."""
+        assert len(multi_turn_ids) == 800
+        for id in multi_turn_ids:
+            response = runner.run(id, json.dumps(runner.id_mapper.get_ground_truth(id)))
+            assert response["correct"], (id, response["errors"])
+
+    def test_steps_and_dict_calls(self, runner):
+        """Test that the turns may be given as steps of calls, and the calls as dictionaries."""
+        ground_truth = runner.id_mapper.get_ground_truth("multi_turn_base_0")
+        steps = [[[call] for call in turn] for turn in ground_truth]
+        assert runner.run("multi_turn_base_0", json.dumps(steps))["correct"]
+        name, args, kwargs = parse_call("cd(folder='document')")
+        assert runner.run("multi_turn_base_0", json.dumps([[{name: kwargs}]] + ground_truth[1:]))["correct"] == (
+            ground_truth[0] == ["cd(folder='document')"]
+        )
+
+    def test_wrong_trajectories(self, runner):
+        """Test the errors of the trajectories that do not match the ground truth."""
+        ground_truth = runner.id_mapper.get_ground_truth("multi_turn_base_0")
+        errors = {
+            "multi_turn:wrong_turn_count": ground_truth[:-1],
+            "multi_turn:empty_turn_model_response": [[]] + ground_truth[1:],
+            "multi_turn:instance_state_mismatch": [ground_truth[0] + ["mkdir(dir_name='synthetic')"]]
+            + ground_truth[1:],
+            "multi_turn:wrong_format": [["cd(folder='document')", 1]],
+        }
+        for error_type, turns in errors.items():
+            response = runner.run("multi_turn_base_0", json.dumps(turns))
+            assert not response["correct"]
+            assert response["errors"][0]["error_type"] == error_type
+        assert not runner.run("multi_turn_base_0", "not json")["formatted"]
+
+    def test_missing_turn_is_skipped(self, runner):
+        """Test that the turns without ground truth accept any response, including none."""
+        id = next(
+            id
+            for id, turns in runner.id_mapper.id_to_ground_truth.items()
+            if id.startswith("multi_turn_miss_func_") and [] in turns
+        )
+        ground_truth = runner.id_mapper.get_ground_truth(id)
+        assert [] in ground_truth
+        assert runner.run(id, json.dumps(ground_truth))["correct"]
+
+
+class TestMultiTurnEnvironment:
+    """Test the simulated APIs."""
+
+    def test_file_system(self):
+        """Test that the file system calls update the state and report the failures as results."""
+        config = {"GorillaFileSystem": {"root": {"alex": {"type": "directory", "contents": {}}}}}
+        environment = MultiTurnEnvironment(config, ["GorillaFileSystem"])
+        results = environment.execute_all(
+            [
+                "mkdir(dir_name='docs')",
+                "cd(folder='docs')",
+                "echo(content='hello world', file_name='a.txt')",
+                "wc(file_name='a.txt', mode='w')",
+                "cat(file_name='missing.txt')",
+                "unknown_function()",
+                "cd(1, 2, 3)",
+            ]
+        )
+        assert json.loads(results[3])["count"] == 2
+        assert "error" in json.loads(results[4])
+        assert results[5].startswith("Error during execution")
+        assert results[6].startswith("Error during execution")
+        assert MultiTurnEnvironment(config, ["GorillaFileSystem"]).state() != environment.state()
+
+    def test_deterministic(self, runner):
+        """Test that the same calls from the same initial config give the same results and state."""
+        entry = runner.id_mapper.get_multi_turn_entry("multi_turn_long_context_0")
+        calls = [call for turn in runner.id_mapper.get_ground_truth("multi_turn_long_context_0") for call in turn]
+        environments = [
+            MultiTurnEnvironment(entry["initial_config"], entry["involved_classes"], entry["long_context"])
+            for _ in range(2)
+        ]
+        assert environments[0].execute_all(calls) == environments[1].execute_all(calls)
+        assert environments[0].state() == environments[1].state()
+
+    def test_fork(self, runner):
+        """Test that a fork diverges from its environment without changing it, nor the initial config of the entry."""
+        entry = runner.id_mapper.get_multi_turn_entry("multi_turn_base_0")
+        config = json.dumps(entry["initial_config"], sort_keys=True)
+        environment = MultiTurnEnvironment(entry["initial_config"], entry["involved_classes"])
+        environment.execute("mkdir(dir_name='shared')")
+        before = environment.state()
+        fork = environment.fork()
+        assert fork.state() == before
+        fork.execute_all(["mkdir(dir_name='forked')", "cd(folder='shared')", "touch(file_name='a.txt')"])
+        fork.execute_all([call for turn in runner.id_mapper.get_ground_truth("multi_turn_base_0") for call in turn])
+        assert environment.state() == before != fork.state()
+        assert json.dumps(entry["initial_config"], sort_keys=True) == config
+
+    def test_state_differences(self):
+        """Test that the states are compared by value, skipping the values shared copy-on-write."""
+        config = {"GorillaFileSystem": {"root": {"alex": {"type": "directory", "contents": {}}}}}
+        environment = MultiTurnEnvironment(config, ["GorillaFileSystem"])
+        environment.execute_all(
+            ["mkdir(dir_name='a')", "mkdir(dir_name='b')", "cd(folder='a')", "touch(file_name='x')"]
+        )
+        fork = environment.fork()
+
+        other = MultiTurnEnvironment(config, ["GorillaFileSystem"])
+        other.execute_all(["mkdir(dir_name='b')", "mkdir(dir_name='a')", "cd(folder='a')", "touch(file_name='x')"])
+        assert state_differences(other.state(), environment.state()) == []
+        fork.execute("touch(file_name='y')")
+        assert state_differences(fork.state(), environment.state()) == ["GorillaFileSystem.root"]
+        fork.execute("rm(file_name='y')")
+        assert state_differences(fork.state(), environment.state()) == []
+
+    def test_ground_truth_trajectory(self, runner):
+        """Test that the cached ground truth trajectory matches a fresh execution and is not modified by the checks."""
+        entry = runner.id_mapper.get_multi_turn_entry("multi_turn_long_context_0")
+        ground_truth = runner.id_mapper.get_ground_truth("multi_turn_long_context_0")
+        trajectory = GROUND_TRUTH_TRAJECTORIES.get("multi_turn_long_context_0", runner.id_mapper)
+        assert GROUND_TRUTH_TRAJECTORIES.get("multi_turn_long_context_0", runner.id_mapper) is trajectory
+        states = json.dumps(trajectory.states, sort_keys=True)
+        environment = MultiTurnEnvironment(entry["initial_config"], entry["involved_classes"], entry["long_context"])
+        for turn_index, calls in enumerate(ground_truth):
+            assert environment.execute_all(calls) == trajectory.results[turn_index]
+            assert environment.state() == trajectory.states[turn_index]
+        wrong = [["mkdir(dir_name='synthetic')"]] + ground_truth[1:]
+        assert not runner.run("multi_turn_long_context_0", json.dumps(wrong))["correct"]
+        assert json.dumps(trajectory.states, sort_keys=True) == states
+
+
+class TestSessions:
+    """Test the multi-turn sessions applying one turn at a time."""
+
+    def test_turns_match_checker(self, runner):
+        """Test that applying the turns one at a time gives the same results as checking the whole trajectory."""
+        manager = SessionManager(runner.id_mapper)
+        ground_truth = runner.id_mapper.get_ground_truth("multi_turn_base_0")
+        completions = {"correct": ground_truth, "wrong": [["mkdir(dir_name='synthetic')"]] + ground_truth[1:]}
+        for turns in completions.values():
+            session = manager.create("multi_turn_base_0")
+            responses = [session.apply_turn(turn) for turn in turns]
+            expected = runner.run("multi_turn_base_0", json.dumps(turns))
+            assert [response["results"] for response in responses][: len(expected["results"])] == expected["results"]
+            assert session.summary()["correct"] == expected["correct"]
+            assert session.summary()["done"]
+            with pytest.raises(ValueError):
+                session.apply_turn([])
+        with pytest.raises(ValueError):
+            manager.create("simple_2")
+
+    def test_eviction(self, runner):
+        """Test that the idle sessions expire and the least recently used ones are evicted past the capacity."""
+        now = [0.0]
+        manager = SessionManager(runner.id_mapper, ttl=10, max_sessions=2, clock=lambda: now[0])
+        first = manager.create("multi_turn_base_0").session_id
+        now[0] = 5.0
+        second = manager.create("multi_turn_base_1").session_id
+        now[0] = 12.0
+        assert manager.get(first) is None
+        assert manager.get(second) is not None
+        third = manager.create("multi_turn_base_2").session_id
+        fourth = manager.create("multi_turn_base_3").session_id
+        assert (manager.get(second), len(manager)) == (None, 2)
+        assert manager.close(third).session_id == third
+        assert manager.get(third) is None and manager.get(fourth) is not None
+
+    def test_endpoints(self):
+        """Test creating a session, applying its turns and closing it through the server."""
+        from bfcl.main import app, runner
+
+        client = app.test_client()
+        created = client.post("/sessions", json={"id": "multi_turn_base_0"})
+        assert created.status_code == 201
+        session_id = created.json["session_id"]
+        for turn in runner.id_mapper.get_ground_truth("multi_turn_base_0"):
+            response = client.post(f"/sessions/{session_id}/turn", json={"completion": json.dumps(turn)})
+            assert response.status_code == 200 and response.json["correct"]
+        assert client.post(f"/sessions/{session_id}/turn", json={"completion": "[]"}).status_code == 400
+        assert client.delete(f"/sessions/{session_id}").json["correct"]
+        assert client.get(f"/sessions/{session_id}").status_code == 404
+        assert client.post("/sessions", json={"id": "simple_2"}).status_code == 400
+
+    def test_server_session_bad_requests(self):
+        """Test that the bodies that are not JSON objects with the expected fields are rejected as bad requests."""
+        from bfcl.main import app
+
+        client = app.test_client()
+        assert client.post("/sessions", data="multi_turn_base_0", content_type="text/plain").status_code == 400
+        assert client.post("/sessions", data="{", content_type="application/json").status_code == 400
+        assert client.post("/sessions", json=["multi_turn_base_0"]).status_code == 400
+        assert client.post("/sessions", json={"session": "multi_turn_base_0"}).status_code == 400
+        assert client.post("/sessions", json={"id": ["multi_turn_base_0"]}).status_code == 400
+
+        session_id = client.post("/sessions", json={"id": "multi_turn_base_0"}).json["session_id"]
+        assert client.post(f"/sessions/{session_id}/turn", data="[]", content_type="text/plain").status_code == 400
+        assert client.post(f"/sessions/{session_id}/turn", json={"calls": "[]"}).status_code == 400
+        assert client.post(f"/sessions/{session_id}/turn", json={"completion": "["}).status_code == 400
+        assert client.get(f"/sessions/{session_id}").json["num_turns_applied"] == 0
+
+    def test_fork(self):
+        """Test that the forks of a session continue from its current turn independently."""
+        from bfcl.main import app, runner
+
+        client = app.test_client()
+        ground_truth = runner.id_mapper.get_ground_truth("multi_turn_base_0")
+        session_id = client.post("/sessions", json={"id": "multi_turn_base_0"}).json["session_id"]
+        client.post(f"/sessions/{session_id}/turn", json={"completion": json.dumps(ground_truth[0])})
+        forked = client.post(f"/sessions/{session_id}/fork")
+        assert forked.status_code == 201 and forked.json["num_turns_applied"] == 1
+        fork_id = forked.json["session_id"]
+        wrong = client.post(f"/sessions/{fork_id}/turn", json={"completion": json.dumps(["mkdir(dir_name='x')"])})
+        assert not wrong.json["correct"]
+        for turn in ground_truth[1:]:
+            client.post(f"/sessions/{session_id}/turn", json={"completion": json.dumps(turn)})
+        assert client.get(f"/sessions/{session_id}").json["correct"]
+        assert client.get(f"/sessions/{fork_id}").json["num_turns_applied"] == 2
+        assert client.post("/sessions/missing/fork").status_code == 404
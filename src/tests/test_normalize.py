@@ -0,0 +1,129 @@
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from bfcl.constants.config import POSSIBLE_ANSWER_PATH, PROMPT_PATH
+from bfcl.eval.ast.normalize import standardize_ground_truth, standardize_string
+from bfcl.eval.ast.utils import java_type_converter, js_type_converter, parse_java_value
+
+JAVA_SCALAR_TYPES = ["byte", "short", "integer", "float", "double", "long", "boolean", "char", "String", "any"]
+JS_SCALAR_TYPES = ["String", "integer", "float", "Bigint", "Boolean", "any"]
+
+
+def collect_strings(value, strings):
+    if isinstance(value, str):
+        strings.add(value)
+    elif isinstance(value, list):
+        for item in value:
+            collect_strings(item, strings)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            strings.add(key)
+            collect_strings(item, strings)
+
+
+@pytest.fixture(scope="module")
+def dataset_strings():
+    """Return a fixture for every string of the bundled prompts and possible answers, with some edge cases."""
+    strings = {"", "3f\n", "12L\n", "-0", "'a'", "İstanbul", "Straße", "ǅ", "'x'", "1.5e3F", "7n", "a\tb", "ß'"}
+    for path in sorted(Path(PROMPT_PATH).glob("BFCL_v3_*.json")) + sorted(Path(POSSIBLE_ANSWER_PATH).glob("*.json*")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    collect_strings(json.loads(line), strings)
+    return sorted(strings)
+
+
+def reference_standardize_string(input_string):
+    return re.sub(r"[ \,\.\/\-\_\*\^]", "", input_string).lower().replace("'", '"')
+
+
+def reference_java_scalar(value, expected_type):
+    if expected_type in ("byte", "short", "integer"):
+        return int(value) if re.match(r"^-?\d+$", value) else value
+    if expected_type == "float":
+        if not re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?[fF]$", value):
+            return value
+        return float(re.sub(r"[fF]$", "", value))
+    if expected_type == "double":
+        return float(value) if re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?$", value) else value
+    if expected_type == "long":
+        return int(re.sub(r"[lL]$", "", value)) if re.match(r"^-?\d+[lL]$", value) else value
+    if expected_type == "boolean":
+        return value == "true" if value in ["true", "false"] else value
+    if expected_type == "char":
+        return value
+    return value
+
+
+def reference_js_scalar(value, expected_type):
+    if expected_type == "String":
+        if not (value.startswith('"') and value.endswith('"')) and not (value.startswith("'") and value.endswith("'")):
+            return value
+        return value[1:-1]
+    if expected_type == "integer":
+        return int(value) if re.match(r"^-?\d+$", value) else value
+    if expected_type == "float":
+        return float(value) if re.match(r"^-?\d+(\.\d+)?$", value) else value
+    if expected_type == "Bigint":
+        return int(value[:-1]) if re.match(r"^-?\d+n$", value) else value
+    if expected_type == "Boolean":
+        return value == "true" if value in ["true", "false"] else value
+    return value
+
+
+def reference_parse_java_value(value_str):
+    if value_str in ("true", "false"):
+        return value_str == "true"
+    if value_str.startswith('"') and value_str.endswith('"'):
+        return value_str[1:-1]
+    if re.match(r"^-?\d+[lL]$", value_str):
+        return int(value_str[:-1])
+    if re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?[fF]$", value_str):
+        return float(re.sub(r"[fF]$", "", value_str))
+    try:
+        return int(value_str)
+    except ValueError:
+        try:
+            return float(value_str)
+        except ValueError:
+            return value_str
+
+
+def same(func, reference, *args):
+    """Compare the outcomes of a function and its reference, including the types, the NaNs and the errors raised."""
+    outcomes = []
+    for f in (func, reference):
+        try:
+            outcomes.append(f(*args))
+        except Exception as e:
+            outcomes.append(type(e))
+    a, b = outcomes
+    return type(a) is type(b) and (a == b or a != a and b != b)
+
+
+class TestNormalize:
+    """Test that the normalization and the literal conversions give the same results as the regex implementations."""
+
+    def test_standardize_string(self, dataset_strings):
+        """Test that the standardized strings are identical over the whole dataset."""
+        assert len(dataset_strings) > 10000
+        for string in dataset_strings:
+            assert standardize_string(string) == reference_standardize_string(string), string
+            assert standardize_ground_truth(string) == reference_standardize_string(string), string
+
+    def test_ground_truth_is_interned(self):
+        """Test that the standardized strings of the ground truth are computed once and shared."""
+        first = standardize_ground_truth("".join(["New", " York"]))
+        assert standardize_ground_truth("".join(["New", " York"])) is first
+
+    def test_scalar_conversions(self, dataset_strings):
+        """Test that the scalar conversions are identical over the whole dataset."""
+        for string in dataset_strings:
+            for expected_type in JAVA_SCALAR_TYPES:
+                assert same(java_type_converter, reference_java_scalar, string, expected_type), (string, expected_type)
+            for expected_type in JS_SCALAR_TYPES:
+                assert same(js_type_converter, reference_js_scalar, string, expected_type), (string, expected_type)
+            assert same(parse_java_value, reference_parse_java_value, string), string
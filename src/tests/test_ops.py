@@ -0,0 +1,27 @@
+import json
+
+from bfcl.utils.ops import iter_jsonl, load_file, to_json_line, write_jsonl, write_list_of_dicts_to_file
+
+
+class TestJsonl:
+    """Test reading and writing the JSONL files a record at a time."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that the records written from a generator are read back in order, the empty lines skipped."""
+        path = tmp_path / "records.jsonl"
+        assert write_jsonl(path, ({"id": f"simple_{index}", "text": "é"} for index in range(3))) == 3
+        assert write_jsonl(path, [{"id": "simple_3"}], mode="a") == 1
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n")
+        assert [record["id"] for record in iter_jsonl(path)] == [f"simple_{index}" for index in range(4)]
+        assert "é" in path.read_text(encoding="utf-8")
+        assert load_file(path, sort_by_id=True) == list(iter_jsonl(path))
+
+    def test_fallback(self, tmp_path):
+        """Test that the values that are not JSON serializable are written as strings, as before."""
+        record = {"id": "exec_simple_0", "result": {1, 2}, "values": [1.5, b"x"]}
+        assert json.loads(to_json_line(record)) == {"id": "exec_simple_0", "result": "{1, 2}", "values": [1.5, "b'x'"]}
+        assert to_json_line({"text": "é"}, ensure_ascii=True) == '{"text": "\\u00e9"}\n'
+
+        write_list_of_dicts_to_file("records.jsonl", [record], subdir=str(tmp_path / "results"))
+        assert load_file(tmp_path / "results" / "records.jsonl")[0]["result"] == "{1, 2}"
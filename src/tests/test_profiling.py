@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+
+from bfcl.profiling import TIMINGS, SamplingProfiler, enable_timings, stage, timed
+
+
+@timed
+def add_one(x):
+    return x + 1
+
+
+class TestProfiling:
+    """Test the timing instrumentation and sampling profiler."""
+
+    @pytest.fixture
+    def timings(self):
+        """Return a fixture for the enabled detailed timings, disabled and reset afterwards."""
+        TIMINGS.reset()
+        enable_timings(True)
+        yield TIMINGS
+        enable_timings(False)
+        TIMINGS.reset()
+
+    def test_timings(self, timings):
+        """Test that stages and timed functions are recorded only when the timings are enabled."""
+        with stage("decode", "SIMPLE"):
+            assert add_one(1) == 2
+        enable_timings(False)
+        add_one(1)
+
+        snapshot = timings.snapshot()
+        assert snapshot["runner.decode"]["SIMPLE"]["count"] == 1
+        assert snapshot[f"{__name__}.add_one"]["ALL"]["count"] == 1
+
+    def test_sampling_profiler(self):
+        """Test that the profiler samples the stacks of other threads as collapsed stacks."""
+
+        def busy_loop():
+            deadline = time.monotonic() + 0.3
+            while time.monotonic() < deadline:
+                sum(range(100))
+
+        thread = threading.Thread(target=busy_loop)
+        thread.start()
+        profile = SamplingProfiler(interval=0.001).profile(0.1)
+        thread.join()
+
+        lines = profile.splitlines()
+        assert any("busy_loop" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from bfcl.constants import category_mappings
+from bfcl.prompt_set import (
+    PROMPT_METADATA,
+    build_prompt_dataset,
+    iter_prompt_dataset,
+    shard_file,
+    shard_index,
+    stream_prompt_dataset,
+)
+from bfcl.utils.ops import sort_key
+
+
+class TestPromptSet:
+    """Test building the prompt dataset."""
+
+    def test_stream_shards(self, tmp_path):
+        """Test that the streamed shards hold every sample once, split by the stable hash of the ids."""
+        categories = [category_mappings.TestCollection.PYTHON_AST]
+        output_file = str(tmp_path / "prompts.jsonl")
+        counts = stream_prompt_dataset(iter_prompt_dataset(categories), output_file, num_shards=3)
+
+        ids = []
+        for index, count in enumerate(counts):
+            path = shard_file(output_file, index, 3)
+            assert path.endswith(f"prompts-{index:05d}-of-00003.jsonl")
+            with open(path, "r", encoding="utf-8") as f:
+                samples = [json.loads(line) for line in f]
+            assert len(samples) == count
+            assert all(shard_index(sample["metainfo"]["id"], 3) == index for sample in samples)
+            ids.extend(sample["metainfo"]["id"] for sample in samples)
+        assert sorted(ids) == sorted(sample["metainfo"]["id"] for sample in build_prompt_dataset(categories))
+
+    def test_shard_index_is_stable(self):
+        """Test that the shard of an id does not depend on the process, unlike the builtin hash."""
+        assert shard_index("simple_0", 4) == shard_index("simple_0", 4) == 0
+        assert shard_file("prompts.jsonl", 0, 1) == "prompts.jsonl"
+
+    def test_deterministic_order(self):
+        """Test that the samples are ordered by `sort_key` whether the files are parsed in parallel or not."""
+        categories = [category_mappings.TestCollection.NON_PYTHON, category_mappings.TestCollection.MULTI_TURN]
+        dataset = build_prompt_dataset(categories)
+        assert build_prompt_dataset(categories, num_workers=2) == dataset
+        keys = [sort_key(sample["metainfo"]) for sample in dataset]
+        assert keys == sorted(keys) and len(set(keys)) == len(keys)
+        # the categories are ordered by id, not in the order of the collections
+        assert build_prompt_dataset(categories[::-1]) == dataset
+
+    def test_metadata(self):
+        """Test the optional fields of the samples."""
+        categories = [category_mappings.TestCollection.IRRELEVANCE, category_mappings.TestCollection.MULTI_TURN]
+        samples = {sample["metainfo"]["id"]: sample for sample in build_prompt_dataset(categories, PROMPT_METADATA)}
+        assert samples["irrelevance_0"]["metainfo"] == {
+            "id": "irrelevance_0",
+            "category": "IRRELEVANCE",
+            "language": "python",
+            "num_expected_calls": 0,
+        }
+        multi_turn = samples["multi_turn_miss_func_0"]
+        assert multi_turn["turns"][0] == multi_turn["prompt"] and len(multi_turn["turns"]) > 1
+        assert multi_turn["metainfo"]["num_expected_calls"] > 0
+        names = {function["name"] for function in multi_turn["functions"]}
+        # `sort` is only described at the turn where it is added
+        assert "cd" in names and "sort" not in names
+        with pytest.raises(ValueError):
+            build_prompt_dataset(categories, ["unknown"])
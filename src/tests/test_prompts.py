@@ -0,0 +1,61 @@
+from bfcl.constants import category_mappings
+from bfcl.prompt_set import build_prompt_dataset
+
+
+class TestPrompts:
+    """Test serving the prompts from the server."""
+
+    def test_pages(self):
+        """Test that the pages of a category follow each other in the order of the prompt dataset."""
+        from bfcl.main import app
+
+        client = app.test_client()
+        expected = [sample["prompt"] for sample in build_prompt_dataset([category_mappings.TestCollection.NON_PYTHON])]
+        prompts, after = [], None
+        while True:
+            query = {"collection": "non_python", "limit": 40} | ({} if after is None else {"after": after})
+            page = client.get("/prompts", query_string=query).json
+            assert page["total"] == len(expected)
+            prompts.extend(page["prompts"])
+            after = page["next"]
+            if after is None:
+                break
+        assert [prompt["prompt"] for prompt in prompts] == expected
+        assert {prompt["metainfo"]["language"] for prompt in prompts} == {"java", "javascript"}
+
+        # the filters intersect, and the ids give a range within a category
+        page = client.get("/prompts?collection=python_ast&category=simple,java&after=simple_9&limit=2&functions=1").json
+        assert [prompt["metainfo"]["id"] for prompt in page["prompts"]] == ["simple_10", "simple_11"]
+        assert page["total"] == client.get("/prompts?category=simple").json["total"]
+        assert page["prompts"][0]["functions"][0]["name"] == "calculate_area"
+        assert client.get("/prompts?category=unknown").status_code == 400
+        assert client.get("/prompts?limit=0").status_code == 400
+
+    def test_etag(self):
+        """Test that the conditional requests of an unchanged page are answered without a body."""
+        from bfcl.main import app
+
+        client = app.test_client()
+        response = client.get("/prompts?category=multi_turn_base&turns=true")
+        assert response.status_code == 200 and len(response.json["prompts"][0]["turns"]) > 1
+        etag = response.headers["ETag"]
+        cached = client.get("/prompts?category=multi_turn_base&turns=true", headers={"If-None-Match": etag})
+        assert cached.status_code == 304 and not cached.data
+        # the same query spelled differently has the same ETag, unlike another query
+        respelled = client.get("/prompts?collection=multi_turn&category=MULTI_TURN_BASE&turns=yes")
+        assert respelled.headers["ETag"] == etag
+        assert client.get("/prompts?category=multi_turn_base", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_functions(self):
+        """Test that the function docs are the ones of the prompt dataset, without the missed functions."""
+        from bfcl.main import app
+
+        client = app.test_client()
+        collections = [category_mappings.TestCollection.MULTI_TURN, category_mappings.TestCollection.EXECUTABLE]
+        expected = {sample["metainfo"]["id"]: sample for sample in build_prompt_dataset(collections, ["functions"])}
+        for id in ["multi_turn_miss_func_0", "exec_simple_0"]:
+            category = id.rsplit("_", 1)[0]
+            page = client.get(f"/prompts?category={category}&limit=1&functions=true").json
+            assert page["prompts"][0]["metainfo"]["id"] == id
+            assert page["prompts"][0]["functions"] == expected[id]["functions"]
+        assert "sort" not in {doc["name"] for doc in expected["multi_turn_miss_func_0"]["functions"]}
@@ -0,0 +1,96 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bfcl.results.sqlite_store import SQLiteResultStore
+from bfcl.results.store import JsonlResultStore
+
+
+class TestSQLiteResultStore:
+    """Test the SQLite-backed result store."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Return a fixture for a SQLiteResultStore instance."""
+        store = SQLiteResultStore(str(tmp_path / "results.db"), run_id="run_0", batch_size=2, flush_interval=0.01)
+        yield store
+        store.close()
+
+    @staticmethod
+    def make_record(id, category, completion_hash, correct, error_type=None):
+        return {
+            "id": id,
+            "category": category,
+            "completion_hash": completion_hash,
+            "formatted": True,
+            "valid": correct,
+            "correct": correct,
+            "error_type": error_type,
+        }
+
+    def test_lookup_before_and_after_commit(self, store):
+        """Test that a queued record can be looked up before and after the writer commits it."""
+        store.put(self.make_record("simple_2", "SIMPLE", "hash_0", True))
+        assert store.lookup("simple_2", "hash_0")["correct"] is True
+        store.flush()
+        assert store.lookup("simple_2", "hash_0")["correct"] is True
+        assert store.lookup("simple_2", "hash_1") is None
+        assert store.lookup("simple_2", "hash_0", run_id="run_1") is None
+
+    def test_queries(self, store):
+        """Test the per-category accuracy and error breakdown queries."""
+        store.put(self.make_record("simple_0", "SIMPLE", "hash_0", True))
+        store.put(self.make_record("simple_1", "SIMPLE", "hash_1", False, "value_error:others"))
+        store.put(self.make_record("simple_2", "SIMPLE", "hash_2", False, "value_error:others"))
+        store.put(self.make_record("java_0", "JAVA", "hash_3", False, "type_error:java"))
+        store.put(self.make_record("java_0", "JAVA", "hash_3", False, "type_error:java"), run_id="run_1")
+
+        assert store.category_accuracy()["SIMPLE"] == {"total": 3, "correct": 1, "accuracy": 1 / 3}
+        assert store.error_breakdown() == {"JAVA": {"type_error:java": 1}, "SIMPLE": {"value_error:others": 2}}
+        assert store.error_breakdown(category="JAVA") == {"JAVA": {"type_error:java": 1}}
+        assert store.run_ids() == ["run_0", "run_1"]
+        assert len(list(store.records())) == 4
+        assert store.get("java_0")["error_type"] == "type_error:java"
+
+    def test_lookups_from_thread_pools(self, store):
+        """Test that the lookups from short-lived thread pools, one per server request, leave no connection open."""
+        store.put(self.make_record("simple_2", "SIMPLE", "hash_0", True))
+        store.flush()
+        num_fds = len(os.listdir("/proc/self/fd"))
+        for _ in range(20):
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                results = list(executor.map(lambda _: store.lookup("simple_2", "hash_0"), range(64)))
+            assert all(result["correct"] for result in results)
+        assert len(os.listdir("/proc/self/fd")) <= num_fds + 2
+
+    def test_persistence(self, store, tmp_path):
+        """Test that the records survive closing and reopening the store."""
+        store.put(self.make_record("simple_2", "SIMPLE", "hash_0", True))
+        store.close()
+        with SQLiteResultStore(str(tmp_path / "results.db"), run_id="run_0") as reopened:
+            assert reopened.lookup("simple_2", "hash_0")["correct"] is True
+
+    def test_close_commits_queued_records(self, tmp_path):
+        """Test that closing the store, as the server does at exit, commits the records still waiting for a batch."""
+        store = SQLiteResultStore(str(tmp_path / "queued.db"), run_id="run_0", batch_size=1024, flush_interval=3600)
+        store.put(self.make_record("simple_2", "SIMPLE", "hash_0", True))
+        store.close()
+        with SQLiteResultStore(str(tmp_path / "queued.db"), run_id="run_0") as reopened:
+            assert reopened.lookup("simple_2", "hash_0")["correct"] is True
+
+
+class TestJsonlResultStore:
+    """Test the append-only JSONL result store."""
+
+    def test_partial_last_line(self, tmp_path):
+        """Test that the partial last line of an interrupted run is truncated before new records are appended."""
+        path = tmp_path / "results.jsonl"
+        record = TestSQLiteResultStore.make_record("simple_0", "SIMPLE", "hash_0", True)
+        path.write_text(json.dumps(record) + "\n" + '{"id": "simple_1", "categ', encoding="utf-8")
+        with JsonlResultStore(str(path)) as store:
+            assert len(store) == 1
+            store.put(TestSQLiteResultStore.make_record("simple_2", "SIMPLE", "hash_2", False))
+        with JsonlResultStore(str(path)) as store:
+            assert [record["id"] for record in store.records()] == ["simple_0", "simple_2"]
@@ -0,0 +1,48 @@
+import pytest
+
+from bfcl.runners import PlainJsonRunner
+from bfcl.utils.ops import pass_at_k
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Return a fixture for the PlainJsonRunner instance shared by the tests."""
+    return PlainJsonRunner()
+
+
+class TestRunSamples:
+    """Test the scoring of several samples of the same id."""
+
+    def test_samples_match_single_runs(self, runner):
+        """Test that each sample gets the same response as when it is run alone."""
+        completions = [
+            '[{"math.hypot": {"x": 4, "y": 5}}]',
+            '[{"math.hypot": {"y": 5, "x": 4}}]',
+            '[{"math.hypot": {"x": 4, "y": 5}}]',
+            '[{"math.hypot": {"x": 3, "y": 5}}]',
+            "not json",
+        ]
+        samples = runner.run_samples("simple_2", completions)
+        assert samples["results"] == [runner.run("simple_2", completion) for completion in completions]
+        assert samples["num_samples"] == 5
+        assert samples["num_unique_completions"] == 4
+        # the reordered parameters decode into the same tool calls, and the invalid completion is never checked
+        assert samples["num_checked"] == 2
+        assert samples["num_correct"] == 3
+        assert samples["accuracy"] == pytest.approx(0.6)
+        assert samples["pass_at_k"] == {"1": pytest.approx(0.6), "5": 1.0}
+
+    def test_requested_k(self, runner):
+        """Test that pass@k is estimated for the requested values of k up to the number of samples."""
+        samples = runner.run_samples("simple_2", ['[{"math.hypot": {"x": 3, "y": 5}}]'] * 3, k=[2, 10])
+        assert samples["pass_at_k"] == {"1": 0.0, "2": 0.0, "3": 0.0}
+        assert runner.run_samples("simple_2", [])["pass_at_k"] == {}
+
+    def test_pass_at_k(self):
+        """Test the pass@k estimator against its closed form."""
+        assert pass_at_k(10, 3, 1) == pytest.approx(0.3)
+        assert pass_at_k(10, 3, 2) == pytest.approx(1 - (7 * 6) / (10 * 9))
+        assert pass_at_k(10, 9, 2) == 1.0
+        assert pass_at_k(10, 0, 10) == 0.0
+        with pytest.raises(ValueError):
+            pass_at_k(3, 1, 4)
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from bfcl.score import parse_shard, rescore_file, score_file
+
+
+class TestScore:
+    """Test the offline batch scoring."""
+
+    @pytest.fixture
+    def input_file(self, tmp_path):
+        """Return a fixture for a JSONL file of completions."""
+        records = [
+            {"id": "simple_2", "completion": '[{"math.hypot": {"x": 4, "y": 5, "z": 0}}]'},
+            {"id": "simple_2", "completion": '[{"math.hypot": {"x": 5, "y": 5, "z": 1}}]'},
+            {"id": "live_irrelevance_9-0-9", "completion": "I'm sorry, I don't understand."},
+            {"id": "unknown_0", "completion": "[]"},
+        ]
+        path = tmp_path / "completions.jsonl"
+        path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+        return path
+
+    def test_parse_shard(self):
+        """Test parsing the shard specification."""
+        assert parse_shard("1/4") == (1, 4)
+        with pytest.raises(ValueError):
+            parse_shard("4/4")
+        with pytest.raises(ValueError):
+            parse_shard("a/b")
+
+    def test_score_file(self, input_file, tmp_path):
+        """Test scoring a file in the current process."""
+        output_file = tmp_path / "results.jsonl"
+        summary = score_file(str(input_file), str(output_file), num_workers=1)
+
+        results = [json.loads(line) for line in output_file.read_text().splitlines()]
+        assert [result["index"] for result in results] == [0, 1, 2, 3]
+        assert [result["correct"] for result in results] == [True, False, True, False]
+        assert results[3]["errors"][0]["error_type"] == "runner:null_category"
+        assert summary["categories"]["SIMPLE"]["accuracy"] == 0.5
+        assert summary["collections"]["IRRELEVANCE"]["accuracy"] == 1.0
+        assert summary["unknown_ids"] == 1
+
+    def test_score_file_shard_and_resume(self, input_file, tmp_path):
+        """Test scoring one shard and resuming from a partially written output."""
+        output_file = tmp_path / "results.jsonl"
+        score_file(str(input_file), str(output_file), num_workers=1, shard="0/2")
+        assert [json.loads(line)["index"] for line in output_file.read_text().splitlines()] == [0, 2]
+
+        # simulate an interrupted run that left a partial line behind
+        with open(output_file, "a") as f:
+            f.write('{"index": 1, "id"')
+        score_file(str(input_file), str(output_file), num_workers=1, resume=True)
+        assert [json.loads(line)["index"] for line in output_file.read_text().splitlines()] == [0, 2, 1, 3]
+
+    def test_score_file_multi_turn(self, tmp_path):
+        """Test scoring multi-turn trajectories with a pool of workers."""
+        from bfcl import score
+
+        score._init_worker()
+        ids = [f"multi_turn_base_{index}" for index in range(8)]
+        id_mapper = score._runner.id_mapper
+        records = [
+            {"id": id, "completion": json.dumps(id_mapper.get_ground_truth(id)[: 1 if index % 2 else None])}
+            for index, id in enumerate(ids)
+        ]
+        input_file = tmp_path / "completions.jsonl"
+        input_file.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+        output_file = tmp_path / "results.jsonl"
+        summary = score_file(str(input_file), str(output_file), num_workers=2, chunksize=2)
+
+        results = [json.loads(line) for line in output_file.read_text().splitlines()]
+        assert [result["correct"] for result in results] == [index % 2 == 0 for index in range(8)]
+        assert summary["categories"]["MULTI_TURN_BASE"]["accuracy"] == 0.5
+
+    def test_rescore_file(self, tmp_path):
+        """Test that only changed completions are re-scored and the aggregates are updated incrementally."""
+        input_file = tmp_path / "completions.jsonl"
+        store_file = tmp_path / "store.jsonl"
+        records = [
+            {"id": "simple_2", "completion": '[{"math.hypot": {"x": 5, "y": 5, "z": 1}}]'},
+            {"id": "live_irrelevance_9-0-9", "completion": "I'm sorry, I don't understand."},
+        ]
+        input_file.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+        summary = rescore_file(str(input_file), str(store_file), num_workers=1)
+        assert summary["overall"]["correct"] == 1
+
+        records[0]["completion"] = '[{"math.hypot": {"x": 4, "y": 5, "z": 0}}]'
+        input_file.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+        summary = rescore_file(str(input_file), str(store_file), num_workers=1)
+        assert summary["overall"]["correct"] == 2
+        assert summary["categories"]["SIMPLE"]["accuracy"] == 1.0
+
+        # only the changed id is appended to the store
+        stored = [json.loads(line) for line in store_file.read_text().splitlines()]
+        assert [record["id"] for record in stored] == ["simple_2", "live_irrelevance_9-0-9", "simple_2"]
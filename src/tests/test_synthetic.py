@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from bfcl.benchmarks.synthetic import SyntheticCompletionGenerator, render_java
+from bfcl.constants import category_mappings
+from bfcl.runners import PlainJsonRunner
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Return a fixture for a PlainJsonRunner instance."""
+    return PlainJsonRunner()
+
+
+@pytest.fixture(scope="module")
+def generator(runner):
+    """Return a fixture for a SyntheticCompletionGenerator sharing the IDMapper of the runner."""
+    return SyntheticCompletionGenerator(runner.id_mapper)
+
+
+class TestSyntheticCompletionGenerator:
+    """Test that the synthesized completions are scored as expected."""
+
+    @pytest.mark.parametrize(
+        "id", ["simple_2", "parallel_0", "parallel_multiple_0", "live_simple_0-0-0", "java_0", "javascript_0"]
+    )
+    def test_scores_match_expectations(self, runner, generator, id):
+        """Test that the correct and perturbed completions of AST ids are scored as expected."""
+        records = [generator.generate(id, kind) for kind in ("correct", "wrong_type", "extra_param", "malformed")]
+        for record in records:
+            assert runner.run(record["id"], record["completion"])["correct"] == record["expected_correct"], record
+
+    def test_irrelevance_and_exec(self, runner, generator):
+        """Test the kinds of the irrelevance categories and the metadata of the executable categories."""
+        assert runner.run("irrelevance_0", generator.generate("irrelevance_0", "irrelevant_text")["completion"])[
+            "correct"
+        ]
+        assert generator.generate("irrelevance_0", "wrong_type") is None
+
+        record = generator.generate("exec_simple_0", "missing_required")
+        assert record["execution_result_type"] == ["exact_match"]
+        assert json.loads(record["completion"]) == ["calc_binomial_probability(k=5, p=0.6)"]
+        assert not runner.run(record["id"], record["completion"])["correct"]
+
+    def test_generate_all(self, generator):
+        """Test sampling ids per category."""
+        records = list(
+            generator.generate_all([category_mappings.TestCategory.SIMPLE], kinds=["correct"], num_per_category=3)
+        )
+        assert len(records) == 3 and all(record["category"] == "SIMPLE" for record in records)
+
+    def test_render_java(self):
+        """Test rendering values as Java source."""
+        assert render_java([1, 2], "ArrayList", "integer") == "new ArrayList<>(Arrays.asList(1, 2))"
+        assert render_java(5, "long") == "5L"
+        assert render_java({"a": True}, "HashMap") == 'new HashMap<String, Object>() {{ put("a", true); }}'
@@ -0,0 +1,82 @@
+import ast
+import copy
+
+import pytest
+
+from bfcl.constants import category_mappings
+from bfcl.prompt_set import build_prompt_dataset, reference_tool_schemas
+from bfcl.utils.tool_schemas import ToolSchemaStore, function_doc_digest, render_tool_schemas, to_python_signature
+
+FUNC_DOC = {
+    "name": "math.hypot",
+    "description": "Calculate the Euclidean norm.",
+    "parameters": {
+        "type": "dict",
+        "properties": {
+            "x": {"type": "float", "description": "The x-coordinate."},
+            "points": {"type": "array", "items": {"type": "integer"}, "description": "The points."},
+            "round": {"type": "boolean", "description": "Whether to round.", "default": False},
+        },
+        "required": ["x", "points"],
+    },
+}
+
+
+class TestToolSchemas:
+    """Test the rendering of the function docs as tool schemas."""
+
+    def test_render(self):
+        """Test the OpenAI tool, JSON and python signature renderings of a function doc."""
+        schemas = render_tool_schemas(FUNC_DOC)
+        function = schemas["openai"]["function"]
+        assert function["name"] == "math_hypot"
+        assert function["parameters"]["type"] == "object"
+        assert function["parameters"]["properties"]["x"] == {
+            "type": "number",
+            "format": "float",
+            "description": "The x-coordinate.",
+        }
+        assert function["parameters"]["properties"]["points"]["items"] == {"type": "integer"}
+        # the function doc is not modified
+        assert FUNC_DOC["parameters"]["properties"]["x"]["type"] == "float"
+        assert schemas["python"].startswith("def math_hypot(x: float, points: list[int], round: bool = False):")
+
+    def test_python_signatures_parse(self):
+        """Test that the python signatures of the dataset function docs are valid python, the keywords escaped."""
+        dataset = build_prompt_dataset([category_mappings.TestCollection.ALL], ["functions"])
+        for func_doc in {function_doc_digest(doc): doc for sample in dataset for doc in sample["functions"]}.values():
+            ast.parse(to_python_signature(func_doc))
+
+        func_doc = {
+            "name": "db.range_query",
+            "description": 'Query a "range"',
+            "parameters": {"properties": {"from": {"type": "string", "description": 'A """quoted""" path'}}},
+        }
+        function = ast.parse(to_python_signature(func_doc)).body[0]
+        assert function.name == "db_range_query" and function.args.args[0].arg == "from_"
+        assert ast.get_docstring(function).startswith('Query a "range"')
+
+    def test_digest(self):
+        """Test that equal function docs have the same content address, unless their parameters are reordered."""
+        assert function_doc_digest(copy.deepcopy(FUNC_DOC)) == function_doc_digest(FUNC_DOC)
+        reordered = copy.deepcopy(FUNC_DOC)
+        reordered["parameters"]["properties"] = dict(reversed(list(FUNC_DOC["parameters"]["properties"].items())))
+        assert function_doc_digest(reordered) != function_doc_digest(FUNC_DOC)
+
+    def test_store(self, tmp_path):
+        """Test that the samples reference the tool schemas of the unique function docs, which round-trip a file."""
+        categories = [category_mappings.TestCollection.PYTHON_AST]
+        dataset = build_prompt_dataset(categories, ["functions"])
+        store = ToolSchemaStore()
+        samples = list(reference_tool_schemas(build_prompt_dataset(categories, ["functions"]), store))
+        assert len(store) < sum(len(sample["functions"]) for sample in dataset)
+        assert all("functions" not in sample for sample in samples)
+
+        store.save(str(tmp_path / "tool_schemas.json"))
+        loaded = ToolSchemaStore.load(str(tmp_path / "tool_schemas.json"))
+        for sample, expected in zip(samples, dataset):
+            assert loaded.tools(sample["tools"], "json") == [
+                render_tool_schemas(doc)["json"] for doc in expected["functions"]
+            ]
+        with pytest.raises(ValueError):
+            loaded.get(samples[0]["tools"][0], "xml")
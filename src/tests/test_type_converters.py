@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from bfcl.eval.ast import utils
+from bfcl.eval.ast.cache import ConversionCache
+from bfcl.eval.ast.parsers import get_parser
+
+
+class TestJavaTypeConverter:
+    """Test the conversion of the Java arguments with the tree-sitter parser."""
+
+    def test_inline_tests(self):
+        """Test that the conversions tested along the converter still hold."""
+        utils.test_java_type_converter()
+
+    @pytest.mark.parametrize(
+        "value, expected_type, nested_type, expected",
+        [
+            # commas and parentheses inside strings
+            ('new ArrayList<String>(Arrays.asList("a, b", "c)"))', "ArrayList", "String", ["a, b", "c)"]),
+            ('new String[]{"x, y", "z"}', "Array", "String", ["x, y", "z"]),
+            (
+                'new HashMap<String, String>() {{ put("k", "a, b"); put("l", "c);"); }}',
+                "HashMap",
+                None,
+                {"k": "a, b", "l": "c);"},
+            ),
+            # nested generics and collections
+            (
+                "new ArrayList<List<Integer>>() {{ add(new ArrayList<>(Arrays.asList(1, 2))); }}",
+                "ArrayList",
+                "ArrayList",
+                [[1, 2]],
+            ),
+            ('new HashMap<String, List<Integer>>() {{ put("a", new int[]{1, -2}); }}', "HashMap", None, {"a": [1, -2]}),
+            ("new long[]{1L, 2L}", "Array", "long", [1, 2]),
+            # the unquoted strings of the ground truth fall back to the regex parser
+            (
+                "new Object[]{user:online:today, user:online:yesterday}",
+                "Array",
+                "String",
+                ["user:online:today", "user:online:yesterday"],
+            ),
+            ("new ArrayList<>(42)", "ArrayList", None, "new ArrayList<>(42)"),
+        ],
+    )
+    def test_collections(self, value, expected_type, nested_type, expected):
+        """Test the conversion of collections, including the ones the regex parser got wrong."""
+        assert utils.java_type_converter(value, expected_type, nested_type) == expected
+
+    def test_thread_local_parsers(self):
+        """Test that every thread reuses its own parser."""
+        parsers = []
+        thread = threading.Thread(target=lambda: parsers.extend([get_parser("java"), get_parser("java")]))
+        thread.start()
+        thread.join()
+        assert parsers[0] is parsers[1]
+        assert get_parser("java") is get_parser("java") is not parsers[0]
+
+
+class TestJsTypeConverter:
+    """Test the conversion of the JavaScript arguments with the tree-sitter parser."""
+
+    def test_inline_tests(self):
+        """Test that the conversions tested along the converter still hold."""
+        utils.test_js_type_converter()
+        utils.test_js_type_converter_nested_array()
+        utils.test_js_type_converter_dictionary_with_arrays()
+
+    @pytest.mark.parametrize(
+        "value, expected_type, nested_type, expected",
+        [
+            ("[1, [2, 3], {a: [true]}]", "array", None, [1, [2, 3], {"a": [True]}]),
+            ('[{"a": 1}, {"b": [true, null]}]', "array", "dict", [{"a": 1}, {"b": [True, "null"]}]),
+            ('{"k": {"n": [1, 2]}, l: "x, y: z"}', "dict", None, {"k": {"n": [1, 2]}, "l": "x, y: z"}),
+            ("[1n, -2n]", "array", "Bigint", [1, -2]),
+            ("[10n, true]", "array", None, [10, True]),
+            ("{a: [1n, -2n], b: {c: 3n}}", "dict", None, {"a": [1, -2], "b": {"c": 3}}),
+            ("new Array('a', \"b\")", "array", "String", ["a", "b"]),
+            ("{a, b}", "dict", None, "{a, b}"),
+            ("not an array", "array", None, "not an array"),
+        ],
+    )
+    def test_collections(self, value, expected_type, nested_type, expected):
+        """Test the conversion of collections, including the ones the regex parser got wrong."""
+        assert utils.js_type_converter(value, expected_type, nested_type) == expected
+
+    def test_long_array(self):
+        """Test that long nested arrays are converted from one syntax tree."""
+        value = "[" + ", ".join(f'[{i}, "{i}, {i}"]' for i in range(1000)) + "]"
+        assert utils.js_type_converter(value, "array", "array") == [[i, f"{i}, {i}"] for i in range(1000)]
+
+
+class TestConversionCache:
+    """Test the cache of the converted arguments."""
+
+    def test_cached_values_are_copies(self):
+        """Test that the cached collections are returned as copies that can be modified."""
+        cache = ConversionCache(maxsize=8)
+        first = cache.convert("java", 'new HashMap<String, Object>() {{ put("a", new int[]{1, 2}); }}', "HashMap")
+        first["a"].append(3)
+        second = cache.convert("java", 'new HashMap<String, Object>() {{ put("a", new int[]{1, 2}); }}', "HashMap")
+        assert second == {"a": [1, 2]}
+        assert second is not first and len(cache) == 1
+
+    def test_keys_and_eviction(self):
+        """Test that the conversions are keyed by language and types, and that the least recently used are evicted."""
+        cache = ConversionCache(maxsize=2)
+        assert cache.convert("javascript", "[1, 2]", "array", "String") == ["1", "2"]
+        assert cache.convert("javascript", "[1, 2]", "array", "integer") == [1, 2]
+        assert cache.convert("javascript", "[1, 2]", "array", "String") == ["1", "2"]
+        cache.convert("java", "5L", "long")
+        assert len(cache) == 2
+        assert ("javascript", "array", "integer", "[1, 2]") not in cache._values
+
+    def test_errors_are_not_cached(self):
+        """Test that the conversion errors are raised on every call."""
+        cache = ConversionCache()
+        for _ in range(2):
+            with pytest.raises(NotImplementedError):
+                cache.convert("java", "abc", "Set")
+        assert len(cache) == 0